@@ -4,6 +4,7 @@ Abstract Syntax Tree (AST) module for regular expression parsing.
 This module defines the AST node classes used to represent parsed regular expressions
 in a hierarchical tree structure.
 """
+import hashlib
 from abc import ABC, abstractmethod
 
 
@@ -25,6 +26,33 @@ class AstNode(ABC):
         prefix = ' ' * indent
         print(f"{prefix}Unknown node type")
 
+    @abstractmethod
+    def structuralKey(self) -> str:
+        """
+        Describe the node's type and content, with children given by their hashes.
+
+        Returns:
+            A string that is equal for structurally identical nodes
+        """
+        pass
+
+    def structuralHash(self) -> str:
+        """
+        Hash the subtree rooted at this node by structure.
+
+        Structurally identical subtrees get the same hash wherever they occur and
+        whichever parse they come from. The hash is computed once per node, so
+        nodes must not be modified afterwards.
+
+        Returns:
+            A hex digest identifying the subtree
+        """
+        cached = self.__dict__.get("structural_hash")
+        if cached is None:
+            cached = hashlib.blake2b(self.structuralKey().encode(), digest_size=16).hexdigest()
+            self.structural_hash = cached
+        return cached
+
 
 class LiteralAstNode(AstNode):
     """AST node representing a literal character in the regular expression."""
@@ -48,6 +76,15 @@ class LiteralAstNode(AstNode):
         prefix = ' ' * indent
         print(f"{prefix}LiteralAstNode(char={self.char})")
 
+    def structuralKey(self) -> str:
+        """
+        Describe this literal node for structural hashing.
+
+        Returns:
+            The node type and its character
+        """
+        return f"Literal({self.char!r})"
+
 
 class ConcatAstNode(AstNode):
     """AST node representing concatenation of two regular expressions."""
@@ -75,6 +112,15 @@ class ConcatAstNode(AstNode):
         self.left.printAST(indent + 2)
         self.right.printAST(indent + 2)
 
+    def structuralKey(self) -> str:
+        """
+        Describe this concatenation node for structural hashing.
+
+        Returns:
+            The node type and the hashes of its children
+        """
+        return f"Concat({self.left.structuralHash()},{self.right.structuralHash()})"
+
 
 class OrAstNode(AstNode):
     """AST node representing alternation (|) between two regular expressions."""
@@ -102,6 +148,15 @@ class OrAstNode(AstNode):
         self.left.printAST(indent + 2)
         self.right.printAST(indent + 2)
 
+    def structuralKey(self) -> str:
+        """
+        Describe this alternation node for structural hashing.
+
+        Returns:
+            The node type and the hashes of its children
+        """
+        return f"Or({self.left.structuralHash()},{self.right.structuralHash()})"
+
 
 class StarAstNode(AstNode):
     """AST node representing the Kleene star (*) operation on a regular expression."""
@@ -126,6 +181,15 @@ class StarAstNode(AstNode):
         print(f"{prefix}StarAstNode")
         self.sub_expr.printAST(indent + 2)
 
+    def structuralKey(self) -> str:
+        """
+        Describe this star node for structural hashing.
+
+        Returns:
+            The node type and the hash of its child
+        """
+        return f"Star({self.sub_expr.structuralHash()})"
+
 
 class PlusAstNode(AstNode):
     """AST node representing the plus (+) operation on a regular expression."""
@@ -150,6 +214,15 @@ class PlusAstNode(AstNode):
         print(f"{prefix}PlusAstNode")
         self.sub_expr.printAST(indent + 2)
 
+    def structuralKey(self) -> str:
+        """
+        Describe this plus node for structural hashing.
+
+        Returns:
+            The node type and the hash of its child
+        """
+        return f"Plus({self.sub_expr.structuralHash()})"
+
 
 class OptionalAstNode(AstNode):
     """AST node representing the optional (?) operation on a regular expression."""
@@ -174,6 +247,15 @@ class OptionalAstNode(AstNode):
         print(f"{prefix}OptionalAstNode")
         self.sub_expr.printAST(indent + 2)
 
+    def structuralKey(self) -> str:
+        """
+        Describe this optional node for structural hashing.
+
+        Returns:
+            The node type and the hash of its child
+        """
+        return f"Optional({self.sub_expr.structuralHash()})"
+
 
 class CharacterClassAstNode(AstNode):
     """AST node representing a character class (e.g., [a-z]) in the regular expression."""
@@ -196,3 +278,12 @@ class CharacterClassAstNode(AstNode):
         """
         prefix = ' ' * indent
         print(f"{prefix}CharacterClassAstNode(char_set={self.char_set})")
+
+    def structuralKey(self) -> str:
+        """
+        Describe this character class node for structural hashing.
+
+        Returns:
+            The node type and its sorted characters
+        """
+        return f"Class({''.join(sorted(self.char_set))!r})"
@@ -0,0 +1,141 @@
+"""
+Vectorized batch matching of many strings against one DFA.
+
+Strings are encoded into a padded integer matrix of symbol classes, and all of
+them are advanced at once with a single gather on the transition table per
+input column (`state = table[state, column]`). Acceptance is then read from a
+bitmap. NumPy is an optional dependency: without it, a pure-Python loop gives
+identical results.
+"""
+
+from typing import List, Optional, Sequence, Union
+from CompiledDFA import CompiledDFA
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+
+class BatchMatcher:
+    """
+    Whole-string matcher for large batches of short inputs.
+
+    Attributes:
+        compiled (CompiledDFA): The automaton to run.
+        useNumpy (bool): Whether the vectorized NumPy engine is used.
+        batchSize (int): Number of strings advanced together.
+    """
+
+    def __init__(self, compiled: CompiledDFA, use_numpy: Optional[bool] = None, batch_size: int = 1 << 16):
+        """
+        Initialize the matcher.
+
+        Args:
+            compiled (CompiledDFA): The automaton to run.
+            use_numpy (Optional[bool], optional): Force or disable the NumPy engine.
+                Defaults to using it when NumPy is installed.
+            batch_size (int, optional): Number of strings advanced together. Defaults to 65536.
+
+        Raises:
+            ImportError: If the NumPy engine is requested but NumPy is not installed.
+        """
+        if use_numpy and np is None:
+            raise ImportError("NumPy is required for the vectorized batch matcher.")
+        self.compiled = compiled
+        self.useNumpy = np is not None if use_numpy is None else use_numpy
+        self.batchSize = batch_size
+        if self.useNumpy:
+            self.buildArrays()
+
+    def buildArrays(self) -> None:
+        """
+        Build the NumPy transition table and acceptance bitmap.
+
+        The dead state becomes an extra absorbing row, and an extra padding column
+        leaves every state unchanged, so padded strings keep their final state.
+        """
+        compiled = self.compiled
+        states = len(compiled.table)
+        self.deadState = states
+        self.padClass = compiled.classCount
+        table = np.empty((states + 1, compiled.classCount + 1), dtype=np.int32)
+        table[:states, :compiled.classCount] = compiled.table
+        table[table == compiled.DEAD] = self.deadState
+        table[states, :] = self.deadState
+        table[:, self.padClass] = np.arange(states + 1)
+        self.table = table
+        self.acceptBitmap = np.zeros(states + 1, dtype=bool)
+        self.acceptBitmap[:states] = compiled.accepting
+
+    def matchAll(self, strings: Sequence[Union[str, bytes]]) -> List[bool]:
+        """
+        Check which strings are accepted as a whole.
+
+        Args:
+            strings (Sequence[Union[str, bytes]]): The inputs; bytes are read as Latin-1.
+
+        Returns:
+            List[bool]: Whether each input is accepted, in input order.
+        """
+        if not self.useNumpy:
+            return [self.compiled.accepts(string) for string in strings]
+        results = []
+        for begin in range(0, len(strings), self.batchSize):
+            results.extend(self.matchBatch(strings[begin:begin + self.batchSize]).tolist())
+        return results
+
+    def matchBatch(self, strings: Sequence[Union[str, bytes]]):
+        """
+        Advance one batch of strings together through the NumPy table.
+
+        Args:
+            strings (Sequence[Union[str, bytes]]): The batch of inputs.
+
+        Returns:
+            numpy.ndarray: Boolean acceptance of every input.
+        """
+        matrix = self.encode(strings)
+        state = np.full(len(strings), self.compiled.start, dtype=np.int32)
+        for column in range(matrix.shape[1]):
+            state = self.table[state, matrix[:, column]]
+            # Stop early once every string is dead
+            if column % 64 == 63 and (state == self.deadState).all():
+                break
+        return self.acceptBitmap[state]
+
+    def encode(self, strings: Sequence[Union[str, bytes]]):
+        """
+        Encode strings into a padded matrix of symbol classes.
+
+        A batch made only of str or only of bytes is classified in one C-level
+        translate call over the concatenated inputs and scattered into the matrix
+        with fancy indexing; mixed batches are encoded row by row.
+
+        Args:
+            strings (Sequence[Union[str, bytes]]): The inputs.
+
+        Returns:
+            numpy.ndarray: One row per input, padded with the padding class.
+        """
+        lengths = np.fromiter((len(string) for string in strings), dtype=np.int64, count=len(strings))
+        width = int(lengths.max()) if len(strings) else 0
+        dtype = np.uint8 if self.padClass < 256 else np.int32
+        matrix = np.full((len(strings), width), self.padClass, dtype=dtype)
+
+        flat = None
+        if dtype is np.uint8 and all(isinstance(string, str) for string in strings):
+            flat = "".join(strings).translate(self.compiled.strTranslation).encode("latin-1")
+        elif dtype is np.uint8 and all(isinstance(string, (bytes, bytearray)) for string in strings):
+            flat = b"".join(strings).translate(self.compiled.byteTranslation)
+
+        if flat is None:
+            for row, string in enumerate(strings):
+                matrix[row, :len(string)] = list(self.compiled.classify(string))
+            return matrix
+
+        rows = np.repeat(np.arange(len(strings)), lengths)
+        starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        matrix[rows, np.arange(len(rows)) - starts] = np.frombuffer(flat, dtype=np.uint8)
+        return matrix
+
@@ -0,0 +1,128 @@
+"""
+Resource budgets for automaton construction.
+
+Some regular expressions make the subset construction or the minimization run
+for a very long time or exhaust memory. A Budget bounds the number of NFA
+states, DFA states and DFA transitions as well as the wall-clock time, and the
+construction loops check it cooperatively. When a limit is hit a
+BudgetExceededError is raised, carrying statistics about the partial work so
+callers can report why the request was rejected.
+"""
+
+import time
+from typing import Optional
+
+
+class BudgetExceededError(Exception):
+    """
+    Raised when a construction step exceeds its budget.
+
+    Attributes:
+        resource (str): The exhausted resource: "nfa_states", "dfa_states",
+            "transitions" or "time".
+        limit (float): The limit that was exceeded.
+        stats (dict): Statistics of the partial construction, including the stage.
+    """
+
+    def __init__(self, resource: str, limit: float, stats: dict):
+        """
+        Initialize the error.
+
+        Args:
+            resource (str): The exhausted resource.
+            limit (float): The limit that was exceeded.
+            stats (dict): Statistics of the partial construction.
+        """
+        super().__init__(f"Budget exceeded during {stats.get('stage', 'construction')}: "
+                         f"{resource} limit of {limit} reached.")
+        self.resource = resource
+        self.limit = limit
+        self.stats = stats
+
+    def __reduce__(self):
+        # Keep the structured fields when the error crosses a process boundary
+        return BudgetExceededError, (self.resource, self.limit, self.stats)
+
+    def toDict(self) -> dict:
+        """
+        Convert the error to a JSON-serializable dictionary.
+
+        Returns:
+            dict: The resource, limit and partial statistics.
+        """
+        return {"resource": self.resource, "limit": self.limit, "stats": dict(self.stats)}
+
+
+class Budget:
+    """
+    Limits on the size and duration of a construction.
+
+    A limit of None means unlimited. The deadline is measured from the creation
+    of the budget, or from the last call to start().
+
+    Attributes:
+        maxNFAStates (Optional[int]): Maximum number of NFA states.
+        maxDFAStates (Optional[int]): Maximum number of DFA states.
+        maxTransitions (Optional[int]): Maximum number of DFA transitions.
+        timeout (Optional[float]): Maximum wall-clock time in seconds.
+        started (float): Monotonic time at which the clock started.
+    """
+
+    def __init__(self, max_nfa_states: Optional[int] = None, max_dfa_states: Optional[int] = None,
+                 max_transitions: Optional[int] = None, timeout: Optional[float] = None):
+        """
+        Initialize the budget and start its clock.
+
+        Args:
+            max_nfa_states (Optional[int], optional): Maximum number of NFA states. Defaults to None.
+            max_dfa_states (Optional[int], optional): Maximum number of DFA states. Defaults to None.
+            max_transitions (Optional[int], optional): Maximum number of DFA transitions. Defaults to None.
+            timeout (Optional[float], optional): Maximum wall-clock time in seconds. Defaults to None.
+        """
+        self.maxNFAStates = max_nfa_states
+        self.maxDFAStates = max_dfa_states
+        self.maxTransitions = max_transitions
+        self.timeout = timeout
+        self.start()
+
+    def start(self) -> None:
+        """Restart the clock."""
+        self.started = time.monotonic()
+
+    def elapsed(self) -> float:
+        """
+        Get the time spent since the clock started.
+
+        Returns:
+            float: Elapsed time in seconds.
+        """
+        return time.monotonic() - self.started
+
+    def check(self, stage: str, nfa_states: Optional[int] = None, dfa_states: Optional[int] = None,
+              transitions: Optional[int] = None) -> None:
+        """
+        Check the current progress of a construction against the budget.
+
+        Args:
+            stage (str): Name of the construction step, reported in the statistics.
+            nfa_states (Optional[int], optional): Current number of NFA states, if known.
+            dfa_states (Optional[int], optional): Current number of DFA states, if known.
+            transitions (Optional[int], optional): Current number of DFA transitions, if known.
+
+        Raises:
+            BudgetExceededError: If any limit is exceeded.
+        """
+        elapsed = self.elapsed()
+        counts = (("nfa_states", nfa_states, self.maxNFAStates),
+                  ("dfa_states", dfa_states, self.maxDFAStates),
+                  ("transitions", transitions, self.maxTransitions))
+        exceeded = [(resource, limit) for resource, value, limit in counts
+                    if value is not None and limit is not None and value > limit]
+        if not exceeded and self.timeout is not None and elapsed > self.timeout:
+            exceeded.append(("time", self.timeout))
+        if exceeded:
+            stats = {"stage": stage, "elapsed": round(elapsed, 6)}
+            for resource, value, _ in counts:
+                if value is not None:
+                    stats[resource] = value
+            raise BudgetExceededError(*exceeded[0], stats)
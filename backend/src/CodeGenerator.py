@@ -0,0 +1,212 @@
+"""
+Code generation of specialized Python matchers from a DFA.
+
+This module turns a (minimized) DFA into the Python source of a dedicated
+`match(text)` function, compiles it with `compile()`/`exec()`, and caches the
+compiled code on disk. Two layouts are available:
+- "branches": nested if/elif chains per state, testing characters with
+  C-level string containment
+- "translate": `str.translate` maps the input to symbol classes in one call,
+  then the states are walked with tuple lookups
+For small, hot patterns this avoids the overhead of the generic table walk.
+"""
+
+import hashlib
+import json
+import marshal
+import os
+import sys
+from types import CodeType
+from typing import Callable, Dict, List, Optional, Union
+from DFA import DFA
+from CompiledDFA import CompiledDFA
+
+
+class MatcherCodeGenerator:
+    """
+    Generator of specialized matcher source code for a DFA.
+
+    Attributes:
+        dfa (DFA): The DFA to generate a matcher for.
+        compiled (CompiledDFA): Table form of the DFA, used for state numbering and classes.
+    """
+
+    STYLES = ("branches", "translate")
+
+    def __init__(self, dfa: DFA):
+        """
+        Initialize the generator.
+
+        Args:
+            dfa (DFA): The DFA to generate a matcher for.
+        """
+        self.dfa = dfa
+        self.compiled = CompiledDFA(dfa)
+
+    def generateSource(self, style: str = "branches") -> str:
+        """
+        Generate the source of a module defining `match(text) -> bool`.
+
+        Args:
+            style (str, optional): "branches" or "translate". Defaults to "branches".
+
+        Returns:
+            str: The generated Python source.
+
+        Raises:
+            ValueError: If the style is unknown.
+        """
+        if style == "branches":
+            return self.generateBranches()
+        if style == "translate":
+            return self.generateTranslate()
+        raise ValueError(f"Unknown code generation style: {style}")
+
+    def generateBranches(self) -> str:
+        """
+        Generate a matcher with one if/elif chain per state.
+
+        Returns:
+            str: The generated Python source.
+        """
+        compiled = self.compiled
+        symbols_by_class: Dict[int, List[str]] = {}
+        for symbol, cls in compiled.classOf.items():
+            symbols_by_class.setdefault(cls, []).append(symbol)
+
+        lines = [
+            "# Generated by MatcherCodeGenerator (branches). Do not edit.",
+            "def match(text):",
+            "    if not isinstance(text, str):",
+            "        text = bytes(text).decode('latin-1')",
+            f"    state = {compiled.start}",
+            "    for char in text:",
+        ]
+        for state, row in enumerate(compiled.table):
+            # Group the symbols of this state by target state
+            targets: Dict[int, List[str]] = {}
+            for cls, target in enumerate(row):
+                if target != compiled.DEAD and cls in symbols_by_class:
+                    targets.setdefault(target, []).extend(symbols_by_class[cls])
+            lines.append(f"        {'if' if state == 0 else 'elif'} state == {state}:")
+            keyword = "if"
+            for target, symbols in targets.items():
+                chars = "".join(sorted(symbols))
+                test = f"char == {chars!r}" if len(chars) == 1 else f"char in {chars!r}"
+                lines.append(f"            {keyword} {test}:")
+                lines.append(f"                state = {target}")
+                keyword = "elif"
+            if targets:
+                lines.append("            else:")
+                lines.append("                return False")
+            else:
+                lines.append("            return False")
+        accepting = tuple(state for state, flag in enumerate(compiled.accepting) if flag)
+        lines.append(f"    return state in {set(accepting) or 'set()'}")
+        return "\n".join(lines) + "\n"
+
+    def generateTranslate(self) -> str:
+        """
+        Generate a matcher mapping characters to classes with str.translate.
+
+        Returns:
+            str: The generated Python source.
+        """
+        compiled = self.compiled
+        # Class characters; everything outside the alphabet maps to class 0
+        classes = {ord(symbol): chr(cls) for symbol, cls in compiled.classOf.items()}
+        table = tuple(tuple(row) for row in compiled.table)
+        lines = [
+            "# Generated by MatcherCodeGenerator (translate). Do not edit.",
+            "class _Classes(dict):",
+            "    def __missing__(self, key):",
+            "        return '\\x00'",
+            f"CLASSES = _Classes({classes!r})",
+            f"TABLE = {table!r}",
+            f"ACCEPTING = {tuple(compiled.accepting)!r}",
+            "def match(text):",
+            "    if not isinstance(text, str):",
+            "        text = bytes(text).decode('latin-1')",
+            f"    state = {compiled.start}",
+            "    for cls in text.translate(CLASSES):",
+            "        state = TABLE[state][ord(cls)]",
+            "        if state < 0:",
+            "            return False",
+            "    return ACCEPTING[state]",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def cacheKey(self, style: str) -> str:
+        """
+        Compute the cache key of the generated matcher.
+
+        The DFA is identified by its canonical hash, so DFAs that differ only in
+        state names, such as the minimized DFAs of equivalent regexes, share one
+        cached matcher.
+
+        Args:
+            style (str): The code generation style.
+
+        Returns:
+            str: A hex digest identifying the DFA content and style.
+        """
+        content = json.dumps([style, self.dfa.canonicalHash()])
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def buildMatcher(self, style: str = "branches", cache_dir: Optional[str] = None) -> Callable[[Union[str, bytes]], bool]:
+        """
+        Generate, compile and load the matcher function.
+
+        When a cache directory is given, the compiled code object is stored there
+        with marshal, keyed by DFA content, style and interpreter version, and
+        reused by later calls instead of generating and compiling again.
+
+        Args:
+            style (str, optional): "branches" or "translate". Defaults to "branches".
+            cache_dir (Optional[str], optional): Directory of the on-disk cache. Defaults to no caching.
+
+        Returns:
+            Callable[[Union[str, bytes]], bool]: The generated `match` function.
+        """
+        path = None
+        if cache_dir is not None:
+            path = os.path.join(cache_dir, f"dfa_{self.cacheKey(style)}.{sys.implementation.cache_tag}.bin")
+            if os.path.exists(path):
+                try:
+                    with open(path, "rb") as f:
+                        return self.loadMatcher(marshal.load(f))
+                except (EOFError, ValueError, TypeError, KeyError):
+                    # A truncated or corrupt entry is discarded and generated again
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+        code = compile(self.generateSource(style), f"<generated {style} matcher>", "exec")
+        if path is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write to a temporary file first so readers never see a partial file
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as f:
+                marshal.dump(code, f)
+            os.replace(temporary, path)
+        return self.loadMatcher(code)
+
+    @staticmethod
+    def loadMatcher(code: CodeType) -> Callable[[Union[str, bytes]], bool]:
+        """
+        Execute a compiled matcher module and return its function.
+
+        Args:
+            code (CodeType): The compiled module.
+
+        Returns:
+            Callable[[Union[str, bytes]], bool]: Its `match` function.
+
+        Raises:
+            TypeError: If the code is not a code object.
+            KeyError: If the module does not define `match`.
+        """
+        namespace = {}
+        exec(code, namespace)
+        return namespace["match"]
@@ -0,0 +1,385 @@
+"""
+Compact array-backed NFA representation.
+
+The dictionary structure of `NFA` keeps one dict per state keyed by symbol
+strings, with lists of state name strings as values. This module stores the
+same automaton with integer states: edges are appended to flat `array`s while
+building and are laid out in compressed sparse row (CSR) form when the NFA is
+frozen, epsilon edges have their own adjacency arrays, and accepting states
+are a bitmap. Adapters convert to and from the dictionary structure.
+"""
+
+from array import array
+from typing import Iterable, Iterator, List, Set, Tuple
+from AST import *
+from NFA import NFA
+
+
+class CompactNFA:
+    """
+    NFA with integer states and array-backed edge lists.
+
+    While building, edges are appended to parallel arrays without duplicate
+    checks. freeze() sorts and deduplicates them into CSR form: the edges of
+    state s are edgeSymbols/edgeTargets[edgeOffsets[s]:edgeOffsets[s + 1]],
+    sorted by symbol id, and likewise for epsilon edges. Traversal methods
+    require a frozen NFA; building methods require an unfrozen one.
+
+    Attributes:
+        stateCount (int): Number of states, numbered from 0.
+        start (int): The starting state.
+        symbols (List[str]): Symbol of every symbol id.
+        symbolIds (Dict[str, int]): Id of every symbol.
+        accepting (bytearray): Bitmap of accepting states.
+        frozen (bool): Whether the edges are in CSR form.
+        edgeOffsets (array): CSR row offsets of the symbol edges, once frozen.
+        edgeSymbols (array): Symbol id of every symbol edge.
+        edgeTargets (array): Target state of every symbol edge.
+        epsilonOffsets (array): CSR row offsets of the epsilon edges, once frozen.
+        epsilonTargets (array): Target state of every epsilon edge.
+    """
+
+    __slots__ = ("stateCount", "start", "symbols", "symbolIds", "accepting", "frozen",
+                 "edgeSources", "edgeOffsets", "edgeSymbols", "edgeTargets",
+                 "epsilonSources", "epsilonOffsets", "epsilonTargets")
+
+    def __init__(self):
+        """Initialize an empty, unfrozen NFA."""
+        self.stateCount = 0
+        self.start = 0
+        self.symbols: List[str] = []
+        self.symbolIds = {}
+        self.accepting = bytearray()
+        self.frozen = False
+        self.edgeSources = array("i")
+        self.edgeSymbols = array("i")
+        self.edgeTargets = array("i")
+        self.epsilonSources = array("i")
+        self.epsilonTargets = array("i")
+        self.edgeOffsets = array("i")
+        self.epsilonOffsets = array("i")
+
+    def addState(self) -> int:
+        """
+        Add a non-accepting state.
+
+        Returns:
+            int: The new state.
+        """
+        state = self.stateCount
+        self.stateCount += 1
+        if state % 8 == 0:
+            self.accepting.append(0)
+        return state
+
+    def setAccepting(self, state: int, is_accepting: bool = True) -> None:
+        """
+        Set whether a state is accepting.
+
+        Args:
+            state (int): The state.
+            is_accepting (bool, optional): Whether it is accepting. Defaults to True.
+        """
+        if is_accepting:
+            self.accepting[state >> 3] |= 1 << (state & 7)
+        else:
+            self.accepting[state >> 3] &= ~(1 << (state & 7)) & 0xFF
+
+    def isAccepting(self, state: int) -> bool:
+        """
+        Check whether a state is accepting.
+
+        Args:
+            state (int): The state.
+
+        Returns:
+            bool: True if the state is accepting.
+        """
+        return bool(self.accepting[state >> 3] >> (state & 7) & 1)
+
+    def symbolId(self, symbol: str) -> int:
+        """
+        Get the id of a symbol, interning it if needed.
+
+        Args:
+            symbol (str): The symbol.
+
+        Returns:
+            int: Its id.
+        """
+        symbol_id = self.symbolIds.get(symbol)
+        if symbol_id is None:
+            symbol_id = len(self.symbols)
+            self.symbolIds[symbol] = symbol_id
+            self.symbols.append(symbol)
+        return symbol_id
+
+    def addTransition(self, from_state: int, symbol: str, to_state: int) -> None:
+        """
+        Add a transition; 'ε' adds an epsilon transition.
+
+        Args:
+            from_state (int): The source state.
+            symbol (str): The transition symbol, or 'ε'.
+            to_state (int): The destination state.
+
+        Raises:
+            ValueError: If the NFA is frozen.
+        """
+        if self.frozen:
+            raise ValueError("Cannot add transitions to a frozen CompactNFA.")
+        if symbol == 'ε':
+            self.epsilonSources.append(from_state)
+            self.epsilonTargets.append(to_state)
+        else:
+            self.edgeSources.append(from_state)
+            self.edgeSymbols.append(self.symbolId(symbol))
+            self.edgeTargets.append(to_state)
+
+    def freeze(self) -> "CompactNFA":
+        """
+        Sort and deduplicate the edges into CSR form.
+
+        Returns:
+            CompactNFA: This NFA, for chaining.
+        """
+        if self.frozen:
+            return self
+        self.edgeOffsets, self.edgeSymbols, self.edgeTargets = self.toRows(
+            self.edgeSources, [self.edgeSymbols, self.edgeTargets])
+        self.epsilonOffsets, self.epsilonTargets = self.toRows(self.epsilonSources, [self.epsilonTargets])
+        self.edgeSources = array("i")
+        self.epsilonSources = array("i")
+        self.frozen = True
+        return self
+
+    def toRows(self, sources: array, columns: List[array]) -> Tuple[array, ...]:
+        """
+        Group edges by source state with a counting sort, then sort and deduplicate each row.
+
+        Only one row at a time is held as Python objects, so freezing needs little
+        more memory than the arrays themselves.
+
+        Args:
+            sources (array): Source state of every edge.
+            columns (List[array]): The other fields of every edge, e.g. symbols and targets.
+
+        Returns:
+            Tuple[array, ...]: The row offsets followed by the grouped columns.
+        """
+        offsets = self.rowOffsets(sources)
+        positions = array("i", offsets)
+        grouped = [array("i", [0]) * len(sources) for _ in columns]
+        for index, source in enumerate(sources):
+            slot = positions[source]
+            positions[source] += 1
+            for column, result in zip(columns, grouped):
+                result[slot] = column[index]
+
+        # Sort and deduplicate every row in place, compacting the arrays as rows shrink
+        write = 0
+        for state in range(self.stateCount):
+            begin, end = offsets[state], offsets[state + 1]
+            row = sorted(set(zip(*(result[begin:end] for result in grouped))))
+            offsets[state] = write
+            for edge in row:
+                for result, value in zip(grouped, edge):
+                    result[write] = value
+                write += 1
+        offsets[self.stateCount] = write
+        for result in grouped:
+            del result[write:]
+        return (offsets, *grouped)
+
+    def rowOffsets(self, sources: Iterable[int]) -> array:
+        """
+        Compute CSR row offsets from the source states of a list of edges.
+
+        Args:
+            sources (Iterable[int]): Source state of every edge.
+
+        Returns:
+            array: offsets[s] is the index of the first edge of state s; offsets[stateCount]
+                is the number of edges.
+        """
+        counts = array("i", [0]) * (self.stateCount + 1)
+        for source in sources:
+            counts[source + 1] += 1
+        for state in range(self.stateCount):
+            counts[state + 1] += counts[state]
+        return counts
+
+    def transitions(self, state: int) -> Iterator[Tuple[str, int]]:
+        """
+        Iterate over the symbol transitions of a state.
+
+        Args:
+            state (int): The state.
+
+        Yields:
+            Tuple[str, int]: (symbol, target) pairs, grouped by symbol.
+        """
+        symbols, targets = self.edgeSymbols, self.edgeTargets
+        for index in range(self.edgeOffsets[state], self.edgeOffsets[state + 1]):
+            yield self.symbols[symbols[index]], targets[index]
+
+    def epsilonClosure(self, states: Iterable[int]) -> Set[int]:
+        """
+        Compute the epsilon closure of a set of states.
+
+        Args:
+            states (Iterable[int]): The initial states.
+
+        Returns:
+            Set[int]: The states reachable through epsilon transitions.
+        """
+        offsets, targets = self.epsilonOffsets, self.epsilonTargets
+        result = set(states)
+        stack = list(result)
+        while stack:
+            state = stack.pop()
+            for index in range(offsets[state], offsets[state + 1]):
+                target = targets[index]
+                if target not in result:
+                    result.add(target)
+                    stack.append(target)
+        return result
+
+    def accepts(self, text: str) -> bool:
+        """
+        Check whether the whole input is accepted, by simulating the NFA.
+
+        Args:
+            text (str): The input.
+
+        Returns:
+            bool: True if some run ends in an accepting state.
+        """
+        states = self.epsilonClosure([self.start])
+        offsets, symbols, targets = self.edgeOffsets, self.edgeSymbols, self.edgeTargets
+        for char in text:
+            symbol = self.symbolIds.get(char)
+            if symbol is None:
+                return False
+            reached = [targets[index] for state in states
+                       for index in range(offsets[state], offsets[state + 1]) if symbols[index] == symbol]
+            states = self.epsilonClosure(reached)
+            if not states:
+                return False
+        return any(self.isAccepting(state) for state in states)
+
+    @staticmethod
+    def fromNFA(nfa: NFA) -> "CompactNFA":
+        """
+        Convert a dictionary-based NFA; states are numbered in structure order.
+
+        Args:
+            nfa (NFA): The NFA to convert.
+
+        Returns:
+            CompactNFA: The frozen compact NFA.
+        """
+        compact = CompactNFA()
+        structure = nfa.structure
+        ids = {}
+        for state in structure:
+            if state != "startingState":
+                ids[state] = compact.addState()
+        compact.start = ids[structure["startingState"]]
+        for state, state_id in ids.items():
+            compact.setAccepting(state_id, structure[state]["isTerminatingState"])
+            for symbol, targets in structure[state].items():
+                if symbol != "isTerminatingState":
+                    for target in targets:
+                        compact.addTransition(state_id, 'ε' if symbol == "epsilon" else symbol, ids[target])
+        return compact.freeze()
+
+    def toNFA(self, prefix: str = "S") -> NFA:
+        """
+        Convert to a dictionary-based NFA with states named prefix + number.
+
+        Args:
+            prefix (str, optional): Prefix of the state names. Defaults to "S".
+
+        Returns:
+            NFA: The equivalent NFA.
+        """
+        self.freeze()
+        nfa = NFA()
+        for state in range(self.stateCount):
+            nfa.addState(f"{prefix}{state}", self.isAccepting(state))
+        nfa.setStartingState(f"{prefix}{self.start}")
+        for state in range(self.stateCount):
+            name = f"{prefix}{state}"
+            for symbol, target in self.transitions(state):
+                nfa.structure[name].setdefault(symbol, []).append(f"{prefix}{target}")
+            for index in range(self.epsilonOffsets[state], self.epsilonOffsets[state + 1]):
+                nfa.structure[name].setdefault("epsilon", []).append(f"{prefix}{self.epsilonTargets[index]}")
+        return nfa
+
+    @staticmethod
+    def fromAST(ast: AstNode) -> "CompactNFA":
+        """
+        Build the Thompson NFA of an AST directly in compact form.
+
+        States are numbered in the same order as NFABuilder numbers its "S" states,
+        so toNFA() gives NFABuilder's structure up to the order of each transition
+        list: freeze() sorts the edges of every state by symbol and target.
+
+        Args:
+            ast (AstNode): The root of the regular expression AST.
+
+        Returns:
+            CompactNFA: The frozen compact NFA.
+        """
+        compact = CompactNFA()
+        start, end = compact.buildNode(ast)
+        compact.start = start
+        compact.setAccepting(end)
+        return compact.freeze()
+
+    def buildNode(self, node: AstNode) -> Tuple[int, int]:
+        """
+        Add the Thompson sub-NFA of an AST node.
+
+        Args:
+            node (AstNode): The node to build.
+
+        Returns:
+            Tuple[int, int]: Start and end states of the sub-NFA.
+
+        Raises:
+            ValueError: If an unsupported AST node type is encountered.
+        """
+        if isinstance(node, (LiteralAstNode, CharacterClassAstNode)):
+            start, end = self.addState(), self.addState()
+            symbols = [node.char] if isinstance(node, LiteralAstNode) else node.char_set
+            for symbol in symbols:
+                self.addTransition(start, symbol, end)
+            return start, end
+        elif isinstance(node, ConcatAstNode):
+            left_start, left_end = self.buildNode(node.left)
+            right_start, right_end = self.buildNode(node.right)
+            self.addTransition(left_end, 'ε', right_start)
+            return left_start, right_end
+        elif isinstance(node, OrAstNode):
+            start, end = self.addState(), self.addState()
+            for child in (node.left, node.right):
+                child_start, child_end = self.buildNode(child)
+                self.addTransition(start, 'ε', child_start)
+                self.addTransition(child_end, 'ε', end)
+            return start, end
+        elif isinstance(node, (StarAstNode, PlusAstNode, OptionalAstNode)):
+            start, end = self.addState(), self.addState()
+            sub_start, sub_end = self.buildNode(node.sub_expr)
+            self.addTransition(start, 'ε', sub_start)
+            self.addTransition(sub_end, 'ε', end)
+            if not isinstance(node, PlusAstNode):
+                # Zero occurrences
+                self.addTransition(start, 'ε', end)
+            if not isinstance(node, OptionalAstNode):
+                # More occurrences
+                self.addTransition(sub_end, 'ε', sub_start)
+            return start, end
+        else:
+            raise ValueError(f"Unsupported AST node type: {type(node).__name__}")
@@ -0,0 +1,129 @@
+"""
+Compile offloading for the web server.
+
+Compiling a regex into its automata is CPU-bound and can be slow, so in serving
+mode request handlers do not compile themselves: they hand the regex to a
+bounded pool of worker processes and wait for the result. Identical regexes
+that are already being compiled share the same job, and when too many jobs are
+waiting new requests are refused immediately instead of queueing without bound,
+which keeps latency predictable for cheap patterns when expensive ones arrive.
+"""
+
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Optional, Sequence, Tuple
+from NFABuilder import FragmentCache
+from Pipeline import Pipeline, STAGES
+from Budget import Budget
+
+# NFA fragments of the subtrees compiled by this worker process, reused when a
+# regex is edited and compiled again
+fragment_cache = FragmentCache()
+
+
+class ServiceBusy(Exception):
+    """Raised when the compile queue is full and a new job cannot be accepted."""
+    pass
+
+
+def compileAutomata(regex: str, limits: Dict[str, Optional[float]], stages: Sequence[str] = STAGES) -> dict:
+    """
+    Build the requested automata of a regex; runs in a worker process.
+
+    Args:
+        regex (str): The regular expression.
+        limits (Dict[str, Optional[float]]): Keyword arguments of the Budget to enforce.
+        stages (Sequence[str], optional): Automata to build, among STAGES. Defaults to all.
+
+    Returns:
+        dict: The structure of every requested automaton, by stage name.
+
+    Raises:
+        BudgetExceededError: If the construction exceeds the budget.
+    """
+    return Pipeline(regex, Budget(**limits), fragment_cache).toDict(stages)
+
+
+class CompileService:
+    """
+    Bounded process pool compiling regexes, with in-flight deduplication.
+
+    At most `workers` jobs run at once and at most `queueSize` more wait for a
+    worker; requests beyond that are refused with ServiceBusy.
+
+    Attributes:
+        workers (int): Number of worker processes.
+        queueSize (int): Maximum number of jobs waiting for a worker.
+        limits (Dict[str, Optional[float]]): Budget applied to every compile.
+        inFlight (Dict[Tuple[str, Tuple[str, ...]], Future]): Jobs submitted and not yet
+            finished, by regex and requested stages.
+    """
+
+    def __init__(self, workers: int = 2, queue_size: int = 8, limits: Optional[Dict[str, Optional[float]]] = None):
+        """
+        Start the worker pool.
+
+        Args:
+            workers (int, optional): Number of worker processes. Defaults to 2.
+            queue_size (int, optional): Maximum number of waiting jobs. Defaults to 8.
+            limits (Optional[Dict[str, Optional[float]]], optional): Keyword arguments of the
+                Budget applied to every compile. Defaults to no limits.
+        """
+        self.workers = workers
+        self.queueSize = queue_size
+        self.limits = dict(limits or {})
+        self.inFlight: Dict[Tuple[str, Tuple[str, ...]], Future] = {}
+        self.lock = threading.Lock()
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+
+    def submit(self, regex: str, stages: Sequence[str] = STAGES) -> Future:
+        """
+        Submit a regex for compilation, or join the job already compiling it.
+
+        Args:
+            regex (str): The regular expression.
+            stages (Sequence[str], optional): Automata to build, among STAGES. Defaults to all.
+
+        Returns:
+            Future: Resolves to the result of compileAutomata.
+
+        Raises:
+            ServiceBusy: If the pool and its queue are full.
+        """
+        key = (regex, tuple(stages))
+        with self.lock:
+            future = self.inFlight.get(key)
+            if future is not None:
+                return future
+            if len(self.inFlight) >= self.workers + self.queueSize:
+                raise ServiceBusy(f"{len(self.inFlight)} compiles in flight, queue is full.")
+            future = self.pool.submit(compileAutomata, regex, self.limits, key[1])
+            self.inFlight[key] = future
+        future.add_done_callback(lambda done: self.finished(key, done))
+        return future
+
+    def finished(self, key: Tuple[str, Tuple[str, ...]], future: Future) -> None:
+        """
+        Forget a finished job so later requests compile again.
+
+        Args:
+            key (Tuple[str, Tuple[str, ...]]): The regular expression and stages of the job.
+            future (Future): The finished job.
+        """
+        with self.lock:
+            if self.inFlight.get(key) is future:
+                del self.inFlight[key]
+
+    def pending(self) -> int:
+        """
+        Count the jobs submitted and not yet finished.
+
+        Returns:
+            int: Number of running and waiting jobs.
+        """
+        with self.lock:
+            return len(self.inFlight)
+
+    def shutdown(self) -> None:
+        """Stop the worker pool, cancelling waiting jobs."""
+        self.pool.shutdown(wait=False, cancel_futures=True)
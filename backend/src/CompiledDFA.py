@@ -0,0 +1,348 @@
+"""
+Compiled DFA transition tables.
+
+This module turns the dictionary-based DFA structure into integer transition
+tables indexed by state number and symbol class, which is the form used by the
+matching and searching engines. States can be renumbered so that rows visited
+one after the other, or visited most often on a training input, are adjacent.
+"""
+
+import copy
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+from DFA import DFA
+
+
+class CompiledDFA:
+    """
+    Table-driven form of a DFA.
+
+    States are numbered from 0 (the starting state) and input symbols are grouped
+    into classes of symbols that behave identically in every state. Class 0 is
+    reserved for symbols outside the DFA's alphabet.
+
+    The table is trimmed: transitions into states that can never reach an
+    accepting state are replaced by DEAD, so a DEAD entry always means that
+    acceptance has become impossible and matchers can stop consuming input.
+
+    Attributes:
+        DEAD (int): Table entry used for dead transitions.
+        start (int): Number of the starting state.
+        stateNames (List[str]): Original DFA state name of every state number.
+        classOf (Dict[str, int]): Symbol class of every alphabet symbol.
+        classCount (int): Number of symbol classes, including the "other" class 0.
+        table (List[List[int]]): table[state][cls] is the next state, or DEAD.
+        accepting (List[bool]): Whether each state is accepting.
+        live (List[bool]): Whether each state can still reach an accepting state.
+        byteClasses (List[int]): Symbol class of every byte value, read as Latin-1.
+    """
+
+    DEAD = -1
+    ORDERS = ("bfs", "dfs", "profile")
+
+    def __init__(self, dfa: DFA, restart_on_unknown: bool = False, class_of: Optional[Dict[str, int]] = None,
+                 order: Optional[str] = None):
+        """
+        Compile a DFA into transition tables.
+
+        Args:
+            dfa (DFA): The DFA to compile.
+            restart_on_unknown (bool, optional): Send symbols outside the alphabet back to
+                the starting state instead of the dead state. Used by unanchored search
+                automata. Defaults to False.
+            class_of (Optional[Dict[str, int]], optional): Symbol classes to reuse from a
+                related automaton, so several tables can share one classified input.
+                Every symbol of a class must behave identically in this DFA, which holds
+                for automata derived from the same language (reversal, unanchoring).
+                Defaults to computing the classes from this DFA.
+            order (Optional[str], optional): State layout applied after compiling, "bfs"
+                or "dfs"; see reorder(). Defaults to the order of the DFA structure.
+        """
+        structure = dfa.structure
+        start_name = structure["startingState"]
+        self.stateNames = [start_name] + [state for state in structure
+                                          if state not in ("startingState", start_name)]
+        numbers = {name: i for i, name in enumerate(self.stateNames)}
+        self.start = 0
+
+        if class_of is None:
+            # Group symbols whose transitions agree in every state into one class
+            signatures: Dict[tuple, List[str]] = {}
+            for symbol in sorted(dfa.getAlphabet()):
+                signature = tuple(structure[name].get(symbol) for name in self.stateNames)
+                signatures.setdefault(signature, []).append(symbol)
+            class_of = {}
+            for cls, symbols in enumerate(signatures.values(), start=1):
+                for symbol in symbols:
+                    class_of[symbol] = cls
+        self.classOf = class_of
+        self.classCount = max(class_of.values(), default=0) + 1
+
+        # One representative symbol per class is enough to fill a column
+        representatives = {}
+        for symbol, cls in class_of.items():
+            representatives.setdefault(cls, symbol)
+
+        other = self.start if restart_on_unknown else self.DEAD
+        self.table = []
+        for name in self.stateNames:
+            row = [other] * self.classCount
+            for cls, symbol in representatives.items():
+                target = structure[name].get(symbol)
+                row[cls] = numbers[target] if target is not None else self.DEAD
+            self.table.append(row)
+        self.accepting = [structure[name]["isTerminatingState"] for name in self.stateNames]
+        self.trim()
+        if order is not None:
+            # Not shared with anyone yet, so the layout can be applied in place
+            self.applyLayout(self.stateOrder(order))
+
+        self.byteClasses = [self.classOf.get(chr(b), 0) for b in range(256)]
+        # Translation tables map raw input to one class id per byte in C when classes fit a byte
+        if self.classCount <= 256:
+            self.byteTranslation = bytes(self.byteClasses)
+            self.strTranslation = ClassTranslation({ord(symbol): chr(cls) for symbol, cls in self.classOf.items()})
+        else:
+            self.byteTranslation = None
+            self.strTranslation = None
+
+    def trim(self) -> None:
+        """
+        Redirect transitions into non-co-accessible states to DEAD.
+        """
+        predecessors = [[] for _ in self.table]
+        for state, row in enumerate(self.table):
+            for target in row:
+                if target != self.DEAD:
+                    predecessors[target].append(state)
+        self.live = list(self.accepting)
+        stack = [state for state, flag in enumerate(self.live) if flag]
+        while stack:
+            for previous in predecessors[stack.pop()]:
+                if not self.live[previous]:
+                    self.live[previous] = True
+                    stack.append(previous)
+        for row in self.table:
+            for cls, target in enumerate(row):
+                if target != self.DEAD and not self.live[target]:
+                    row[cls] = self.DEAD
+
+    def stateOrder(self, order: str = "bfs", profile: Optional[Sequence[int]] = None) -> List[int]:
+        """
+        Compute a layout of the states, starting with the starting state.
+
+        "bfs" and "dfs" traverse the table from the starting state in class order,
+        so the targets of a row are close to it. "profile" sorts states by
+        decreasing visit count, ties broken by BFS order, so the hot states of a
+        typical input share few cache lines. Unreachable states come last.
+
+        Args:
+            order (str, optional): One of ORDERS. Defaults to "bfs".
+            profile (Optional[Sequence[int]], optional): Visit count of every state, as
+                returned by visitCounts(); required for "profile".
+
+        Returns:
+            List[int]: The current state numbers in their new order.
+
+        Raises:
+            ValueError: If the order is unknown or a profile is missing.
+        """
+        if order not in self.ORDERS:
+            raise ValueError(f"Unknown state order: {order}. Expected one of {', '.join(self.ORDERS)}.")
+        if order == "profile":
+            if profile is None or len(profile) != len(self.table):
+                raise ValueError("The profile order needs one visit count per state.")
+            rank = {state: i for i, state in enumerate(self.stateOrder("bfs"))}
+            others = sorted((state for state in rank if state != self.start),
+                            key=lambda state: (-profile[state], rank[state]))
+            return [self.start] + others
+
+        seen = [False] * len(self.table)
+        seen[self.start] = True
+        if order == "bfs":
+            layout = [self.start]
+            for state in layout:
+                for target in self.table[state]:
+                    if target != self.DEAD and not seen[target]:
+                        seen[target] = True
+                        layout.append(target)
+        else:
+            layout = []
+            stack = [self.start]
+            while stack:
+                state = stack.pop()
+                layout.append(state)
+                # Push in reverse so the lowest class is explored first
+                for target in reversed(self.table[state]):
+                    if target != self.DEAD and not seen[target]:
+                        seen[target] = True
+                        stack.append(target)
+        layout.extend(state for state, flag in enumerate(seen) if not flag)
+        return layout
+
+    def reorder(self, order: str = "bfs", profile: Optional[Sequence[int]] = None) -> "CompiledDFA":
+        """
+        Build a copy whose states follow the layout computed by stateOrder().
+
+        Args:
+            order (str, optional): One of ORDERS. Defaults to "bfs".
+            profile (Optional[Sequence[int]], optional): Visit counts, for "profile".
+
+        Returns:
+            CompiledDFA: The renumbered copy; this table is left unchanged.
+        """
+        return self.renumber(self.stateOrder(order, profile))
+
+    def renumber(self, layout: Sequence[int]) -> "CompiledDFA":
+        """
+        Build a copy in which layout[i] becomes state i.
+
+        Tables may be shared between callers, e.g. by equivalent pipelines, so
+        they are never renumbered in place.
+
+        Args:
+            layout (Sequence[int]): Every current state number once, the starting state first.
+
+        Returns:
+            CompiledDFA: The renumbered copy; this table is left unchanged.
+
+        Raises:
+            ValueError: If the layout is not a permutation starting with the starting state.
+        """
+        renumbered = copy.copy(self)
+        renumbered.applyLayout(layout)
+        return renumbered
+
+    def applyLayout(self, layout: Sequence[int]) -> None:
+        """
+        Renumber the states in place so that layout[i] becomes state i.
+
+        Only used while the table is private to its creator; see renumber().
+
+        Args:
+            layout (Sequence[int]): Every current state number once, the starting state first.
+
+        Raises:
+            ValueError: If the layout is not a permutation starting with the starting state.
+        """
+        if sorted(layout) != list(range(len(self.table))) or layout[0] != self.start:
+            raise ValueError("A layout must list every state once, starting with the starting state.")
+        new_number = [0] * len(layout)
+        for new, old in enumerate(layout):
+            new_number[old] = new
+        self.table = [[target if target == self.DEAD else new_number[target] for target in self.table[old]]
+                      for old in layout]
+        self.accepting = [self.accepting[old] for old in layout]
+        self.live = [self.live[old] for old in layout]
+        self.stateNames = [self.stateNames[old] for old in layout]
+        self.start = 0
+
+    def visitCounts(self, data: Union[str, bytes, bytearray, memoryview, Iterable]) -> List[int]:
+        """
+        Count how often every state is entered while matching a training input.
+
+        The automaton runs from the starting state over the input; after a dead
+        transition it restarts, so the whole input contributes to the profile.
+
+        Args:
+            data: A string, a bytes-like object, or an iterable of such chunks.
+
+        Returns:
+            List[int]: The visit count of every state.
+        """
+        counts = [0] * len(self.table)
+        table, start = self.table, self.start
+        state = start
+        counts[state] += 1
+        for chunk in iterChunks(data):
+            for cls in self.classify(chunk):
+                state = table[state][cls]
+                if state == self.DEAD:
+                    state = start
+                counts[state] += 1
+        return counts
+
+    def isDead(self, state: int) -> bool:
+        """
+        Check whether acceptance has become impossible.
+
+        Args:
+            state (int): A state number, or DEAD.
+
+        Returns:
+            bool: True if no accepting state can be reached from the state.
+        """
+        return state == self.DEAD or not self.live[state]
+
+    def classify(self, chunk: Union[str, bytes, bytearray, memoryview]) -> Sequence[int]:
+        """
+        Map a chunk of input to its sequence of symbol classes.
+
+        Args:
+            chunk (Union[str, bytes, bytearray, memoryview]): Text or bytes; bytes are read as Latin-1.
+
+        Returns:
+            Sequence[int]: The symbol class of every input symbol.
+        """
+        if isinstance(chunk, str):
+            if self.strTranslation is not None:
+                return chunk.translate(self.strTranslation).encode("latin-1")
+            class_of = self.classOf
+            return [class_of.get(char, 0) for char in chunk]
+        if self.byteTranslation is not None:
+            return bytes(chunk).translate(self.byteTranslation)
+        byte_classes = self.byteClasses
+        return [byte_classes[b] for b in bytes(chunk)]
+
+    def run(self, data: Union[str, bytes], state: Optional[int] = None) -> int:
+        """
+        Run the automaton over an input.
+
+        Args:
+            data (Union[str, bytes]): The input to consume.
+            state (int, optional): The state to start from. Defaults to the starting state.
+
+        Returns:
+            int: The state reached, or DEAD if a transition was missing.
+        """
+        table = self.table
+        state = self.start if state is None else state
+        for cls in self.classify(data):
+            state = table[state][cls]
+            if state == self.DEAD:
+                return self.DEAD
+        return state
+
+    def accepts(self, data: Union[str, bytes]) -> bool:
+        """
+        Check whether the whole input is accepted.
+
+        Args:
+            data (Union[str, bytes]): The input to test.
+
+        Returns:
+            bool: True if the automaton ends in an accepting state.
+        """
+        state = self.run(data)
+        return state != self.DEAD and self.accepting[state]
+
+
+class ClassTranslation(dict):
+    """str.translate table sending characters outside the alphabet to class 0."""
+
+    def __missing__(self, key: int) -> str:
+        return "\x00"
+
+
+def iterChunks(data: Union[str, bytes, bytearray, memoryview, Iterable]) -> Iterable:
+    """
+    Normalize an input into an iterable of chunks.
+
+    Args:
+        data: A string, a bytes-like object, or an iterable of such chunks.
+
+    Returns:
+        Iterable: The chunks of the input.
+    """
+    if isinstance(data, (str, bytes, bytearray, memoryview)):
+        return (data,)
+    return data
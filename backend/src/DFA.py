@@ -2,13 +2,50 @@
 Deterministic Finite Automaton (DFA) implementation.
 
 This module provides an implementation of a DFA with support for state management,
-transitions, and JSON serialization.
+transitions, JSON serialization, canonical numbering and content hashing,
+language operations (intersection, union, difference and complement) based on
+product construction, and equivalence and inclusion checks that report a
+shortest counterexample.
 """
 
-from typing import Set
+from typing import Callable, Dict, Iterable, Optional, Set, TextIO, Tuple
+from utils import alphanumeric
+from NFA import NFA
+from JsonWriter import writeAutomaton
+import hashlib
 import json
 
 
+class ComparisonResult:
+    """
+    Outcome of comparing the languages of two DFAs.
+    
+    Evaluates to True or False in a boolean context, so it can be used directly
+    in conditions, and carries a counterexample when the answer is no.
+    
+    Attributes:
+        holds (bool): Whether the compared relation holds.
+        counterexample (Optional[str]): A shortest string witnessing the failure, or None.
+    """
+
+    def __init__(self, holds: bool, counterexample: Optional[str] = None):
+        """
+        Initialize a comparison result.
+        
+        Args:
+            holds (bool): Whether the compared relation holds.
+            counterexample (Optional[str], optional): A witness string when it does not hold.
+        """
+        self.holds = holds
+        self.counterexample = counterexample
+
+    def __bool__(self) -> bool:
+        return self.holds
+
+    def __repr__(self) -> str:
+        return f"ComparisonResult(holds={self.holds}, counterexample={self.counterexample!r})"
+
+
 class DFA:
     """
     Deterministic Finite Automaton (DFA) class.
@@ -25,6 +62,7 @@ class DFA:
         self.structure = {
             "startingState": ""  # Default empty starting state
         }
+        self.tags = {}  # Pattern identifiers of accepting states, kept out of the structure
     
     def setStartingState(self, state: str) -> None:
         """
@@ -85,57 +123,180 @@ class DFA:
         else:
             self.structure[state]["isTerminatingState"] = is_terminating
     
+    def setTags(self, state: str, tags: Set[int]) -> None:
+        """
+        Set the pattern identifiers attached to a state.
+        
+        Args:
+            state (str): The state to tag.
+            tags (Set[int]): The pattern identifiers; an empty set removes the tags.
+        """
+        if tags:
+            self.tags[state] = set(tags)
+        else:
+            self.tags.pop(state, None)
+    
+    def getTags(self, state: str) -> Set[int]:
+        """
+        Get the pattern identifiers attached to a state.
+        
+        Args:
+            state (str): The state to query.
+            
+        Returns:
+            Set[int]: The pattern identifiers, empty if the state is untagged.
+        """
+        return self.tags.get(state, set())
+    
     def toJson(self) -> str:
         """
         Convert the DFA to a JSON string.
         
+        States are renumbered in the output only; the DFA itself is left unchanged.
+        
         Returns:
             str: A JSON string representation of the DFA structure.
         """
-        # Renumber states before serializing
-        self.renumberStates()
-        return json.dumps(self.structure, indent=4)
+        return json.dumps(self.renumberedStructure(), indent=4)
     
-    def renumberStates(self, prefix: str = "S") -> None:
+    def writeJson(self, stream: TextIO, indent: Optional[int] = None) -> None:
         """
-        Renumber all states in sequential order starting from 0.
+        Write the DFA as JSON to a stream, one state at a time.
+        
+        Uses far less memory than toJson() for large automata, and leaves the
+        DFA unchanged.
         
         Args:
-            prefix (str, optional): Prefix to use for state names. Defaults to "S".
+            stream (TextIO): The text stream to write to, e.g. an open file.
+            indent (Optional[int], optional): Indentation, or None for compact output. Defaults to None.
         """
-        if "startingState" not in self.structure:
-            return        
-        
-        original_start = self.structure["startingState"]
-        old_to_new = {}
-        counter = 0
-        
-        # First, rename the starting state
-        old_to_new[original_start] = f"{prefix}{counter}"
-        counter += 1
+        writeAutomaton(self, stream, indent)
+    
+    def renumberMap(self, prefix: str = "S") -> Dict[str, str]:
+        """
+        Compute sequential state names, starting from 0 at the starting state.
         
-        # Then rename all other states
+        Args:
+            prefix (str, optional): Prefix to use for state names. Defaults to "S".
+            
+        Returns:
+            Dict[str, str]: New name of every state, in output order.
+        """
+        old_to_new = {self.structure["startingState"]: f"{prefix}0"}
         for state in self.structure:
             if state != "startingState" and state not in old_to_new:
-                old_to_new[state] = f"{prefix}{counter}"
-                counter += 1        
+                old_to_new[state] = f"{prefix}{len(old_to_new)}"
+        return old_to_new
+    
+    def renumberedStructure(self, prefix: str = "S") -> dict:
+        """
+        Build a copy of the structure with renumbered states.
         
-        # Create new structure with renamed starting state
+        Args:
+            prefix (str, optional): Prefix to use for state names. Defaults to "S".
+            
+        Returns:
+            dict: The renumbered structure.
+        """
+        old_to_new = self.renumberMap(prefix)
         new_structure = {
-            "startingState": old_to_new[original_start]
-        }        
-        
-        # Update all transitions to use new state names
+            "startingState": old_to_new[self.structure["startingState"]]
+        }
         for old_state, new_state in old_to_new.items():
             state_data = self.structure[old_state].copy()
             for symbol in state_data:
                 # Update transition destinations
                 if symbol != "isTerminatingState" and isinstance(state_data[symbol], str):
                     state_data[symbol] = old_to_new[state_data[symbol]]
-            new_structure[new_state] = state_data        
+            new_structure[new_state] = state_data
+        return new_structure
+    
+    def renumberStates(self, prefix: str = "S") -> None:
+        """
+        Renumber all states in sequential order starting from 0.
+        
+        Args:
+            prefix (str, optional): Prefix to use for state names. Defaults to "S".
+        """
+        if "startingState" not in self.structure:
+            return
+        
+        old_to_new = self.renumberMap(prefix)
+        self.structure = self.renumberedStructure(prefix)
+        self.tags = {old_to_new[state]: tags for state, tags in self.tags.items() if state in old_to_new}
+    
+    def canonicalMap(self, prefix: str = "S") -> Dict[str, str]:
+        """
+        Compute canonical state names by breadth-first search from the starting state.
+        
+        The transitions of every state are followed in sorted symbol order, so
+        isomorphic DFAs get the same names whatever their original names and
+        dictionary order. Unreachable states are left out.
         
-        # Replace old structure with new one
-        self.structure = new_structure
+        Args:
+            prefix (str, optional): Prefix to use for state names. Defaults to "S".
+            
+        Returns:
+            Dict[str, str]: New name of every reachable state, in canonical order.
+        """
+        start = self.structure["startingState"]
+        old_to_new = {start: f"{prefix}0"}
+        queue = [start]
+        for state in queue:
+            state_obj = self.structure[state]
+            for symbol in sorted(state_obj):
+                target = state_obj[symbol]
+                if symbol != "isTerminatingState" and target not in old_to_new:
+                    old_to_new[target] = f"{prefix}{len(old_to_new)}"
+                    queue.append(target)
+        return old_to_new
+    
+    def canonicalize(self, prefix: str = "S") -> "DFA":
+        """
+        Build a copy of the DFA with canonical state names and order.
+        
+        States are added in canonical order and their transitions in sorted
+        symbol order. For minimized DFAs, which are unique up to state names,
+        equivalent DFAs therefore have identical canonical copies.
+        
+        Args:
+            prefix (str, optional): Prefix to use for state names. Defaults to "S".
+            
+        Returns:
+            DFA: The canonical copy, without unreachable states.
+        """
+        old_to_new = self.canonicalMap(prefix)
+        canonical = DFA()
+        canonical.setStartingState(old_to_new[self.structure["startingState"]])
+        for old_state, new_state in old_to_new.items():
+            state_obj = self.structure[old_state]
+            canonical.setTerminating(new_state, state_obj["isTerminatingState"])
+            for symbol in sorted(state_obj):
+                if symbol != "isTerminatingState":
+                    canonical.addTransition(new_state, symbol, old_to_new[state_obj[symbol]])
+            canonical.setTags(new_state, self.getTags(old_state))
+        return canonical
+    
+    def canonicalHash(self) -> str:
+        """
+        Compute a stable hash of the content of the DFA.
+        
+        The hash covers the reachable states in canonical order with their
+        acceptance, transitions and tags, but not the state names. It does not
+        depend on the interpreter's hash seed, so it can key on-disk and
+        cross-process caches. Equivalent minimized DFAs have the same hash.
+        
+        Returns:
+            str: A hex digest of the canonical structure.
+        """
+        old_to_new = self.canonicalMap("")
+        content = []
+        for old_state in old_to_new:
+            state_obj = self.structure[old_state]
+            transitions = sorted((symbol, int(old_to_new[target])) for symbol, target in state_obj.items()
+                                 if symbol != "isTerminatingState")
+            content.append([state_obj["isTerminatingState"], transitions, sorted(self.getTags(old_state))])
+        return hashlib.blake2b(json.dumps(content).encode(), digest_size=16).hexdigest()
     
     def getAlphabet(self) -> Set[str]:
         """
@@ -153,3 +314,277 @@ class DFA:
                     if symbol != "isTerminatingState":
                         alphabet.add(symbol)
         return alphabet
+
+    def toNFA(self) -> NFA:
+        """
+        Convert the DFA to an equivalent NFA with the same states.
+        
+        Returns:
+            NFA: An NFA whose transitions are the DFA's transitions.
+        """
+        nfa = NFA()
+        nfa.setStartingState(self.structure["startingState"])
+        for state, state_obj in self.structure.items():
+            if state == "startingState":
+                continue
+            nfa.setTerminating(state, state_obj["isTerminatingState"])
+            for symbol, target in state_obj.items():
+                if symbol != "isTerminatingState":
+                    nfa.addTransition(state, symbol, target)
+        for state, tags in self.tags.items():
+            for tag in tags:
+                nfa.addTag(state, tag)
+        return nfa
+    
+    def isAccepting(self, state: Optional[str]) -> bool:
+        """
+        Check whether a state is accepting.
+        
+        Args:
+            state (Optional[str]): The state to check; None stands for the implicit dead sink.
+            
+        Returns:
+            bool: True if the state is a terminal/accepting state.
+        """
+        return state is not None and self.structure[state]["isTerminatingState"]
+    
+    def step(self, state: Optional[str], symbol: str) -> Optional[str]:
+        """
+        Follow the transition from a state on a symbol.
+        
+        Missing transitions lead to the implicit dead sink, represented by None.
+        
+        Args:
+            state (Optional[str]): The source state, or None for the dead sink.
+            symbol (str): The input symbol.
+            
+        Returns:
+            Optional[str]: The destination state, or None for the dead sink.
+        """
+        if state is None:
+            return None
+        return self.structure[state].get(symbol)
+    
+    def productConstruction(self, other: "DFA", accept: Callable[[bool, bool], bool],
+                            minimize: bool = False) -> "DFA":
+        """
+        Build the product of this DFA with another one.
+        
+        Only state pairs reachable from the pair of starting states are explored.
+        Both DFAs are completed on the fly with an implicit dead sink. Only the pair
+        of two dead sinks is left out, when the rule rejects it; other pairs that
+        can never become accepting are kept, and are merged away by minimization.
+        
+        Args:
+            other (DFA): The second operand.
+            accept (Callable[[bool, bool], bool]): Decides whether a pair is accepting
+                from the acceptance of its two components.
+            minimize (bool, optional): Whether to minimize the result. Defaults to False.
+            
+        Returns:
+            DFA: The product DFA.
+        """
+        alphabet = sorted(self.getAlphabet() | other.getAlphabet())
+        # The pair of dead sinks is accepting only if the rule accepts (False, False)
+        sink_pair_live = accept(False, False)
+        
+        product = DFA()
+        start = (self.structure["startingState"], other.structure["startingState"])
+        names = {start: "S0"}
+        product.setStartingState("S0")
+        product.setTerminating("S0", accept(self.isAccepting(start[0]), other.isAccepting(start[1])))
+        queue = [start]
+        
+        while queue:
+            pair = queue.pop(0)
+            for symbol in alphabet:
+                target = (self.step(pair[0], symbol), other.step(pair[1], symbol))
+                if target == (None, None) and not sink_pair_live:
+                    continue
+                if target not in names:
+                    names[target] = f"S{len(names)}"
+                    product.setTerminating(names[target], accept(self.isAccepting(target[0]),
+                                                                 other.isAccepting(target[1])))
+                    queue.append(target)
+                product.addTransition(names[pair], symbol, names[target])
+        
+        if minimize:
+            from DFAMinimizer import DFAMinimizer
+            return DFAMinimizer(product).minimize()
+        return product
+    
+    def intersect(self, other: "DFA", minimize: bool = False) -> "DFA":
+        """
+        Build a DFA accepting the strings accepted by both DFAs.
+        
+        Args:
+            other (DFA): The second operand.
+            minimize (bool, optional): Whether to minimize the result. Defaults to False.
+            
+        Returns:
+            DFA: The intersection DFA.
+        """
+        return self.productConstruction(other, lambda a, b: a and b, minimize)
+    
+    def union(self, other: "DFA", minimize: bool = False) -> "DFA":
+        """
+        Build a DFA accepting the strings accepted by either DFA.
+        
+        Args:
+            other (DFA): The second operand.
+            minimize (bool, optional): Whether to minimize the result. Defaults to False.
+            
+        Returns:
+            DFA: The union DFA.
+        """
+        return self.productConstruction(other, lambda a, b: a or b, minimize)
+    
+    def difference(self, other: "DFA", minimize: bool = False) -> "DFA":
+        """
+        Build a DFA accepting the strings accepted by this DFA but not by the other.
+        
+        Args:
+            other (DFA): The DFA whose language is subtracted.
+            minimize (bool, optional): Whether to minimize the result. Defaults to False.
+            
+        Returns:
+            DFA: The difference DFA.
+        """
+        return self.productConstruction(other, lambda a, b: a and not b, minimize)
+    
+    def complement(self, alphabet: Optional[Iterable[str]] = None, minimize: bool = False) -> "DFA":
+        """
+        Build a DFA accepting the strings over an alphabet that this DFA rejects.
+        
+        The DFA is completed with an explicit sink state receiving every missing
+        transition, then accepting and non-accepting states are swapped.
+        
+        Args:
+            alphabet (Optional[Iterable[str]], optional): The alphabet to complement over.
+                Defaults to the alphanumeric characters plus this DFA's own symbols.
+            minimize (bool, optional): Whether to minimize the result. Defaults to False.
+            
+        Returns:
+            DFA: The complement DFA.
+        """
+        if alphabet is None:
+            alphabet = set(alphanumeric) | self.getAlphabet()
+        alphabet = sorted(set(alphabet))
+        
+        complement = DFA()
+        start = self.structure["startingState"]
+        names = {start: "S0"}
+        complement.setStartingState("S0")
+        complement.setTerminating("S0", not self.isAccepting(start))
+        queue = [start]
+        
+        while queue:
+            state = queue.pop(0)
+            for symbol in alphabet:
+                # Missing transitions go to the sink (None), which loops on every symbol
+                target = self.step(state, symbol)
+                if target not in names:
+                    names[target] = f"S{len(names)}"
+                    complement.setTerminating(names[target], not self.isAccepting(target))
+                    queue.append(target)
+                complement.addTransition(names[state], symbol, names[target])
+        
+        if minimize:
+            from DFAMinimizer import DFAMinimizer
+            return DFAMinimizer(complement).minimize()
+        return complement
+
+    def equivalent(self, other: "DFA") -> ComparisonResult:
+        """
+        Check whether this DFA and another one accept the same language.
+        
+        Uses the Hopcroft-Karp algorithm: the synchronized product is explored
+        breadth-first while a union-find structure merges the states assumed
+        equivalent, so every state is visited a near-linear number of times.
+        The search stops at the first pair that disagrees on acceptance.
+        
+        Args:
+            other (DFA): The DFA to compare against.
+            
+        Returns:
+            ComparisonResult: The answer, with a shortest distinguishing string if they differ.
+        """
+        alphabet = sorted(self.getAlphabet() | other.getAlphabet())
+        parent: Dict[Tuple[int, Optional[str]], Tuple[int, Optional[str]]] = {}
+        
+        def find(node: Tuple[int, Optional[str]]) -> Tuple[int, Optional[str]]:
+            root = node
+            while parent.get(root, root) != root:
+                root = parent[root]
+            # Path compression
+            while node != root:
+                parent[node], node = root, parent.get(node, node)
+            return root
+        
+        start = (self.structure["startingState"], other.structure["startingState"])
+        # Predecessor links rebuild the counterexample without storing a string per pair
+        previous = {start: None}
+        parent[(0, start[0])] = (1, start[1])
+        queue = [start]
+        
+        while queue:
+            pair = queue.pop(0)
+            if self.isAccepting(pair[0]) != other.isAccepting(pair[1]):
+                return ComparisonResult(False, self.rebuildWord(previous, pair))
+            for symbol in alphabet:
+                target = (self.step(pair[0], symbol), other.step(pair[1], symbol))
+                left, right = find((0, target[0])), find((1, target[1]))
+                if left != right:
+                    parent[left] = right
+                    previous[target] = (pair, symbol)
+                    queue.append(target)
+        
+        return ComparisonResult(True)
+    
+    def includes(self, other: "DFA") -> ComparisonResult:
+        """
+        Check whether every string accepted by another DFA is accepted by this one.
+        
+        Explores the reachable pairs of the synchronized product breadth-first
+        and stops at the first pair accepted by the other DFA but not by this one.
+        
+        Args:
+            other (DFA): The DFA whose language should be contained in this one.
+            
+        Returns:
+            ComparisonResult: The answer, with a shortest string accepted only by the other DFA.
+        """
+        alphabet = sorted(self.getAlphabet() | other.getAlphabet())
+        start = (self.structure["startingState"], other.structure["startingState"])
+        previous = {start: None}
+        queue = [start]
+        
+        while queue:
+            pair = queue.pop(0)
+            if other.isAccepting(pair[1]) and not self.isAccepting(pair[0]):
+                return ComparisonResult(False, self.rebuildWord(previous, pair))
+            for symbol in alphabet:
+                target = (self.step(pair[0], symbol), other.step(pair[1], symbol))
+                # Once the other DFA is dead, nothing beyond this pair can be a counterexample
+                if target[1] is not None and target not in previous:
+                    previous[target] = (pair, symbol)
+                    queue.append(target)
+        
+        return ComparisonResult(True)
+    
+    def rebuildWord(self, previous: dict, pair: tuple) -> str:
+        """
+        Rebuild the input string leading to a product pair from predecessor links.
+        
+        Args:
+            previous (dict): Maps each discovered pair to its (predecessor pair, symbol), or None for the start.
+            pair (tuple): The pair to rebuild the path to.
+            
+        Returns:
+            str: The symbols read from the starting pair to the given pair.
+        """
+        symbols = []
+        while previous[pair] is not None:
+            pair, symbol = previous[pair]
+            symbols.append(symbol)
+        return "".join(reversed(symbols))
@@ -5,8 +5,9 @@ This module implements Hopcroft's algorithm for minimizing Deterministic Finite
 by combining equivalent states to create a smaller, equivalent DFA.
 """
 
-from typing import List, Set
+from typing import List, Optional, Set
 from DFA import *
+from Budget import Budget
 
 
 class DFAMinimizer:
@@ -19,17 +20,21 @@ class DFAMinimizer:
     Attributes:
         dfa (DFA): The DFA to be minimized.
         alphabet (Set[str]): Set of all input symbols used in the DFA.
+        budget (Optional[Budget]): Limits checked during the minimization, or None.
     """
     
-    def __init__(self, dfa: DFA):
+    def __init__(self, dfa: DFA, budget: Optional[Budget] = None):
         """
         Initialize the minimizer with the DFA to be minimized.
         
         Args:
             dfa (DFA): The DFA to minimize.
+            budget (Optional[Budget], optional): Limits on DFA states and time checked
+                during the minimization. Defaults to None.
         """
         self.dfa = dfa
         self.alphabet = dfa.getAlphabet()
+        self.budget = budget
 
     def minimize(self) -> DFA:
         """
@@ -40,9 +45,17 @@ class DFAMinimizer:
         
         Returns:
             DFA: The minimized DFA that recognizes the same language.
+            
+        Raises:
+            BudgetExceededError: If the minimization exceeds the budget.
         """
-        # First, remove states that can't be reached from the start state
+        if self.budget is not None:
+            self.budget.check("minimization", dfa_states=len(self.dfa.structure) - 1)
+        
+        # First, remove states that can't be reached from the start state,
+        # then states that can never reach an accepting state
         self.removeUnreachableStates()
+        self.removeDeadStates()
         
         dfa_structure = self.dfa.structure
         states = set()
@@ -53,21 +66,17 @@ class DFAMinimizer:
         if not states:
             return self.dfa
         
-        # Initial partition: accepting and non-accepting states
-        accepting = set()
-        non_accepting = set()
+        # Initial partition: accepting and non-accepting states, with accepting
+        # states further separated by their pattern tags so tags stay distinct
+        groups = {}
         
         for state in states:
-            if dfa_structure[state]["isTerminatingState"]:
-                accepting.add(state)
-            else:
-                non_accepting.add(state)
+            key = (dfa_structure[state]["isTerminatingState"], frozenset(self.dfa.getTags(state)))
+            if key not in groups:
+                groups[key] = set()
+            groups[key].add(state)
         
-        partitions = []
-        if accepting:
-            partitions.append(accepting)
-        if non_accepting:
-            partitions.append(non_accepting)
+        partitions = list(groups.values())
         
         # Refine partitions until no more refinements are possible
         while True:
@@ -101,6 +110,10 @@ class DFAMinimizer:
         new_partitions = []
         
         for partition in partitions:
+            # Give the budget a chance to stop the minimization between partitions
+            if self.budget is not None:
+                self.budget.check("minimization", dfa_states=len(self.dfa.structure) - 1)
+            
             # Singleton sets can't be split further
             if len(partition) <= 1:
                 new_partitions.append(partition)
@@ -190,13 +203,64 @@ class DFAMinimizer:
         
         for state in to_remove:
             del dfa_structure[state]
+            self.dfa.tags.pop(state, None)
 
+    def removeDeadStates(self) -> None:
+        """
+        Remove states from which no accepting state can be reached.
+        
+        Searches backwards from the accepting states to find every co-accessible
+        state, then deletes the other states together with the transitions leading
+        to them, so a missing transition always means that acceptance has become
+        impossible. The starting state is kept, without transitions, if the DFA
+        accepts nothing.
+        """
+        dfa_structure = self.dfa.structure
+        start_state = dfa_structure["startingState"]
+        
+        # Build reverse adjacency to search backwards from the accepting states
+        predecessors = {}
+        live = set()
+        for state in dfa_structure:
+            if state == "startingState":
+                continue
+            if dfa_structure[state]["isTerminatingState"]:
+                live.add(state)
+            for symbol, target in dfa_structure[state].items():
+                if symbol != "isTerminatingState":
+                    predecessors.setdefault(target, set()).add(state)
+        
+        stack = list(live)
+        while stack:
+            current = stack.pop()
+            for previous in predecessors.get(current, ()):
+                if previous not in live:
+                    live.add(previous)
+                    stack.append(previous)
+        
+        to_remove = [state for state in dfa_structure
+                     if state != "startingState" and state not in live and state != start_state]
+        for state in to_remove:
+            del dfa_structure[state]
+            self.dfa.tags.pop(state, None)
+        
+        # Drop transitions into removed states (and all of them from a dead start)
+        for state in dfa_structure:
+            if state == "startingState":
+                continue
+            state_obj = dfa_structure[state]
+            for symbol in [s for s in state_obj if s != "isTerminatingState"]:
+                if state_obj[symbol] not in live:
+                    del state_obj[symbol]
+    
     def createMinimizedDFA(self, partitions: List[Set[str]]) -> DFA:
         """
         Create a new DFA based on the partitions.
         
         Each partition becomes a state in the new DFA, with transitions
         determined by the transitions of any representative state from the partition.
+        The result is canonicalized, so equivalent DFAs minimize to identical
+        structures with states named P0, P1, ... in breadth-first order.
         
         Args:
             partitions (List[Set[str]]): The final partitions representing equivalent states.
@@ -210,19 +274,17 @@ class DFAMinimizer:
         minimized_dfa = DFA()
         dfa_structure = self.dfa.structure
         start_state = dfa_structure["startingState"]
-        start_partition_index = None
         
-        # Find which partition contains the start state
+        # Index the partition of every state once instead of searching for each transition
+        partition_of = {}
         for i, partition in enumerate(partitions):
-            if start_state in partition:
-                start_partition_index = i
-                break
+            for state in partition:
+                partition_of[state] = i
         
-        if start_partition_index is None:
+        if start_state not in partition_of:
             raise ValueError("Start state not found in any partition")
             
-        new_start_state = f"P{start_partition_index}"
-        minimized_dfa.setStartingState(new_start_state)
+        minimized_dfa.setStartingState(f"P{partition_of[start_state]}")
         
         # Process each partition to create the new DFA
         for i, partition in enumerate(partitions):
@@ -233,15 +295,13 @@ class DFAMinimizer:
             # Use any state in the partition as representative for transitions
             representative = next(iter(partition))
             
+            # All states of a partition carry the same tags
+            minimized_dfa.setTags(f"P{i}", self.dfa.getTags(representative))
+            
             # Add transitions from this new state based on representative state
             for symbol in self.alphabet:
                 if symbol in dfa_structure[representative]:
                     target_state = dfa_structure[representative][symbol]
-                    
-                    # Find which partition contains the target state
-                    for j, p in enumerate(partitions):
-                        if target_state in p:
-                            minimized_dfa.addTransition(f"P{i}", symbol, f"P{j}")
-                            break
-        
-        return minimized_dfa
+                    minimized_dfa.addTransition(f"P{i}", symbol, f"P{partition_of[target_state]}")
+        
+        return minimized_dfa.canonicalize("P")
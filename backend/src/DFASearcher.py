@@ -0,0 +1,451 @@
+"""
+Unanchored DFA search.
+
+This module finds occurrences of a regular expression inside larger inputs. An
+unanchored variant of the DFA (equivalent to an implicit `.*` prefix) reports
+match end positions in a single pass, and leftmost-longest match spans are
+recovered by a forward scan that tracks the start position of each live state.
+Inputs can be strings, bytes, or iterables of chunks, and all results are
+produced lazily by generators.
+
+For inputs held in memory, reversed automata built from the reversed NFA let
+match starts be found by scanning backwards from a match end, so the text
+between matches is only read by the single-state unanchored scan. Literals
+extracted from the pattern let that scan jump between candidate positions with
+`str.find`/`bytes.find` instead of reading every symbol.
+"""
+
+from collections import deque
+from typing import Iterable, Iterator, Optional, Sequence, Tuple, Union
+from DFA import DFA
+from NFA import NFA
+from NFAtoDFA import NFAtoDFA
+from DFAMinimizer import DFAMinimizer
+from CompiledDFA import CompiledDFA, iterChunks
+from LiteralExtractor import LiteralInfo, LiteralExtractor
+
+
+class DFASearcher:
+    """
+    Search engine over a DFA.
+
+    All compiled automata share the symbol classes of the forward DFA, so an
+    input is classified once and can be scanned by any of them.
+
+    Attributes:
+        dfa (DFA): The anchored DFA of the pattern.
+        forward (CompiledDFA): Compiled anchored DFA, used to recover match spans.
+        unanchored (CompiledDFA): Compiled unanchored DFA, used to find match ends.
+        reverse (CompiledDFA): Compiled DFA of the reversed pattern, run backwards
+            from a match end to find where matches ending there start.
+        reversePrefix (CompiledDFA): Compiled DFA of the reversed prefixes of the
+            pattern, run backwards from a match end to bound where any match
+            reaching that end can start.
+        prefixLiteral (str): A literal every match starts with, or "".
+        requiredLiteral (str): A literal every match contains, or "".
+    """
+
+    def __init__(self, dfa: DFA, nfa: Optional[NFA] = None, literals: Optional[LiteralInfo] = None):
+        """
+        Initialize the searcher and compile its automata.
+
+        Args:
+            dfa (DFA): The DFA of the pattern to search for.
+            nfa (Optional[NFA], optional): The NFA the DFA was built from, used to build
+                the reversed automata. Defaults to an NFA derived from the DFA.
+            literals (Optional[LiteralInfo], optional): Literal facts of the pattern, used as
+                a prefilter. Defaults to no prefilter.
+        """
+        self.dfa = dfa
+        self.prefixLiteral = literals.prefix if literals is not None else ""
+        self.requiredLiteral = literals.required if literals is not None else ""
+        self.forward = CompiledDFA(dfa)
+        class_of = self.forward.classOf
+        self.unanchored = CompiledDFA(self.buildUnanchored(dfa), restart_on_unknown=True, class_of=class_of)
+
+        if nfa is None:
+            nfa = dfa.toNFA()
+        reversed_nfa = nfa.reverse()
+        self.reverse = CompiledDFA(self.determinize(reversed_nfa), class_of=class_of)
+        # Prefixes of matches are the strings leading from the start to a co-accessible state
+        co_accessible = self.reachableStates(reversed_nfa)
+        self.reversePrefix = CompiledDFA(self.determinize(nfa.reverse(co_accessible)), class_of=class_of)
+
+    @staticmethod
+    def fromRegex(regex: str) -> "DFASearcher":
+        """
+        Build a searcher for a regular expression.
+
+        Args:
+            regex (str): The regular expression to search for.
+
+        Returns:
+            DFASearcher: The searcher.
+        """
+        from Lexer import Lexer
+        from Parser import Parser
+        from NFABuilder import NFABuilder
+
+        ast = Parser(Lexer(regex).tokenize()).parse()
+        nfa = NFABuilder().buildFromAST(ast)
+        dfa = NFAtoDFA(nfa).convert()
+        return DFASearcher(DFAMinimizer(dfa).minimize(), nfa, LiteralExtractor().extract(ast))
+
+    def determinize(self, nfa: NFA) -> DFA:
+        """
+        Convert an NFA to a minimized DFA.
+
+        Args:
+            nfa (NFA): The NFA to convert.
+
+        Returns:
+            DFA: The minimized DFA.
+        """
+        return DFAMinimizer(NFAtoDFA(nfa).convert()).minimize()
+
+    def reachableStates(self, nfa: NFA) -> Iterable[str]:
+        """
+        Find the states of an NFA reachable from its starting state.
+
+        Args:
+            nfa (NFA): The NFA to explore.
+
+        Returns:
+            Iterable[str]: The reachable states, excluding the starting state itself
+                unless it lies on a cycle.
+        """
+        structure = nfa.structure
+        start = structure["startingState"]
+        reached = set()
+        stack = [start]
+        while stack:
+            state = stack.pop()
+            for symbol, targets in structure[state].items():
+                if symbol == "isTerminatingState":
+                    continue
+                for target in targets:
+                    if target not in reached:
+                        reached.add(target)
+                        stack.append(target)
+        return reached
+
+    def buildUnanchored(self, dfa: DFA) -> DFA:
+        """
+        Build the unanchored variant of a DFA.
+
+        The result recognizes every string ending with a match, i.e. the language of
+        `.*R`. It is obtained by a subset construction over the DFA's own states in
+        which the starting state is re-added after every symbol.
+
+        Args:
+            dfa (DFA): The anchored DFA.
+
+        Returns:
+            DFA: The minimized unanchored DFA.
+        """
+        structure = dfa.structure
+        alphabet = sorted(dfa.getAlphabet())
+        start = frozenset([structure["startingState"]])
+        names = {start: "U0"}
+        unanchored = DFA()
+        unanchored.setStartingState("U0")
+        unanchored.setTerminating("U0", any(dfa.isAccepting(state) for state in start))
+        queue = [start]
+
+        while queue:
+            current = queue.pop(0)
+            for symbol in alphabet:
+                target = {structure[state][symbol] for state in current if symbol in structure[state]}
+                target = frozenset(target | start)
+                if target not in names:
+                    names[target] = f"U{len(names)}"
+                    unanchored.setTerminating(names[target], any(dfa.isAccepting(state) for state in target))
+                    queue.append(target)
+                unanchored.addTransition(names[current], symbol, names[target])
+
+        return DFAMinimizer(unanchored).minimize()
+
+    def findEnds(self, data: Union[str, bytes, Iterable]) -> Iterator[int]:
+        """
+        Find every position at which some match ends, in a single pass.
+
+        Args:
+            data (Union[str, bytes, Iterable]): The input, or an iterable of chunks.
+
+        Yields:
+            int: Each end position (exclusive index) of a match, in increasing order.
+        """
+        compiled = self.unanchored
+        table, accepting = compiled.table, compiled.accepting
+        state = compiled.start
+        pos = 0
+        if accepting[state]:
+            yield 0
+        for chunk in iterChunks(data):
+            for cls in compiled.classify(chunk):
+                state = table[state][cls]
+                pos += 1
+                if accepting[state]:
+                    yield pos
+
+    def leftmostStart(self, data: Union[str, bytes], end: int, lower: int = 0) -> Optional[int]:
+        """
+        Find the leftmost start of a match ending at a given position.
+
+        Scans backwards from the end with the reversed DFA until it dies.
+
+        Args:
+            data (Union[str, bytes]): The input held in memory.
+            end (int): The end position (exclusive index) of the match.
+            lower (int, optional): Do not look for starts before this position. Defaults to 0.
+
+        Returns:
+            Optional[int]: The leftmost start, or None if no match ends there.
+        """
+        start = self.scanBackwards(self.reverse, self.forward.classify(data[lower:end]), end - lower)
+        return None if start is None else start + lower
+
+    def iterEndSpans(self, data: Union[str, bytes]) -> Iterator[Tuple[int, int]]:
+        """
+        Find, for every match end, the leftmost start of a match ending there.
+
+        A forward scan of the unanchored DFA finds the ends, and a backward scan
+        of the reversed DFA from each end finds the start. Spans may overlap.
+
+        Args:
+            data (Union[str, bytes]): The input held in memory.
+
+        Yields:
+            Tuple[int, int]: The (start, end) span for each match end.
+        """
+        classes = self.forward.classify(data)
+        for end in self.findEnds(data):
+            yield self.scanBackwards(self.reverse, classes, end), end
+
+    def scanBackwards(self, compiled: CompiledDFA, classes: Sequence[int], end: int,
+                      lower: int = 0) -> Optional[int]:
+        """
+        Run a reversed automaton backwards over classified input.
+
+        Args:
+            compiled (CompiledDFA): The reversed automaton.
+            classes (Sequence[int]): The classified input.
+            end (int): The position to scan backwards from.
+            lower (int, optional): The position to stop at. Defaults to 0.
+
+        Returns:
+            Optional[int]: The lowest position at which the automaton accepted, or None.
+        """
+        table, accepting, dead = compiled.table, compiled.accepting, compiled.DEAD
+        state = compiled.start
+        found = end if accepting[state] else None
+        for pos in range(end - 1, lower - 1, -1):
+            state = table[state][classes[pos]]
+            if state == dead:
+                break
+            if accepting[state]:
+                found = pos
+        return found
+
+    def finditer(self, data: Union[str, bytes, Iterable]) -> Iterator[Tuple[int, int]]:
+        """
+        Find all non-overlapping leftmost-longest matches.
+
+        Strings and bytes held in memory are searched with the reversed automata;
+        iterables of chunks are searched in a single streaming forward pass.
+
+        Args:
+            data (Union[str, bytes, Iterable]): The input, or an iterable of chunks.
+
+        Yields:
+            Tuple[int, int]: The (start, end) span of each match.
+        """
+        if isinstance(data, (str, bytes, bytearray, memoryview)):
+            return self.finditerInMemory(data)
+        return self.finditerStreaming(data)
+
+    def finditerInMemory(self, data: Union[str, bytes]) -> Iterator[Tuple[int, int]]:
+        """
+        Find all non-overlapping leftmost-longest matches in an input held in memory.
+
+        From the current position, the unanchored DFA finds the earliest match end.
+        Every match that can still be reported starts before that end and reads the
+        text up to it as a prefix of a match, so a backward scan of the reversed
+        prefix DFA bounds the leftmost possible start. The exact leftmost-longest
+        span is then found by a forward scan from that bound only.
+
+        When the pattern has a literal prefix, every match starts at an occurrence
+        of it, so whenever the unanchored scan is back in its starting state it
+        jumps straight to the next occurrence.
+
+        Args:
+            data (Union[str, bytes]): The input held in memory.
+
+        Yields:
+            Tuple[int, int]: The (start, end) span of each match.
+        """
+        prefix, required = self.literalsFor(data)
+        if required and data.find(required) == -1:
+            return
+        classes = self.forward.classify(data)
+        unanchored = self.unanchored
+        table, accepting, start = unanchored.table, unanchored.accepting, unanchored.start
+        length = len(classes)
+        pos = 0
+
+        while pos <= length:
+            # Earliest end of a match starting at or after pos
+            state = start
+            end = pos if accepting[state] else None
+            index = pos
+            while end is None and index < length:
+                if prefix and state == start:
+                    index = data.find(prefix, index)
+                    if index == -1:
+                        return
+                state = table[state][classes[index]]
+                index += 1
+                if accepting[state]:
+                    end = index
+            if end is None:
+                return
+
+            lower = self.scanBackwards(self.reversePrefix, classes, end, pos)
+            span = self.longestFrom(classes, lower)
+            yield span
+            pos = span[1] if span[1] > span[0] else span[1] + 1
+
+    def literalsFor(self, data: Union[str, bytes]) -> Tuple[str, str]:
+        """
+        Get the prefilter literals in the representation of the input.
+
+        Args:
+            data (Union[str, bytes]): The input held in memory.
+
+        Returns:
+            Tuple[str, str]: The prefix and required literals, as str or Latin-1 bytes,
+                or empty when the input does not support find().
+        """
+        if isinstance(data, str):
+            return self.prefixLiteral, self.requiredLiteral
+        if not hasattr(data, "find"):
+            return "", ""
+        return self.prefixLiteral.encode("latin-1"), self.requiredLiteral.encode("latin-1")
+
+    def longestFrom(self, classes: Sequence[int], begin: int) -> Optional[Tuple[int, int]]:
+        """
+        Find the leftmost-longest match starting at or after a position.
+
+        Args:
+            classes (Sequence[int]): The classified input.
+            begin (int): The position to start looking from.
+
+        Returns:
+            Optional[Tuple[int, int]]: The (start, end) span, or None if there is no match.
+        """
+        remaining = (classes[index] for index in range(begin, len(classes)))
+        return next(self.scanThreads(remaining, begin), None)
+
+    def finditerStreaming(self, data: Union[str, bytes, Iterable]) -> Iterator[Tuple[int, int]]:
+        """
+        Find all non-overlapping leftmost-longest matches in a single forward pass.
+
+        The anchored DFA is run from every candidate start at once. Each live DFA
+        state only remembers the leftmost start that reached it, since later starts
+        in the same state can only produce matches further to the right. Once a
+        match is known, no new starts are added and the scan continues until every
+        thread that could still produce a longer or more leftward match has died.
+        Only the input read since the leftmost start that can still match is
+        buffered, so input without matches is not kept.
+
+        Args:
+            data (Union[str, bytes, Iterable]): The input, or an iterable of chunks.
+
+        Yields:
+            Tuple[int, int]: The (start, end) span of each match.
+        """
+        classify = self.forward.classify
+        return self.scanThreads((cls for chunk in iterChunks(data) for cls in classify(chunk)), 0)
+
+    def scanThreads(self, classes: Iterator[int], base: int) -> Iterator[Tuple[int, int]]:
+        """
+        Run the anchored DFA from every candidate start over a stream of symbol classes.
+
+        Args:
+            classes (Iterator[int]): The classified input, starting at position `base`.
+            base (int): The position of the first class in the input.
+
+        Yields:
+            Tuple[int, int]: The (start, end) span of each match.
+        """
+        compiled = self.forward
+        table, accepting, start, dead = compiled.table, compiled.accepting, compiled.start, compiled.DEAD
+        # Symbol classes of the positions from `base` onwards that have been read already
+        buffer = deque()
+
+        while True:
+            threads = {}
+            best = None
+            pos = base
+            index = 0
+            while True:
+                if best is None and start not in threads:
+                    threads[start] = pos
+                for state, origin in threads.items():
+                    if accepting[state] and (best is None or origin < best[0]
+                                             or (origin == best[0] and pos > best[1])):
+                        best = (origin, pos)
+                if best is not None:
+                    threads = {state: origin for state, origin in threads.items() if origin <= best[0]}
+                    if not threads:
+                        break
+                if index < len(buffer):
+                    cls = buffer[index]
+                else:
+                    cls = next(classes, None)
+                    if cls is None:
+                        break
+                    buffer.append(cls)
+                index += 1
+                pos += 1
+                advanced = {}
+                for state, origin in threads.items():
+                    target = table[state][cls]
+                    if target != dead and (target not in advanced or origin < advanced[target]):
+                        advanced[target] = origin
+                threads = advanced
+                if best is None:
+                    # No future match can start before the leftmost live thread
+                    low = min(threads.values(), default=pos)
+                    while base < low:
+                        buffer.popleft()
+                        base += 1
+                        index -= 1
+
+            if best is None:
+                return
+            yield best
+
+            # Resume after the match, stepping over empty matches
+            resume = best[1] if best[1] > best[0] else best[1] + 1
+            if resume - base > len(buffer):
+                # An empty match at the last read position: skip one unread symbol
+                buffer.clear()
+                if next(classes, None) is None:
+                    return
+            else:
+                for _ in range(resume - base):
+                    buffer.popleft()
+            base = resume
+
+    def search(self, data: Union[str, bytes, Iterable]) -> Optional[Tuple[int, int]]:
+        """
+        Find the leftmost-longest match.
+
+        Args:
+            data (Union[str, bytes, Iterable]): The input, or an iterable of chunks.
+
+        Returns:
+            Optional[Tuple[int, int]]: The (start, end) span of the match, or None.
+        """
+        return next(self.finditer(data), None)
@@ -0,0 +1,330 @@
+"""
+Automatic matching engine selection.
+
+Four engines can match a pattern, with different trade-offs:
+- bit-parallel: Shift-And over Glushkov positions, no construction, fast for
+  small patterns on short inputs
+- eager DFA: full subset construction and minimization, fastest per symbol
+  but can blow up exponentially
+- lazy DFA: subset construction on demand with a bounded cache
+- NFA simulation: no construction and no cache, linear memory
+
+The planner measures the AST and the NFA, estimates the size of the DFA and
+picks an engine from that estimate and the expected input volume. The eager
+DFA is built under a hard state budget, and the planner falls back to the lazy
+DFA when the budget is exceeded mid-construction.
+"""
+
+from typing import Dict, List, Optional, Tuple, Union
+from AST import *
+from NFA import NFA
+from NFAtoDFA import NFAtoDFA
+from Budget import Budget, BudgetExceededError
+from DFAMinimizer import DFAMinimizer
+from CompiledDFA import CompiledDFA
+from ShiftAndMatcher import ShiftAndMatcher, MAX_POSITIONS
+from NFASimulator import NFASimulator
+from LazyDFA import LazyDFA
+
+ENGINES = ("bit-parallel", "eager-dfa", "lazy-dfa", "nfa-simulation")
+
+# Default hard limit on the number of eager DFA states
+DEFAULT_MAX_DFA_STATES = 10000
+
+# At or below this many input symbols, building a DFA costs more than it saves
+SHORT_INPUT = 1 << 12
+
+# Largest exponent used when estimating the blowup of the subset construction
+MAX_BLOWUP_EXPONENT = 62
+
+
+class EnginePlan:
+    """
+    The engine chosen for a pattern and why.
+
+    Attributes:
+        engine (str): One of ENGINES.
+        reasons (List[str]): Human-readable reasons for the choice, in order.
+        metrics (Dict[str, int]): The measurements the choice was based on.
+    """
+
+    def __init__(self, engine: str, reasons: List[str], metrics: Dict[str, int]):
+        """
+        Initialize the plan.
+
+        Args:
+            engine (str): One of ENGINES.
+            reasons (List[str]): Reasons for the choice.
+            metrics (Dict[str, int]): The measurements the choice was based on.
+        """
+        self.engine = engine
+        self.reasons = reasons
+        self.metrics = metrics
+
+    def toDict(self) -> dict:
+        """
+        Convert the plan to a JSON-serializable dictionary.
+
+        Returns:
+            dict: The engine, reasons and metrics.
+        """
+        return {"engine": self.engine, "reasons": list(self.reasons), "metrics": dict(self.metrics)}
+
+
+class PlannedMatcher:
+    """
+    A matcher built by the planner, exposing the same interface for every engine.
+
+    Attributes:
+        plan (EnginePlan): The plan that was executed, including any fallback.
+        engine: The underlying engine object.
+    """
+
+    def __init__(self, plan: EnginePlan, engine, forward: Optional[CompiledDFA] = None,
+                 unanchored: Optional[CompiledDFA] = None):
+        """
+        Initialize the matcher.
+
+        Args:
+            plan (EnginePlan): The executed plan.
+            engine: The engine object; for the eager DFA, the minimized DFA.
+            forward (Optional[CompiledDFA], optional): Compiled anchored DFA of the eager engine.
+            unanchored (Optional[CompiledDFA], optional): Compiled unanchored DFA of the eager engine.
+        """
+        self.plan = plan
+        self.engine = engine
+        self.forward = forward
+        self.unanchored = unanchored
+
+    def accepts(self, text: Union[str, bytes]) -> bool:
+        """
+        Check whether the whole input matches.
+
+        Args:
+            text (Union[str, bytes]): The input; bytes are read as Latin-1.
+
+        Returns:
+            bool: True if the input matches the pattern.
+        """
+        if self.forward is not None:
+            return self.forward.accepts(text)
+        return self.engine.accepts(text)
+
+    def search(self, text: Union[str, bytes]) -> bool:
+        """
+        Check whether the input contains a match.
+
+        Args:
+            text (Union[str, bytes]): The input; bytes are read as Latin-1.
+
+        Returns:
+            bool: True if some substring matches the pattern.
+        """
+        if self.unanchored is not None:
+            compiled = self.unanchored
+            if compiled.accepting[compiled.start]:
+                return True
+            state = compiled.start
+            for cls in compiled.classify(text):
+                state = compiled.table[state][cls]
+                if state == compiled.DEAD:
+                    return False
+                if compiled.accepting[state]:
+                    return True
+            return False
+        return self.engine.search(text)
+
+
+class EnginePlanner:
+    """
+    Chooses and builds a matching engine for a pattern.
+
+    Attributes:
+        maxDFAStates (int): Hard limit on the number of eager DFA states.
+        maxPositions (int): Largest number of positions handled by the bit-parallel engine.
+    """
+
+    def __init__(self, max_dfa_states: int = DEFAULT_MAX_DFA_STATES, max_positions: int = MAX_POSITIONS):
+        """
+        Initialize the planner.
+
+        Args:
+            max_dfa_states (int, optional): Hard limit on eager DFA states. Defaults to DEFAULT_MAX_DFA_STATES.
+            max_positions (int, optional): Position limit of the bit-parallel engine. Defaults to MAX_POSITIONS.
+        """
+        self.maxDFAStates = max_dfa_states
+        self.maxPositions = max_positions
+
+    def measure(self, ast: AstNode, nfa: NFA) -> Dict[str, int]:
+        """
+        Measure a pattern.
+
+        Args:
+            ast (AstNode): The AST of the pattern.
+            nfa (NFA): The NFA of the pattern.
+
+        Returns:
+            Dict[str, int]: The measurements:
+                - positions: literal and character class occurrences
+                - star_alternation_depth: deepest nesting of stars around an alternation
+                - ambiguous_tail: most positions concatenated after a starred alternation
+                - nfa_states, nfa_transitions: size of the NFA
+                - max_closure: largest epsilon closure of a single NFA state
+                - estimated_dfa_states: predicted size of the DFA
+        """
+        positions, depth, _, tail = self.measureNode(ast, 0)
+        structure = nfa.structure
+        states = [state for state in structure if state != "startingState"]
+        transitions = sum(len(targets) for state in states
+                          for symbol, targets in structure[state].items() if symbol != "isTerminatingState")
+        simulator = NFASimulator(nfa)
+        max_closure = max((len(simulator.closure(state)) for state in range(simulator.compact.stateCount)),
+                          default=0)
+
+        estimate = positions + 1
+        if depth > 0:
+            estimate *= 2 ** min(tail, MAX_BLOWUP_EXPONENT)
+        estimate = min(estimate, 2 ** min(positions, MAX_BLOWUP_EXPONENT))
+        return {
+            "positions": positions,
+            "star_alternation_depth": depth,
+            "ambiguous_tail": tail,
+            "nfa_states": len(states),
+            "nfa_transitions": transitions,
+            "max_closure": max_closure,
+            "estimated_dfa_states": estimate,
+        }
+
+    def measureNode(self, node: AstNode, stars: int) -> Tuple[int, int, bool, int]:
+        """
+        Measure an AST node.
+
+        Args:
+            node (AstNode): The node to measure.
+            stars (int): Number of stars enclosing the node.
+
+        Returns:
+            Tuple[int, int, bool, int]: Its number of positions, the deepest nesting of
+                stars around an alternation within it, whether it contains a starred
+                alternation, and the most positions concatenated after one.
+
+        Raises:
+            ValueError: If an unsupported AST node type is encountered.
+        """
+        if isinstance(node, (LiteralAstNode, CharacterClassAstNode)):
+            # A character class under a star is an alternation of its characters
+            ambiguous = stars > 0 and isinstance(node, CharacterClassAstNode) and len(node.char_set) > 1
+            return 1, stars if ambiguous else 0, ambiguous, 0
+        elif isinstance(node, ConcatAstNode):
+            left = self.measureNode(node.left, stars)
+            right = self.measureNode(node.right, stars)
+            tail = max(left[3] + right[0] if left[2] else 0, right[3])
+            return left[0] + right[0], max(left[1], right[1]), left[2] or right[2], tail
+        elif isinstance(node, OrAstNode):
+            left = self.measureNode(node.left, stars)
+            right = self.measureNode(node.right, stars)
+            ambiguous = stars > 0 or left[2] or right[2]
+            depth = max(left[1], right[1], stars)
+            return left[0] + right[0], depth, ambiguous, max(left[3], right[3])
+        elif isinstance(node, (StarAstNode, PlusAstNode)):
+            return self.measureNode(node.sub_expr, stars + 1)
+        elif isinstance(node, OptionalAstNode):
+            return self.measureNode(node.sub_expr, stars)
+        else:
+            raise ValueError(f"Unsupported AST node type: {type(node).__name__}")
+
+    def plan(self, ast: AstNode, nfa: NFA, expected_input: Optional[int] = None) -> EnginePlan:
+        """
+        Choose an engine for a pattern.
+
+        Args:
+            ast (AstNode): The AST of the pattern.
+            nfa (NFA): The NFA of the pattern.
+            expected_input (Optional[int], optional): Total number of symbols expected to be
+                matched, or None if unknown (treated as a large volume).
+
+        Returns:
+            EnginePlan: The chosen engine and the reasons.
+        """
+        metrics = self.measure(ast, nfa)
+        positions, estimate = metrics["positions"], metrics["estimated_dfa_states"]
+        short_input = expected_input is not None and expected_input <= SHORT_INPUT
+        reasons = []
+        if expected_input is not None:
+            metrics["expected_input"] = expected_input
+
+        if short_input:
+            reasons.append(f"short input ({expected_input} symbols): construction would cost more than matching")
+            if positions <= self.maxPositions:
+                reasons.append(f"{positions} positions fit the bit-parallel engine")
+                return EnginePlan("bit-parallel", reasons, metrics)
+            reasons.append(f"{positions} positions exceed the bit-parallel limit of {self.maxPositions}")
+            return EnginePlan("nfa-simulation", reasons, metrics)
+
+        if estimate <= self.maxDFAStates:
+            reasons.append(f"estimated {estimate} DFA states within the budget of {self.maxDFAStates}")
+            return EnginePlan("eager-dfa", reasons, metrics)
+        reasons.append(f"estimated {estimate} DFA states exceed the budget of {self.maxDFAStates}"
+                       f" (starred alternation followed by {metrics['ambiguous_tail']} positions)")
+        reasons.append("lazy DFA only builds the states the input visits")
+        return EnginePlan("lazy-dfa", reasons, metrics)
+
+    def build(self, ast: AstNode, nfa: NFA, expected_input: Optional[int] = None) -> PlannedMatcher:
+        """
+        Choose an engine for a pattern and build it.
+
+        The eager DFA is built under the state budget; if the budget is exceeded
+        during the subset construction, the lazy DFA is used instead and the
+        fallback is recorded in the plan.
+
+        Args:
+            ast (AstNode): The AST of the pattern.
+            nfa (NFA): The NFA of the pattern.
+            expected_input (Optional[int], optional): Total number of symbols expected to be
+                matched, or None if unknown.
+
+        Returns:
+            PlannedMatcher: The matcher.
+        """
+        plan = self.plan(ast, nfa, expected_input)
+        if plan.engine == "bit-parallel":
+            return PlannedMatcher(plan, ShiftAndMatcher(ast, self.maxPositions))
+        if plan.engine == "nfa-simulation":
+            return PlannedMatcher(plan, NFASimulator(nfa))
+        if plan.engine == "eager-dfa":
+            budget = Budget(max_dfa_states=self.maxDFAStates)
+            try:
+                dfa = DFAMinimizer(NFAtoDFA(nfa, budget).convert()).minimize()
+                unanchored = DFAMinimizer(NFAtoDFA(nfa.unanchored(), budget).convert()).minimize()
+            except BudgetExceededError as error:
+                plan.engine = "lazy-dfa"
+                plan.reasons.append(f"{error} Fell back to the lazy DFA.")
+            else:
+                forward = CompiledDFA(dfa)
+                plan.metrics["dfa_states"] = len(forward.table)
+                compiled = CompiledDFA(unanchored, restart_on_unknown=True, class_of=forward.classOf)
+                return PlannedMatcher(plan, dfa, forward, compiled)
+        return PlannedMatcher(plan, LazyDFA(nfa, self.maxDFAStates))
+
+
+def compileMatcher(regex: str, expected_input: Optional[int] = None,
+                   max_dfa_states: int = DEFAULT_MAX_DFA_STATES) -> PlannedMatcher:
+    """
+    Build a matcher for a regular expression with an automatically chosen engine.
+
+    Args:
+        regex (str): The regular expression.
+        expected_input (Optional[int], optional): Total number of symbols expected to be
+            matched, or None if unknown.
+        max_dfa_states (int, optional): Hard limit on eager DFA states. Defaults to DEFAULT_MAX_DFA_STATES.
+
+    Returns:
+        PlannedMatcher: The matcher; its plan explains the choice.
+    """
+    from Lexer import Lexer
+    from Parser import Parser
+    from NFABuilder import NFABuilder
+
+    ast = Parser(Lexer(regex).tokenize()).parse()
+    nfa = NFABuilder().buildFromAST(ast)
+    return EnginePlanner(max_dfa_states).build(ast, nfa, expected_input)
@@ -0,0 +1,67 @@
+"""
+Streaming JSON serialization of automata.
+
+`toJson()` builds a renumbered copy of the whole structure and then the whole
+document as a single string. This module writes the same document state by
+state to any text stream instead, using a precomputed renumbering map, so the
+memory used beyond the map is bounded by the output of a single state. Output
+is compact by default; with an indent it is identical to `toJson()`.
+"""
+
+import json
+from typing import Dict, Optional, TextIO
+
+
+def renumberState(state_obj: dict, old_to_new: Dict[str, str]) -> dict:
+    """
+    Rename the transition targets of one state.
+
+    Works for NFA states (lists of targets, empty lists dropped) and DFA states
+    (single targets).
+
+    Args:
+        state_obj (dict): The state's entry in the structure.
+        old_to_new (Dict[str, str]): New name of every state.
+
+    Returns:
+        dict: The renamed state entry.
+    """
+    state_data = {}
+    for symbol, value in state_obj.items():
+        if symbol == "isTerminatingState":
+            state_data[symbol] = value
+        elif isinstance(value, list):
+            if value:
+                state_data[symbol] = [old_to_new[target] for target in value]
+        else:
+            state_data[symbol] = old_to_new[value]
+    return state_data
+
+
+def writeAutomaton(automaton, stream: TextIO, indent: Optional[int] = None) -> None:
+    """
+    Write an NFA or DFA as JSON, one state at a time.
+
+    Args:
+        automaton (Union[NFA, DFA]): The automaton; it is not modified.
+        stream (TextIO): The text stream to write to, e.g. an open file.
+        indent (Optional[int], optional): Indentation as in json.dumps, or None for
+            compact output. Defaults to None.
+    """
+    structure = automaton.structure
+    old_to_new = automaton.renumberMap()
+    if indent is None:
+        separator, newline, item_separators = ",", "", (",", ":")
+    else:
+        separator, newline, item_separators = ",", "\n" + " " * indent, (",", ": ")
+
+    stream.write("{" + newline)
+    stream.write(json.dumps("startingState") + item_separators[1] + json.dumps(old_to_new[structure["startingState"]]))
+    for old_state, new_state in old_to_new.items():
+        state_json = json.dumps(renumberState(structure[old_state], old_to_new), indent=indent,
+                                separators=item_separators)
+        if indent is not None:
+            # Nest the state object one level deeper
+            state_json = state_json.replace("\n", newline)
+        stream.write(separator + newline + json.dumps(new_state) + item_separators[1] + state_json)
+    stream.write(("\n" if indent is not None else "") + "}")
@@ -0,0 +1,124 @@
+"""
+Lazily constructed DFA.
+
+This module performs the subset construction on demand while matching: a DFA
+state is only created the first time the input reaches it, and transitions are
+cached once computed. Inputs that only visit a few of the (possibly exponentially
+many) DFA states run at nearly eager DFA speed. The cache is bounded and is
+flushed when full, so memory stays bounded whatever the pattern.
+"""
+
+from typing import Dict, FrozenSet, List, Union
+from NFA import NFA
+from NFASimulator import NFASimulator
+
+# Default maximum number of cached DFA states
+DEFAULT_CACHE_SIZE = 10000
+
+
+class LazyDFA(NFASimulator):
+    """
+    NFA simulation with a bounded cache of DFA states and transitions.
+
+    Cached states are numbered; moves[s] and unanchoredMoves[s] map characters to
+    the numbers of the next states for anchored and unanchored matching.
+
+    Attributes:
+        cacheSize (int): Maximum number of cached DFA states.
+        stateIds (Dict[FrozenSet[int], int]): Number of every cached state set.
+        stateSets (List[FrozenSet[int]]): State set of every cached number.
+        accepting (List[bool]): Whether each cached state is accepting.
+        moves (List[Dict[str, int]]): Cached anchored transitions.
+        unanchoredMoves (List[Dict[str, int]]): Cached unanchored transitions.
+        flushes (int): Number of times the cache has been flushed.
+    """
+
+    def __init__(self, nfa: NFA, cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Initialize the lazy DFA with an empty cache.
+
+        Args:
+            nfa (NFA): The automaton to determinize on demand.
+            cache_size (int, optional): Maximum number of cached DFA states. Defaults to DEFAULT_CACHE_SIZE.
+        """
+        super().__init__(nfa)
+        self.cacheSize = max(cache_size, 2)
+        self.flushes = 0
+        self.flush()
+
+    def flush(self) -> None:
+        """Drop every cached state and transition."""
+        self.stateIds: Dict[FrozenSet[int], int] = {}
+        self.stateSets: List[FrozenSet[int]] = []
+        self.accepting: List[bool] = []
+        self.moves: List[Dict[str, int]] = []
+        self.unanchoredMoves: List[Dict[str, int]] = []
+
+    def stateId(self, states: FrozenSet[int]) -> int:
+        """
+        Get the number of a state set, caching it if needed.
+
+        Args:
+            states (FrozenSet[int]): The state set.
+
+        Returns:
+            int: Its number in the cache.
+        """
+        state_id = self.stateIds.get(states)
+        if state_id is None:
+            state_id = len(self.stateSets)
+            self.stateIds[states] = state_id
+            self.stateSets.append(states)
+            self.accepting.append(not states.isdisjoint(self.acceptingStates))
+            self.moves.append({})
+            self.unanchoredMoves.append({})
+        return state_id
+
+    def advance(self, state_id: int, char: str, unanchored: bool = False) -> int:
+        """
+        Follow a transition, computing and caching it if needed.
+
+        Numbers held by the caller are invalidated when the cache is flushed, so
+        only the returned number may be used afterwards.
+
+        Args:
+            state_id (int): Number of the current state.
+            char (str): The input character.
+            unanchored (bool, optional): Whether to re-enter the starting states. Defaults to False.
+
+        Returns:
+            int: Number of the next state.
+        """
+        moves = self.unanchoredMoves if unanchored else self.moves
+        target = moves[state_id].get(char)
+        if target is None:
+            states = self.step(self.stateSets[state_id], char, unanchored)
+            if states not in self.stateIds and len(self.stateSets) >= self.cacheSize:
+                self.flush()
+                self.flushes += 1
+                return self.stateId(states)
+            target = self.stateId(states)
+            moves[state_id][char] = target
+        return target
+
+    def accepts(self, text: Union[str, bytes]) -> bool:
+        if not isinstance(text, str):
+            text = bytes(text).decode("latin-1")
+        state = self.stateId(self.startSet)
+        for char in text:
+            state = self.advance(state, char)
+            if not self.stateSets[state]:
+                return False
+        return self.accepting[state]
+
+    def search(self, text: Union[str, bytes]) -> bool:
+        if not isinstance(text, str):
+            text = bytes(text).decode("latin-1")
+        state = self.stateId(self.startSet)
+        if self.accepting[state]:
+            return True
+        for char in text:
+            state = self.advance(state, char, unanchored=True)
+            if self.accepting[state]:
+                return True
+        return False
@@ -24,7 +24,7 @@ class TokenType(Enum):
     LBRACKET = auto()       # '[' left bracket
     RBRACKET = auto()       # ']' right bracket
     HYPHEN = auto()         # '-' hyphen
-    LITERAL = auto()        # alphanumeric character
+    LITERAL = auto()        # alphanumeric or non-ASCII character
 
 
 # Mapping from characters to their corresponding token types
@@ -98,5 +98,6 @@ class Lexer:
         """
         stream: List[Token] = []
         for c in self.regex:
-            stream.append(Token(mapToTokenType[c], c))
+            # Every non-ASCII character is a literal
+            stream.append(Token(mapToTokenType[c] if c.isascii() else TokenType.LITERAL, c))
         return tuple(stream)
@@ -0,0 +1,205 @@
+"""
+Minimal acyclic DFAs for word lists.
+
+Patterns such as `(alpha|beta|gamma|...)` built from large dictionaries go
+through a long chain of binary OrAstNodes, a Thompson NFA with several states
+per character, and a subset construction and minimization over all of them.
+This module builds the minimal DFA of a finite word list directly with
+Daciuk's incremental algorithm for sorted input: words are added to a trie one
+at a time, and as soon as the part of the trie left behind by the previous word
+can no longer change, its states are merged with equivalent registered states.
+No NFA is built and no separate minimization is needed.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from Lexer import Token, TokenType
+from DFA import DFA
+from Budget import Budget
+
+
+def literalWords(tokens: Sequence[Token]) -> Optional[List[str]]:
+    """
+    Detect a pure alternation of literals, such as `(alpha|beta|gamma)`.
+
+    The tokens may be wrapped in parentheses as a whole; otherwise they may only
+    contain literals, concatenations and alternations.
+
+    Args:
+        tokens (Sequence[Token]): The tokens of the regular expression.
+
+    Returns:
+        Optional[List[str]]: The alternatives, or None if the regex is anything else.
+    """
+    # Strip parentheses enclosing the whole expression
+    while len(tokens) >= 2 and tokens[0].tokenType == TokenType.LPAREN \
+            and tokens[-1].tokenType == TokenType.RPAREN:
+        depth = 0
+        for i, token in enumerate(tokens[:-1]):
+            if token.tokenType == TokenType.LPAREN:
+                depth += 1
+            elif token.tokenType == TokenType.RPAREN:
+                depth -= 1
+            if depth == 0 and i > 0:
+                # The opening parenthesis closes before the end, as in (a)|(b)
+                return None
+        tokens = tokens[1:-1]
+
+    words = []
+    word = []
+    for token in tokens:
+        if token.tokenType == TokenType.LITERAL:
+            word.append(token.value)
+        elif token.tokenType == TokenType.OR:
+            if not word:
+                return None
+            words.append("".join(word))
+            word = []
+        elif token.tokenType != TokenType.CONCAT:
+            return None
+    if not word:
+        return None
+    words.append("".join(word))
+    return words
+
+
+class LiteralDFABuilder:
+    """
+    Builder of the minimal DFA accepting exactly the words of a list.
+
+    States are integers while building: transitions[s] maps symbols to states
+    and accepting[s] tells whether s is accepting. The register maps the
+    signature of every state whose outgoing language is final to that state.
+
+    Attributes:
+        budget (Optional[Budget]): Limits checked while building, or None.
+        transitions (List[Dict[str, int]]): Transitions of every state.
+        accepting (List[bool]): Whether every state is accepting.
+        register (Dict[Tuple, int]): Registered state of every signature.
+    """
+
+    # Number of words added between two budget checks
+    CHECK_INTERVAL = 1024
+
+    def __init__(self, budget: Optional[Budget] = None):
+        """
+        Initialize the builder.
+
+        Args:
+            budget (Optional[Budget], optional): Limits on DFA states and time checked
+                while building. Defaults to None.
+        """
+        self.budget = budget
+        self.transitions: List[Dict[str, int]] = []
+        self.accepting: List[bool] = []
+        self.register: Dict[Tuple, int] = {}
+
+    def newState(self) -> int:
+        """
+        Create a state without transitions.
+
+        Returns:
+            int: The new state.
+        """
+        self.transitions.append({})
+        self.accepting.append(False)
+        return len(self.transitions) - 1
+
+    def signature(self, state: int) -> Tuple:
+        """
+        Compute the key under which a state is registered.
+
+        Two states with equal signatures accept the same suffixes, since their
+        children are already registered and thus unique.
+
+        Args:
+            state (int): The state.
+
+        Returns:
+            Tuple: Its acceptance and transitions.
+        """
+        return (self.accepting[state], tuple(self.transitions[state].items()))
+
+    def replaceOrRegister(self, path: List[int], word: str, depth: int) -> None:
+        """
+        Merge the states of a word's path below a depth with registered states.
+
+        The path is processed bottom-up, so the children of a state are always
+        registered before the state itself.
+
+        Args:
+            path (List[int]): path[i] is the state reached by word[:i].
+            word (str): The word the path spells.
+            depth (int): Length of the prefix whose states stay unchanged.
+        """
+        for i in range(len(word), depth, -1):
+            child = path[i]
+            key = self.signature(child)
+            registered = self.register.get(key)
+            if registered is None:
+                self.register[key] = child
+            else:
+                # The parent is not registered yet, so it can still be changed
+                self.transitions[path[i - 1]][word[i - 1]] = registered
+        del path[depth + 1:]
+
+    def build(self, words: Iterable[str]) -> DFA:
+        """
+        Build the minimal DFA accepting exactly the given words.
+
+        Args:
+            words (Iterable[str]): The words, in any order; duplicates are ignored.
+
+        Returns:
+            DFA: The minimal DFA, with states named like the minimizer's output.
+
+        Raises:
+            ValueError: If there is no word.
+            BudgetExceededError: If the construction exceeds the budget.
+        """
+        words = sorted(set(words))
+        if not words:
+            raise ValueError("At least one word is required.")
+
+        self.transitions, self.accepting, self.register = [], [], {}
+        path = [self.newState()]
+        previous = ""
+        for count, word in enumerate(words):
+            if self.budget is not None and count % self.CHECK_INTERVAL == 0:
+                self.budget.check("literal construction", dfa_states=len(self.register) + len(path))
+            # Words are sorted, so nothing below the common prefix can change anymore
+            depth = 0
+            limit = min(len(word), len(previous))
+            while depth < limit and word[depth] == previous[depth]:
+                depth += 1
+            self.replaceOrRegister(path, previous, depth)
+            for symbol in word[depth:]:
+                state = self.newState()
+                self.transitions[path[-1]][symbol] = state
+                path.append(state)
+            self.accepting[path[-1]] = True
+            previous = word
+        self.replaceOrRegister(path, previous, 0)
+        return self.toDFA(path[0])
+
+    def toDFA(self, root: int) -> DFA:
+        """
+        Convert the states reachable from the root into a DFA.
+
+        Args:
+            root (int): The starting state.
+
+        Returns:
+            DFA: The DFA in canonical form.
+        """
+        dfa = DFA()
+        dfa.setStartingState(f"Q{root}")
+        seen = {root}
+        queue = [root]
+        for state in queue:
+            dfa.setTerminating(f"Q{state}", self.accepting[state])
+            for symbol, target in self.transitions[state].items():
+                dfa.addTransition(f"Q{state}", symbol, f"Q{target}")
+                if target not in seen:
+                    seen.add(target)
+                    queue.append(target)
+        return dfa.canonicalize("P")
@@ -0,0 +1,132 @@
+"""
+Literal extraction for fast candidate skipping.
+
+This module analyses a regular expression AST and extracts literal strings
+that every match must start with or contain. Search engines use them with
+`str.find`/`bytes.find`, which run at C speed, to skip text where no match can
+start or to give up early when the required literal does not occur at all.
+"""
+
+from typing import Optional
+from AST import *
+
+
+class LiteralInfo:
+    """
+    Literal facts about the strings matched by an AST node.
+
+    Attributes:
+        complete (Optional[str]): The only string the node matches, if it matches exactly one.
+        prefix (str): A literal every match starts with.
+        suffix (str): A literal every match ends with.
+        required (str): A literal every match contains.
+    """
+
+    def __init__(self, complete: Optional[str], prefix: str, suffix: str, required: str):
+        """
+        Initialize the literal facts.
+
+        Args:
+            complete (Optional[str]): The only matched string, or None.
+            prefix (str): A literal every match starts with.
+            suffix (str): A literal every match ends with.
+            required (str): A literal every match contains.
+        """
+        self.complete = complete
+        self.prefix = prefix
+        self.suffix = suffix
+        self.required = required
+
+
+class LiteralExtractor:
+    """
+    Extractor of required literals from regular expression ASTs.
+
+    Works bottom-up: each node combines the literal facts of its children.
+    """
+
+    def extract(self, node: AstNode) -> LiteralInfo:
+        """
+        Compute the literal facts of an AST node.
+
+        Args:
+            node (AstNode): The node to analyse.
+
+        Returns:
+            LiteralInfo: The literal facts of the node.
+
+        Raises:
+            ValueError: If an unsupported AST node type is encountered.
+        """
+        if isinstance(node, LiteralAstNode):
+            return LiteralInfo(node.char, node.char, node.char, node.char)
+        elif isinstance(node, CharacterClassAstNode):
+            if len(node.char_set) == 1:
+                char = next(iter(node.char_set))
+                return LiteralInfo(char, char, char, char)
+            return LiteralInfo(None, "", "", "")
+        elif isinstance(node, ConcatAstNode):
+            return self.extractConcat(self.extract(node.left), self.extract(node.right))
+        elif isinstance(node, OrAstNode):
+            return self.extractOr(self.extract(node.left), self.extract(node.right))
+        elif isinstance(node, PlusAstNode):
+            # At least one occurrence, but possibly several, so nothing is complete
+            sub = self.extract(node.sub_expr)
+            return LiteralInfo(None, sub.prefix, sub.suffix, sub.required)
+        elif isinstance(node, (StarAstNode, OptionalAstNode)):
+            # Zero occurrences are allowed, so no literal is guaranteed
+            self.extract(node.sub_expr)
+            return LiteralInfo(None, "", "", "")
+        else:
+            raise ValueError(f"Unsupported AST node type: {type(node).__name__}")
+
+    def extractConcat(self, left: LiteralInfo, right: LiteralInfo) -> LiteralInfo:
+        """
+        Combine the literal facts of two concatenated expressions.
+
+        Args:
+            left (LiteralInfo): Facts of the left expression.
+            right (LiteralInfo): Facts of the right expression.
+
+        Returns:
+            LiteralInfo: Facts of the concatenation.
+        """
+        complete = left.complete + right.complete if left.complete is not None and right.complete is not None else None
+        prefix = left.complete + right.prefix if left.complete is not None else left.prefix
+        suffix = left.suffix + right.complete if right.complete is not None else right.suffix
+        # The end of the left part runs directly into the start of the right part
+        required = max(left.required, right.required, left.suffix + right.prefix, prefix, suffix, key=len)
+        return LiteralInfo(complete, prefix, suffix, required)
+
+    def extractOr(self, left: LiteralInfo, right: LiteralInfo) -> LiteralInfo:
+        """
+        Combine the literal facts of two alternatives.
+
+        Args:
+            left (LiteralInfo): Facts of the first alternative.
+            right (LiteralInfo): Facts of the second alternative.
+
+        Returns:
+            LiteralInfo: Facts of the alternation.
+        """
+        complete = left.complete if left.complete == right.complete else None
+        prefix = self.commonPrefix(left.prefix, right.prefix)
+        suffix = self.commonPrefix(left.suffix[::-1], right.suffix[::-1])[::-1]
+        required = left.required if left.required == right.required else max(prefix, suffix, key=len)
+        return LiteralInfo(complete, prefix, suffix, required)
+
+    def commonPrefix(self, first: str, second: str) -> str:
+        """
+        Compute the longest common prefix of two strings.
+
+        Args:
+            first (str): The first string.
+            second (str): The second string.
+
+        Returns:
+            str: Their longest common prefix.
+        """
+        length = 0
+        while length < min(len(first), len(second)) and first[length] == second[length]:
+            length += 1
+        return first[:length]
@@ -0,0 +1,137 @@
+"""
+Multi-pattern compilation into a single tagged DFA.
+
+This module compiles a list of regular expressions into one minimized DFA whose
+accepting states are tagged with the indices of the patterns they accept, so a
+single pass over the input tells which patterns matched, like a lexer generator.
+Patterns whose minimized DFAs have the same canonical hash are equivalent and
+are compiled into the union only once.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from Lexer import Lexer
+from Parser import Parser
+from AST import AstNode
+from NFABuilder import NFABuilder
+from NFAtoDFA import NFAtoDFA
+from DFAMinimizer import DFAMinimizer
+from DFA import DFA
+
+
+class PatternSet:
+    """
+    A set of regular expressions compiled into one tagged DFA.
+
+    Conflicts between patterns accepting the same input are resolved by priority:
+    the pattern listed first wins.
+
+    Attributes:
+        patterns (List[str]): The source regular expressions, in priority order.
+        dfa (DFA): The minimized DFA with accepting states tagged by pattern group.
+        groups (List[List[int]]): Indices of the equivalent patterns behind every tag.
+    """
+
+    def __init__(self, patterns: List[str], dfa: DFA, groups: Optional[List[List[int]]] = None):
+        """
+        Initialize a pattern set from its patterns and compiled DFA.
+
+        Args:
+            patterns (List[str]): The source regular expressions.
+            dfa (DFA): The tagged DFA recognizing their union.
+            groups (Optional[List[List[int]]], optional): Pattern indices of every tag.
+                Defaults to one pattern per tag, the tag being the pattern index.
+        """
+        self.patterns = patterns
+        self.dfa = dfa
+        self.groups = groups if groups is not None else [[index] for index in range(len(patterns))]
+
+    def matches(self, text: str) -> List[int]:
+        """
+        Find every pattern that matches the whole input.
+
+        Args:
+            text (str): The input string.
+
+        Returns:
+            List[int]: Indices of the matching patterns in priority order.
+        """
+        structure = self.dfa.structure
+        state = structure["startingState"]
+        for char in text:
+            state = structure[state].get(char)
+            if state is None:
+                return []
+        if not structure[state]["isTerminatingState"]:
+            return []
+        return sorted(index for tag in self.dfa.getTags(state) for index in self.groups[tag])
+
+    def match(self, text: str) -> Optional[int]:
+        """
+        Find the highest-priority pattern that matches the whole input.
+
+        Args:
+            text (str): The input string.
+
+        Returns:
+            Optional[int]: Index of the winning pattern, or None if none matches.
+        """
+        matched = self.matches(text)
+        return matched[0] if matched else None
+
+
+def compile_set(patterns: List[str], deduplicate: bool = False) -> PatternSet:
+    """
+    Compile several regular expressions into one tagged, minimized DFA.
+
+    The NFAs of all patterns are joined under a shared start state; subset
+    construction and minimization keep the pattern tags of accepting states distinct.
+
+    Args:
+        patterns (List[str]): The regular expressions, in priority order.
+        deduplicate (bool, optional): Compile equivalent patterns once, found by the
+            canonical hash of their minimized DFAs. Every pattern is then also
+            compiled on its own, which only pays off when duplicates are
+            expected. Defaults to False.
+
+    Returns:
+        PatternSet: The compiled pattern set.
+
+    Raises:
+        ValueError: If no pattern is given or a pattern is invalid.
+    """
+    if not patterns:
+        raise ValueError("At least one pattern is required.")
+
+    asts = [Parser(Lexer(pattern).tokenize()).parse() for pattern in patterns]
+    groups = [[index] for index in range(len(asts))]
+    if deduplicate:
+        asts, groups = deduplicateAsts(asts)
+    nfa = NFABuilder().buildTaggedUnion(asts)
+    dfa = NFAtoDFA(nfa).convert()
+    min_dfa = DFAMinimizer(dfa).minimize()
+    return PatternSet(list(patterns), min_dfa, groups)
+
+
+def deduplicateAsts(asts: List[AstNode]) -> Tuple[List[AstNode], List[List[int]]]:
+    """
+    Group patterns that recognize the same language.
+
+    Args:
+        asts (List[AstNode]): The parsed patterns, in priority order.
+
+    Returns:
+        Tuple[List[AstNode], List[List[int]]]: The first pattern of every group and the
+            indices of the patterns in every group.
+    """
+    unique_asts = []
+    groups = []
+    group_of_hash: Dict[str, int] = {}
+    for index, ast in enumerate(asts):
+        min_dfa = DFAMinimizer(NFAtoDFA(NFABuilder().buildFromAST(ast)).convert()).minimize()
+        key = min_dfa.canonicalHash()
+        if key not in group_of_hash:
+            group_of_hash[key] = len(unique_asts)
+            unique_asts.append(ast)
+            groups.append([])
+        groups[group_of_hash[key]].append(index)
+    return unique_asts, groups
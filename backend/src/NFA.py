@@ -6,6 +6,8 @@ state management, and JSON serialization.
 """
 
 import json
+from typing import Dict, Iterable, Optional, TextIO
+from JsonWriter import writeAutomaton
 
 
 class NFA:
@@ -24,6 +26,7 @@ class NFA:
         self.structure = {
             "startingState": ""
         }
+        self.tags = {}
     
     def setStartingState(self, state: str) -> None:
         """
@@ -93,16 +96,31 @@ class NFA:
         else:
             self.structure[state]["isTerminatingState"] = is_terminating
     
+    def addTag(self, state: str, tag: int) -> None:
+        """
+        Tag a state with a pattern identifier.
+        
+        Tags are kept outside of the structure so that they never show up as
+        transition symbols. They are used by multi-pattern compilation to record
+        which pattern an accepting state belongs to.
+        
+        Args:
+            state (str): The state to tag.
+            tag (int): The pattern identifier.
+        """
+        self.tags.setdefault(state, set()).add(tag)
+    
     def toJson(self) -> str:
         """
         Convert the NFA to a JSON string.
         
+        States are renumbered and empty epsilon arrays dropped in the output
+        only; the NFA itself is left unchanged.
+        
         Returns:
             str: A JSON string representation of the NFA structure.
         """
-        self.cleanUp()
-        self.renumberStates()
-        return json.dumps(self.structure, indent=4)
+        return json.dumps(self.renumberedStructure(), indent=4)
     
     def cleanUp(self) -> None:
         """
@@ -116,6 +134,59 @@ class NFA:
                 if "epsilon" in state_obj and len(state_obj["epsilon"]) == 0:
                     del state_obj["epsilon"]
 
+    def writeJson(self, stream: TextIO, indent: Optional[int] = None) -> None:
+        """
+        Write the NFA as JSON to a stream, one state at a time.
+        
+        Uses far less memory than toJson() for large automata, and leaves the
+        NFA unchanged.
+        
+        Args:
+            stream (TextIO): The text stream to write to, e.g. an open file.
+            indent (Optional[int], optional): Indentation, or None for compact output. Defaults to None.
+        """
+        writeAutomaton(self, stream, indent)
+    
+    def renumberMap(self, prefix: str = "S") -> Dict[str, str]:
+        """
+        Compute sequential state names, starting from 0 at the starting state.
+        
+        Args:
+            prefix (str, optional): Prefix to use for state names. Defaults to "S".
+            
+        Returns:
+            Dict[str, str]: New name of every state, in output order.
+        """
+        old_to_new = {self.structure["startingState"]: f"{prefix}0"}
+        for state in self.structure:
+            if state != "startingState" and state not in old_to_new:
+                old_to_new[state] = f"{prefix}{len(old_to_new)}"
+        return old_to_new
+    
+    def renumberedStructure(self, prefix: str = "S") -> dict:
+        """
+        Build a copy of the structure with renumbered states and no empty epsilon arrays.
+        
+        Args:
+            prefix (str, optional): Prefix to use for state names. Defaults to "S".
+            
+        Returns:
+            dict: The renumbered structure.
+        """
+        old_to_new = self.renumberMap(prefix)
+        new_structure = {
+            "startingState": old_to_new[self.structure["startingState"]]
+        }
+        for old_state, new_state in old_to_new.items():
+            state_data = {}
+            for symbol, value in self.structure[old_state].items():
+                if symbol == "isTerminatingState":
+                    state_data[symbol] = value
+                elif value:
+                    state_data[symbol] = [old_to_new[target] for target in value]
+            new_structure[new_state] = state_data
+        return new_structure
+    
     def renumberStates(self, prefix: str = "S") -> None:
         """
         Renumber all states in sequential order starting from 0.
@@ -125,32 +196,79 @@ class NFA:
         """
         if "startingState" not in self.structure:
             return
-            
-        original_start = self.structure["startingState"]
-        old_to_new = {}
-        counter = 0
         
-        # First, rename the starting state
-        old_to_new[original_start] = f"{prefix}{counter}"
-        counter += 1
+        old_to_new = self.renumberMap(prefix)
+        self.structure = self.renumberedStructure(prefix)
+        self.tags = {old_to_new[state]: tags for state, tags in self.tags.items() if state in old_to_new}
+    
+    def reverse(self, initial_states: Optional[Iterable[str]] = None) -> "NFA":
+        """
+        Build the reversed NFA, which accepts the mirror image of every accepted string.
+        
+        Every transition is flipped, a fresh starting state is linked by epsilon
+        transitions to the original accepting states, and the original starting
+        state becomes the only accepting state.
         
-        # Then rename all other states
+        Args:
+            initial_states (Optional[Iterable[str]], optional): States to start the reversed
+                automaton from instead of the accepting states. Defaults to None.
+                
+        Returns:
+            NFA: The reversed NFA. Pattern tags are not carried over.
+        """
+        reversed_nfa = NFA()
         for state in self.structure:
-            if state != "startingState" and state not in old_to_new:
-                old_to_new[state] = f"{prefix}{counter}"
-                counter += 1
+            if state != "startingState":
+                reversed_nfa.addState(state, False)
         
-        # Create new structure with renamed states
-        new_structure = {
-            "startingState": old_to_new[original_start]
-        }
+        for state, state_obj in self.structure.items():
+            if state == "startingState":
+                continue
+            for symbol, targets in state_obj.items():
+                if symbol == "isTerminatingState":
+                    continue
+                for target in targets:
+                    reversed_nfa.addTransition(target, 'ε' if symbol == "epsilon" else symbol, state)
         
-        # Update all transitions to use new state names
-        for old_state, new_state in old_to_new.items():
-            state_data = self.structure[old_state].copy()
-            for symbol in state_data:
-                if symbol != "isTerminatingState" and isinstance(state_data[symbol], list):
-                    state_data[symbol] = [old_to_new[target] for target in state_data[symbol]]
-            new_structure[new_state] = state_data
-            
-        self.structure = new_structure
+        if initial_states is None:
+            initial_states = [state for state in self.structure
+                              if state != "startingState" and self.structure[state]["isTerminatingState"]]
+        
+        # Pick a starting state name that does not clash with existing states
+        start = "R0"
+        while start in self.structure:
+            start = "R" + start
+        reversed_nfa.setStartingState(start)
+        for state in initial_states:
+            reversed_nfa.addTransition(start, 'ε', state)
+        reversed_nfa.setTerminating(self.structure["startingState"], True)
+        return reversed_nfa
+    
+    def unanchored(self) -> "NFA":
+        """
+        Build the unanchored NFA, which accepts every string ending with an accepted string.
+        
+        A fresh starting state loops on every symbol of the alphabet and is linked by
+        an epsilon transition to the original starting state, giving the language of `.*R`.
+        
+        Returns:
+            NFA: The unanchored NFA. Pattern tags are carried over.
+        """
+        unanchored_nfa = NFA()
+        unanchored_nfa.structure = {state: {symbol: list(value) if isinstance(value, list) else value
+                                            for symbol, value in state_obj.items()}
+                                    for state, state_obj in self.structure.items() if state != "startingState"}
+        unanchored_nfa.tags = {state: set(tags) for state, tags in self.tags.items()}
+        
+        # Pick a starting state name that does not clash with existing states
+        start = "U0"
+        while start in self.structure:
+            start = "U" + start
+        unanchored_nfa.setStartingState(start)
+        for state_obj in self.structure.values():
+            if isinstance(state_obj, dict):
+                for symbol in state_obj:
+                    if symbol != "isTerminatingState" and symbol != "epsilon":
+                        unanchored_nfa.addTransition(start, symbol, start)
+        unanchored_nfa.addTransition(start, 'ε', self.structure["startingState"])
+        return unanchored_nfa
@@ -5,9 +5,78 @@ This module provides functionality to construct NFAs from Abstract Syntax Trees
 representing regular expressions, with support for various regex operations.
 """
 
-from typing import Tuple
+from collections import OrderedDict
+from itertools import islice
+from typing import List, Optional, Tuple
 from AST import *
 from NFA import *
+from Budget import Budget
+
+# A built sub-NFA with states numbered relative to its first state:
+# (state count, start offset, end offset, ((offset, ((symbol, target offsets), ...)), ...))
+NFAFragment = Tuple[int, int, int, Tuple[Tuple[int, Tuple[Tuple[str, Tuple[int, ...]], ...]], ...]]
+
+# Larger fragments are not cached: along a long spine of nested subtrees, copying
+# every prefix would make cold builds quadratic, and an edit rebuilds the spine anyway
+MAX_FRAGMENT_STATES = 256
+
+
+class FragmentCache:
+    """
+    Bounded least-recently-used cache of NFA fragments keyed by AST structural hash.
+    
+    Sharing one cache between builds lets a recompilation after a small edit reuse
+    the fragments of every unchanged subtree instead of rebuilding them.
+    
+    Attributes:
+        maxSize (int): Maximum number of cached fragments.
+        fragments (OrderedDict): Cached fragments, least recently used first.
+        hits (int): Number of successful lookups.
+        misses (int): Number of failed lookups.
+    """
+    
+    def __init__(self, max_size: int = 4096):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            max_size (int, optional): Maximum number of cached fragments. Defaults to 4096.
+        """
+        self.maxSize = max_size
+        self.fragments = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: str) -> Optional[NFAFragment]:
+        """
+        Look up a fragment and mark it as recently used.
+        
+        Args:
+            key (str): The structural hash of the subtree.
+            
+        Returns:
+            Optional[NFAFragment]: The fragment, or None if it is not cached.
+        """
+        fragment = self.fragments.get(key)
+        if fragment is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.fragments.move_to_end(key)
+        return fragment
+    
+    def put(self, key: str, fragment: NFAFragment) -> None:
+        """
+        Store a fragment, evicting the least recently used one if the cache is full.
+        
+        Args:
+            key (str): The structural hash of the subtree.
+            fragment (NFAFragment): The fragment.
+        """
+        self.fragments[key] = fragment
+        self.fragments.move_to_end(key)
+        while len(self.fragments) > self.maxSize:
+            self.fragments.popitem(last=False)
 
 
 class NFABuilder:
@@ -19,11 +88,23 @@ class NFABuilder:
     
     Attributes:
         state_counter (int): Counter to generate unique state names.
+        budget (Optional[Budget]): Limits checked as states are created, or None.
+        cache (Optional[FragmentCache]): Memoized fragments of previously built subtrees, or None.
     """
     
-    def __init__(self):
-        """Initialize an NFABuilder with a reset state counter."""
+    def __init__(self, budget: Optional[Budget] = None, cache: Optional[FragmentCache] = None):
+        """
+        Initialize an NFABuilder with a reset state counter.
+        
+        Args:
+            budget (Optional[Budget], optional): Limits on NFA states and time checked
+                as states are created. Defaults to None.
+            cache (Optional[FragmentCache], optional): Cache of subtree fragments to reuse
+                and fill. Defaults to None (no memoization).
+        """
         self.state_counter = 0
+        self.budget = budget
+        self.cache = cache
     
     def getNextState(self) -> str:
         """
@@ -31,9 +112,14 @@ class NFABuilder:
         
         Returns:
             str: A unique state identifier using the prefix 'S' followed by a number.
+            
+        Raises:
+            BudgetExceededError: If the NFA grows beyond the budget.
         """
         state = f"S{self.state_counter}"
         self.state_counter += 1
+        if self.budget is not None:
+            self.budget.check("NFA construction", nfa_states=self.state_counter)
         return state
     
     def buildFromAST(self, ast: AstNode) -> NFA:
@@ -53,10 +139,124 @@ class NFABuilder:
         nfa.setTerminating(end, True)        
         return nfa
     
+    def buildTaggedUnion(self, asts: List[AstNode]) -> NFA:
+        """
+        Build a single NFA recognizing the union of several ASTs.
+        
+        Every sub-NFA is reached from a shared start state through an epsilon
+        transition, and the accepting state of the i-th sub-NFA is tagged with i
+        so that the pattern(s) responsible for a match can be recovered later.
+        
+        Args:
+            asts (List[AstNode]): The root nodes of the abstract syntax trees.
+            
+        Returns:
+            NFA: An NFA whose accepting states are tagged with pattern indices.
+        """
+        nfa = NFA()
+        self.state_counter = 0
+        start = self.getNextState()
+        nfa.setStartingState(start)
+        for tag, ast in enumerate(asts):
+            sub_start, sub_end = self.processNode(ast, nfa)
+            nfa.addTransition(start, 'ε', sub_start)
+            nfa.setTerminating(sub_end, True)
+            nfa.addTag(sub_end, tag)
+        return nfa
+    
     def processNode(self, node: AstNode, nfa: NFA) -> Tuple[str, str]:
         """
         Process an AST node and update the NFA accordingly.
         
+        When a fragment cache is set, the sub-NFA of a subtree seen before is copied
+        from the cache instead of being rebuilt, and new subtrees are added to it.
+        Leaves are cheaper to build than to look up and are never cached, and
+        neither are sub-NFAs of more than MAX_FRAGMENT_STATES states.
+        
+        Args:
+            node (AstNode): The AST node to process.
+            nfa (NFA): The NFA being constructed.
+            
+        Returns:
+            Tuple[str, str]: A tuple containing (start_state, end_state) of the constructed sub-NFA.
+        """
+        if self.cache is None or isinstance(node, (LiteralAstNode, CharacterClassAstNode)):
+            return self.buildNode(node, nfa)
+        
+        key = node.structuralHash()
+        fragment = self.cache.get(key)
+        if fragment is not None:
+            return self.instantiateFragment(fragment, nfa)
+        
+        first_state, first_key = self.state_counter, len(nfa.structure)
+        start, end = self.buildNode(node, nfa)
+        if self.state_counter - first_state <= MAX_FRAGMENT_STATES:
+            self.cache.put(key, self.extractFragment(nfa, first_state, first_key, start, end))
+        return start, end
+    
+    def extractFragment(self, nfa: NFA, first_state: int, first_key: int, start: str, end: str) -> NFAFragment:
+        """
+        Capture the sub-NFA just built for a subtree.
+        
+        The states of a subtree are numbered contiguously and are the last states
+        added to the structure, so they are found without scanning the whole NFA.
+        Their insertion order is kept so that a copy serializes identically.
+        
+        Args:
+            nfa (NFA): The NFA being constructed.
+            first_state (int): Value of the state counter before the subtree was built.
+            first_key (int): Number of entries in the structure before the subtree was built.
+            start (str): Start state of the sub-NFA.
+            end (str): End state of the sub-NFA.
+            
+        Returns:
+            NFAFragment: The sub-NFA with states numbered relative to first_state.
+        """
+        structure = nfa.structure
+        new_states = list(islice(reversed(structure), len(structure) - first_key))[::-1]
+        
+        def offset(state: str) -> int:
+            return int(state[1:]) - first_state
+        
+        states = tuple(
+            (offset(state), tuple((symbol, tuple(offset(target) for target in targets))
+                                  for symbol, targets in structure[state].items() if symbol != "isTerminatingState"))
+            for state in new_states
+        )
+        return self.state_counter - first_state, offset(start), offset(end), states
+    
+    def instantiateFragment(self, fragment: NFAFragment, nfa: NFA) -> Tuple[str, str]:
+        """
+        Copy a cached sub-NFA into the NFA under fresh state names.
+        
+        Args:
+            fragment (NFAFragment): The cached sub-NFA.
+            nfa (NFA): The NFA being constructed.
+            
+        Returns:
+            Tuple[str, str]: Start and end states of the copy.
+            
+        Raises:
+            BudgetExceededError: If the NFA grows beyond the budget.
+        """
+        size, start, end, states = fragment
+        base = self.state_counter
+        self.state_counter += size
+        if self.budget is not None:
+            self.budget.check("NFA construction", nfa_states=self.state_counter)
+        
+        for offset, transitions in states:
+            state_obj = {"isTerminatingState": False}
+            for symbol, targets in transitions:
+                state_obj[symbol] = [f"S{base + target}" for target in targets]
+            nfa.structure[f"S{base + offset}"] = state_obj
+        
+        return f"S{base + start}", f"S{base + end}"
+    
+    def buildNode(self, node: AstNode, nfa: NFA) -> Tuple[str, str]:
+        """
+        Build the sub-NFA of an AST node.
+        
         This method dispatches to the appropriate NFA construction method based on the node type.
         
         Args:
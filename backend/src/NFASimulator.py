@@ -0,0 +1,127 @@
+"""
+Direct NFA simulation.
+
+This module matches inputs against an NFA by tracking the set of active states,
+without building a DFA. Each character costs time proportional to the number of
+active states, but no construction is needed up front and memory stays linear
+in the size of the NFA, whatever the pattern. The NFA is simulated in its
+compact form, with integer states and array-backed edges, so closures and
+state sets hold small integers instead of state name strings.
+"""
+
+from typing import Dict, FrozenSet, List, Union
+from NFA import NFA
+from CompactNFA import CompactNFA
+
+
+class NFASimulator:
+    """
+    Set-of-states matcher over an NFA.
+
+    Attributes:
+        compact (CompactNFA): The automaton to simulate, with states numbered in
+            the order of the NFA structure.
+        closures (Dict[int, FrozenSet[int]]): Epsilon closure of each state, computed on demand.
+        startSet (FrozenSet[int]): Epsilon closure of the starting state.
+        acceptingStates (FrozenSet[int]): The accepting states of the NFA.
+        sources (List[FrozenSet[int]]): States with an edge on each symbol id, so a step
+            only walks the edge rows of states that can move on the input.
+    """
+
+    def __init__(self, nfa: NFA):
+        """
+        Initialize the simulator.
+
+        Args:
+            nfa (NFA): The automaton to simulate.
+        """
+        self.compact = CompactNFA.fromNFA(nfa)
+        self.closures: Dict[int, FrozenSet[int]] = {}
+        self.startSet = self.closure(self.compact.start)
+        self.acceptingStates = frozenset(state for state in range(self.compact.stateCount)
+                                         if self.compact.isAccepting(state))
+        sources = [set() for _ in self.compact.symbols]
+        for state in range(self.compact.stateCount):
+            for index in range(self.compact.edgeOffsets[state], self.compact.edgeOffsets[state + 1]):
+                sources[self.compact.edgeSymbols[index]].add(state)
+        self.sources: List[FrozenSet[int]] = [frozenset(states) for states in sources]
+
+    def closure(self, state: int) -> FrozenSet[int]:
+        """
+        Compute the epsilon closure of a single state.
+
+        Args:
+            state (int): The state.
+
+        Returns:
+            FrozenSet[int]: The states reachable from it through epsilon transitions.
+        """
+        closure = self.closures.get(state)
+        if closure is None:
+            closure = frozenset(self.compact.epsilonClosure((state,)))
+            self.closures[state] = closure
+        return closure
+
+    def step(self, states: FrozenSet[int], char: str, unanchored: bool = False) -> FrozenSet[int]:
+        """
+        Follow every transition on a character from a set of states.
+
+        Args:
+            states (FrozenSet[int]): The active states, closed under epsilon transitions.
+            char (str): The input character.
+            unanchored (bool, optional): Whether to re-enter the starting states, so that
+                a match may start after this character. Defaults to False.
+
+        Returns:
+            FrozenSet[int]: The next active states, closed under epsilon transitions.
+        """
+        result = set(self.startSet) if unanchored else set()
+        symbol = self.compact.symbolIds.get(char)
+        if symbol is not None:
+            offsets, symbols, targets = self.compact.edgeOffsets, self.compact.edgeSymbols, self.compact.edgeTargets
+            # Most active states only have epsilon edges; skip them in one set operation
+            for state in states & self.sources[symbol]:
+                for index in range(offsets[state], offsets[state + 1]):
+                    if symbols[index] == symbol:
+                        result |= self.closure(targets[index])
+        return frozenset(result)
+
+    def accepts(self, text: Union[str, bytes]) -> bool:
+        """
+        Check whether the whole input matches.
+
+        Args:
+            text (Union[str, bytes]): The input; bytes are read as Latin-1.
+
+        Returns:
+            bool: True if the input matches the pattern.
+        """
+        if not isinstance(text, str):
+            text = bytes(text).decode("latin-1")
+        states = self.startSet
+        for char in text:
+            states = self.step(states, char)
+            if not states:
+                return False
+        return not states.isdisjoint(self.acceptingStates)
+
+    def search(self, text: Union[str, bytes]) -> bool:
+        """
+        Check whether the input contains a match.
+
+        Args:
+            text (Union[str, bytes]): The input; bytes are read as Latin-1.
+
+        Returns:
+            bool: True if some substring matches the pattern.
+        """
+        if not isinstance(text, str):
+            text = bytes(text).decode("latin-1")
+        states = self.startSet
+        if not states.isdisjoint(self.acceptingStates):
+            return True
+        for char in text:
+            states = self.step(states, char, unanchored=True)
+            if not states.isdisjoint(self.acceptingStates):
+                return True
+        return False
@@ -5,8 +5,10 @@ This module provides functionality to convert a Non-deterministic Finite Automat
 to a Deterministic Finite Automaton (DFA) using the subset construction algorithm.
 """
 
+from typing import Optional
 from NFA import *
 from DFA import *
+from Budget import Budget
 
 
 class NFAtoDFA:
@@ -19,17 +21,21 @@ class NFAtoDFA:
     Attributes:
         nfa (NFA): The source NFA to be converted.
         dfa (DFA): The target DFA being constructed.
+        budget (Optional[Budget]): Limits checked during the construction, or None.
     """
     
-    def __init__(self, nfa: NFA):
+    def __init__(self, nfa: NFA, budget: Optional[Budget] = None):
         """
         Initialize the converter with the source NFA.
         
         Args:
             nfa (NFA): The NFA to be converted to a DFA.
+            budget (Optional[Budget], optional): Limits on NFA states, DFA states,
+                transitions and time checked during the construction. Defaults to None.
         """
         self.nfa = nfa
         self.dfa = DFA()
+        self.budget = budget
     
     def convert(self) -> DFA:
         """
@@ -43,10 +49,17 @@ class NFAtoDFA:
         
         Returns:
             DFA: The resulting deterministic finite automaton.
+            
+        Raises:
+            BudgetExceededError: If the construction exceeds the budget.
         """
         nfa_structure = self.nfa.structure
         alphabet = self.getAlphabet()
         nfa_start = nfa_structure["startingState"]
+        nfa_states = len(nfa_structure) - 1
+        transitions = 0
+        if self.budget is not None:
+            self.budget.check("subset construction", nfa_states=nfa_states)
         
         # Get epsilon closure of start state to form the first DFA state
         start_states = self.epsilonClosure({nfa_start})
@@ -57,6 +70,7 @@ class NFAtoDFA:
         is_accepting = any(nfa_structure[state]["isTerminatingState"] 
                          for state in start_states if state in nfa_structure)
         self.dfa.setTerminating(dfa_start, is_accepting)
+        self.dfa.setTags(dfa_start, self.collectTags(start_states))
         
         # Track state mappings and processing status
         state_mapping = {frozenset(start_states): dfa_start}
@@ -72,6 +86,11 @@ class NFAtoDFA:
             processed.add(frozenset(current_states))
             current_dfa_state = state_mapping[frozenset(current_states)]
             
+            # Give the budget a chance to stop the construction between states
+            if self.budget is not None:
+                self.budget.check("subset construction", nfa_states=nfa_states,
+                                  dfa_states=len(state_mapping), transitions=transitions)
+            
             # Process each input symbol
             for symbol in alphabet:
                 next_states = set()
@@ -89,6 +108,9 @@ class NFAtoDFA:
                 
                 # Create a new DFA state if needed
                 if frozenset(next_states_with_epsilon) not in state_mapping:
+                    if self.budget is not None:
+                        self.budget.check("subset construction", nfa_states=nfa_states,
+                                          dfa_states=len(state_mapping) + 1, transitions=transitions)
                     next_dfa_state = self.setToStateName(next_states_with_epsilon)
                     state_mapping[frozenset(next_states_with_epsilon)] = next_dfa_state
                     
@@ -97,6 +119,7 @@ class NFAtoDFA:
                                      for state in next_states_with_epsilon 
                                      if state in nfa_structure)
                     self.dfa.setTerminating(next_dfa_state, is_accepting)
+                    self.dfa.setTags(next_dfa_state, self.collectTags(next_states_with_epsilon))
                     
                     # Process this new state in a future iteration
                     unprocessed.append(next_states_with_epsilon)
@@ -106,6 +129,7 @@ class NFAtoDFA:
                 
                 # Add the transition in the DFA
                 self.dfa.addTransition(current_dfa_state, symbol, next_dfa_state)
+                transitions += 1
         
         return self.dfa
     
@@ -140,6 +164,21 @@ class NFAtoDFA:
         
         return result
     
+    def collectTags(self, states: Set[str]) -> Set[int]:
+        """
+        Collect the pattern tags carried by a set of NFA states.
+        
+        Args:
+            states (Set[str]): Set of NFA states forming a DFA state.
+            
+        Returns:
+            Set[int]: Union of the tags of all states in the set.
+        """
+        tags = set()
+        for state in states:
+            tags |= self.nfa.tags.get(state, set())
+        return tags
+    
     def getAlphabet(self) -> Set[str]:
         """
         Get all input symbols used in the NFA (excluding epsilon).
@@ -0,0 +1,227 @@
+"""
+Parallel chunked scanning through speculative DFA simulation.
+
+A single large input is split into chunks that are scanned by separate worker
+processes. Since a worker cannot know the state the automaton will be in when
+its chunk begins, it runs the chunk from every state at once and returns the
+function "start state -> (end state, accepting positions)". Runs from
+different states usually converge after a few symbols, after which they are
+simulated as one. Composing the chunk functions in order gives exactly the
+result of a sequential scan.
+"""
+
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+from CompiledDFA import CompiledDFA
+
+# Automaton installed in each worker process by initWorker
+worker_compiled: Optional[CompiledDFA] = None
+
+
+class ParallelScanner:
+    """
+    Scanner splitting an input into chunks scanned in parallel.
+
+    Attributes:
+        compiled (CompiledDFA): The automaton to run, e.g. the anchored DFA of a
+            pattern for whole-input matching or the unanchored DFA for searching.
+        workers (Optional[int]): Number of worker processes, defaults to the CPU count.
+        chunkSize (int): Number of bytes per chunk.
+    """
+
+    def __init__(self, compiled: CompiledDFA, workers: Optional[int] = None, chunk_size: int = 1 << 24):
+        """
+        Initialize the scanner.
+
+        Args:
+            compiled (CompiledDFA): The automaton to run.
+            workers (Optional[int], optional): Number of worker processes. Defaults to the CPU count.
+            chunk_size (int, optional): Number of bytes per chunk. Defaults to 16 MiB.
+        """
+        self.compiled = compiled
+        self.workers = workers
+        self.chunkSize = chunk_size
+
+    def scanBytes(self, data: Union[bytes, bytearray]) -> Tuple[int, int]:
+        """
+        Scan a bytes object held in memory.
+
+        Args:
+            data (Union[bytes, bytearray]): The input.
+
+        Returns:
+            Tuple[int, int]: The final state (or DEAD) and the number of positions
+                at which the automaton was in an accepting state.
+        """
+        bounds = self.chunkBounds(len(data))
+        with self.createPool() as pool:
+            summaries = pool.map(summarizeChunk, (bytes(data[begin:end]) for begin, end in bounds))
+            return self.compose(summaries)
+
+    def scanFile(self, path: str) -> Tuple[int, int]:
+        """
+        Scan a file; each worker memory-maps its own chunk.
+
+        Args:
+            path (str): Path of the file to scan.
+
+        Returns:
+            Tuple[int, int]: The final state (or DEAD) and the number of positions
+                at which the automaton was in an accepting state.
+        """
+        bounds = self.chunkBounds(os.path.getsize(path))
+        with self.createPool() as pool:
+            summaries = pool.map(summarizeFileChunk, [(path, begin, end) for begin, end in bounds])
+            return self.compose(summaries)
+
+    def accepts(self, data: Union[bytes, bytearray, str]) -> bool:
+        """
+        Check whether the automaton accepts a whole input.
+
+        Args:
+            data (Union[bytes, bytearray, str]): The input bytes, or the path of a file when a str.
+
+        Returns:
+            bool: True if the scan ends in an accepting state.
+        """
+        state, _ = self.scanFile(data) if isinstance(data, str) else self.scanBytes(data)
+        return state != CompiledDFA.DEAD and self.compiled.accepting[state]
+
+    def chunkBounds(self, size: int) -> List[Tuple[int, int]]:
+        """
+        Split an input size into chunk boundaries.
+
+        Args:
+            size (int): Size of the input in bytes.
+
+        Returns:
+            List[Tuple[int, int]]: The (begin, end) offsets of every chunk.
+        """
+        return [(begin, min(begin + self.chunkSize, size)) for begin in range(0, size, self.chunkSize)]
+
+    def createPool(self) -> ProcessPoolExecutor:
+        """
+        Create a worker pool with the automaton installed in every worker.
+
+        Returns:
+            ProcessPoolExecutor: The worker pool.
+        """
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=initWorker, initargs=(self.compiled,))
+
+    def compose(self, summaries) -> Tuple[int, int]:
+        """
+        Compose chunk summaries in input order.
+
+        Args:
+            summaries: For every chunk, a mapping from start state to (end state, accepting positions).
+
+        Returns:
+            Tuple[int, int]: The final state (or DEAD) and the total number of accepting positions.
+        """
+        state = self.compiled.start
+        count = 1 if self.compiled.accepting[state] else 0
+        for summary in summaries:
+            if state == CompiledDFA.DEAD:
+                break
+            state, chunk_count = summary[state]
+            count += chunk_count
+        return state, count
+
+
+def initWorker(compiled: CompiledDFA) -> None:
+    """
+    Install the automaton in a worker process.
+
+    Args:
+        compiled (CompiledDFA): The automaton to run.
+    """
+    global worker_compiled
+    worker_compiled = compiled
+
+
+def summarizeFileChunk(task: Tuple[str, int, int]) -> Dict[int, Tuple[int, int]]:
+    """
+    Summarize a chunk of a file, reading it through a memory map.
+
+    Args:
+        task (Tuple[str, int, int]): The file path and the (begin, end) offsets of the chunk.
+
+    Returns:
+        Dict[int, Tuple[int, int]]: The chunk summary, see summarizeChunk.
+    """
+    path, begin, end = task
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return summarizeChunk(mm[begin:end])
+
+
+def summarizeChunk(chunk: bytes, compiled: Optional[CompiledDFA] = None) -> Dict[int, Tuple[int, int]]:
+    """
+    Run a chunk from every state of the automaton at once.
+
+    Runs that reach the same state are merged and continue as one; the accepting
+    positions counted before the merge are kept as a per-start offset.
+
+    Args:
+        chunk (bytes): The chunk to scan.
+        compiled (Optional[CompiledDFA], optional): The automaton. Defaults to the one
+            installed in the worker.
+
+    Returns:
+        Dict[int, Tuple[int, int]]: For every start state, the end state (or DEAD) and
+            the number of positions in the chunk at which the automaton was accepting.
+    """
+    compiled = compiled or worker_compiled
+    table, accepting, dead = compiled.table, compiled.accepting, compiled.DEAD
+    classes = compiled.classify(chunk)
+
+    # Current state -> (start states that reached it, accepting positions counted since the merge)
+    groups = {state: ([state], 0) for state in range(len(table))}
+    offsets = [0] * len(table)
+    position = 0
+    length = len(classes)
+
+    while position < length and len(groups) > 1:
+        cls = classes[position]
+        position += 1
+        merged = {}
+        for state, (origins, count) in groups.items():
+            target = table[state][cls]
+            if target == dead:
+                # Dead runs stay dead and stop counting
+                for origin in origins:
+                    offsets[origin] += count
+                continue
+            if accepting[target]:
+                count += 1
+            if target in merged:
+                kept_origins, kept_count = merged[target]
+                for origin in origins:
+                    offsets[origin] += count - kept_count
+                kept_origins.extend(origins)
+            else:
+                merged[target] = (origins, count)
+        groups = merged
+
+    # At most one run is left: continue it alone
+    if groups and position < length:
+        (state, (origins, count)), = groups.items()
+        while position < length:
+            state = table[state][classes[position]]
+            position += 1
+            if state == dead:
+                break
+            if accepting[state]:
+                count += 1
+        groups = {state: (origins, count)} if state != dead else {}
+        if state == dead:
+            for origin in origins:
+                offsets[origin] += count
+
+    summary = {state: (dead, offsets[state]) for state in range(len(table))}
+    for state, (origins, count) in groups.items():
+        for origin in origins:
+            summary[origin] = (state, count + offsets[origin])
+    return summary
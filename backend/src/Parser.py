@@ -176,7 +176,7 @@ class Parser:
         
         A valid range must:
         1. Have start character <= end character
-        2. Both characters must be in the same category (lowercase, uppercase, or digits)
+        2. Both characters must be in the same category (lowercase, uppercase, digits or non-ASCII)
         
         Args:
             start: Starting character of the range
@@ -198,6 +198,9 @@ class Parser:
             return True
         if '0' <= start <= '9' and '0' <= end <= '9':
             return True
+        # Unicode ranges such as [α-ω] or [一-龥]
+        if not start.isascii() and not end.isascii():
+            return True
             
         return False
     
@@ -0,0 +1,179 @@
+"""
+Lazily evaluated compilation pipeline.
+
+A Pipeline holds one regular expression and exposes every stage of its
+compilation (tokens, AST, NFA, DFA, minimized DFA, compiled tables) as a
+property that is computed on first access and memoized. Asking for a stage
+only builds the stages it depends on, so callers that need a single automaton
+never pay for the others. Compiled tables are shared between pipelines whose
+minimized DFAs have the same canonical hash, i.e. between equivalent regexes.
+Pure alternations of literals skip the NFA entirely: their DFA is built
+directly in minimal form from the word list.
+"""
+
+import copy
+import weakref
+from functools import cached_property
+from typing import Dict, Iterable, List, Optional, TextIO
+from Lexer import Lexer
+from Parser import Parser
+from AST import AstNode
+from NFA import NFA
+from DFA import DFA
+from NFABuilder import NFABuilder, FragmentCache
+from NFAtoDFA import NFAtoDFA
+from DFAMinimizer import DFAMinimizer
+from LiteralDFABuilder import LiteralDFABuilder, literalWords
+from CompiledDFA import CompiledDFA
+from Budget import Budget
+
+# Stages that can be serialized, in pipeline order
+STAGES = ("nfa", "dfa", "min_dfa")
+
+# Compiled tables in use, by canonical hash of their minimized DFA
+compiled_tables: "weakref.WeakValueDictionary[str, CompiledDFA]" = weakref.WeakValueDictionary()
+
+
+def parseStages(stages: Optional[Iterable[str]]) -> List[str]:
+    """
+    Validate a selection of stages.
+
+    Args:
+        stages (Optional[Iterable[str]]): Stage names, or None for all of them.
+
+    Returns:
+        List[str]: The selected stages in pipeline order, without duplicates.
+
+    Raises:
+        ValueError: If a stage is unknown or none is selected.
+    """
+    if stages is None:
+        return list(STAGES)
+    stages = set(stages)
+    unknown = stages.difference(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown stages: {', '.join(sorted(unknown))}. Expected some of {', '.join(STAGES)}.")
+    if not stages:
+        raise ValueError("At least one stage must be selected.")
+    return [stage for stage in STAGES if stage in stages]
+
+
+class Pipeline:
+    """
+    Compilation of a regular expression with lazily computed stages.
+
+    Attributes:
+        regex (str): The regular expression.
+        budget (Optional[Budget]): Limits applied to every construction stage, or None.
+        cache (Optional[FragmentCache]): NFA fragment cache used by the NFA stage, or None.
+    """
+
+    def __init__(self, regex: str, budget: Optional[Budget] = None, cache: Optional[FragmentCache] = None):
+        """
+        Initialize the pipeline without computing anything.
+
+        Args:
+            regex (str): The regular expression.
+            budget (Optional[Budget], optional): Limits applied to the constructions. Defaults to None.
+            cache (Optional[FragmentCache], optional): NFA fragment cache. Defaults to None.
+        """
+        self.regex = regex
+        self.budget = budget
+        self.cache = cache
+
+    @cached_property
+    def tokens(self) -> list:
+        """The tokens of the regex."""
+        return Lexer(self.regex).tokenize()
+
+    @cached_property
+    def ast(self) -> AstNode:
+        """The abstract syntax tree of the regex."""
+        return Parser(self.tokens).parse()
+
+    @cached_property
+    def nfa(self) -> NFA:
+        """The Thompson NFA of the regex."""
+        return NFABuilder(self.budget, self.cache).buildFromAST(self.ast)
+
+    @cached_property
+    def words(self) -> Optional[List[str]]:
+        """The alternatives if the regex is a pure alternation of literals, else None."""
+        return literalWords(self.tokens)
+
+    @cached_property
+    def dfa(self) -> DFA:
+        """The DFA obtained by subset construction, or the minimal DFA of a word list."""
+        if self.words is not None:
+            return LiteralDFABuilder(self.budget).build(self.words)
+        return NFAtoDFA(self.nfa, self.budget).convert()
+
+    @cached_property
+    def min_dfa(self) -> DFA:
+        """The minimized DFA."""
+        if self.words is not None:
+            # Already minimal
+            return self.dfa
+        # The minimizer trims the DFA it is given, so it works on a copy
+        return DFAMinimizer(copy.deepcopy(self.dfa), self.budget).minimize()
+
+    @cached_property
+    def canonical_hash(self) -> str:
+        """The canonical hash of the minimized DFA, equal for equivalent regexes."""
+        return self.min_dfa.canonicalHash()
+
+    @cached_property
+    def compiled(self) -> CompiledDFA:
+        """The transition tables of the minimized DFA, shared with equivalent regexes."""
+        compiled = compiled_tables.get(self.canonical_hash)
+        if compiled is None:
+            compiled = CompiledDFA(self.min_dfa)
+            compiled_tables[self.canonical_hash] = compiled
+        return compiled
+
+    def isComputed(self, stage: str) -> bool:
+        """
+        Check whether a stage has already been computed.
+
+        Args:
+            stage (str): The stage name.
+
+        Returns:
+            bool: True if the stage is memoized.
+        """
+        return stage in self.__dict__
+
+    def toJson(self, stage: str) -> str:
+        """
+        Serialize the automaton of one stage, computing it if needed.
+
+        Args:
+            stage (str): One of STAGES.
+
+        Returns:
+            str: The JSON representation of the automaton.
+        """
+        return getattr(self, parseStages([stage])[0]).toJson()
+
+    def writeJson(self, stage: str, stream: TextIO, indent: Optional[int] = None) -> None:
+        """
+        Stream the automaton of one stage as JSON, computing it if needed.
+
+        Args:
+            stage (str): One of STAGES.
+            stream (TextIO): The text stream to write to.
+            indent (Optional[int], optional): Indentation, or None for compact output. Defaults to None.
+        """
+        getattr(self, parseStages([stage])[0]).writeJson(stream, indent)
+
+    def toDict(self, stages: Optional[Iterable[str]] = None) -> Dict[str, dict]:
+        """
+        Build the structures of the selected stages; other stages are not computed.
+
+        Args:
+            stages (Optional[Iterable[str]], optional): Stage names. Defaults to all of STAGES.
+
+        Returns:
+            Dict[str, dict]: The renumbered structure of every selected stage.
+        """
+        return {stage: getattr(self, stage).renumberedStructure() for stage in parseStages(stages)}
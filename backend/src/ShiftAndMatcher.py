@@ -0,0 +1,244 @@
+"""
+Bit-parallel Shift-And matcher over the Glushkov position automaton.
+
+Every literal or character class occurrence in the AST is a position, and the
+set of active positions is kept as the bits of a single Python int. Each input
+character updates the whole set with a shift, a few ANDs/ORs and a handful of
+table lookups, without determinization and without looping over states.
+"""
+
+from typing import Dict, Iterator, List, Tuple, Union
+from AST import *
+
+# Largest number of positions for which the bit-parallel engine is worthwhile
+MAX_POSITIONS = 256
+
+
+class GlushkovInfo:
+    """
+    Glushkov facts of an AST node, with positions as bits.
+
+    Attributes:
+        nullable (bool): Whether the node matches the empty string.
+        first (int): Positions that can start a match.
+        last (int): Positions that can end a match.
+    """
+
+    def __init__(self, nullable: bool, first: int, last: int):
+        """
+        Initialize the Glushkov facts.
+
+        Args:
+            nullable (bool): Whether the node matches the empty string.
+            first (int): Positions that can start a match.
+            last (int): Positions that can end a match.
+        """
+        self.nullable = nullable
+        self.first = first
+        self.last = last
+
+
+class ShiftAndMatcher:
+    """
+    Bit-parallel matcher built from a regular expression AST.
+
+    Bit p of the state is set when the input read so far can end at position p.
+    Follow edges p -> p+1, the common case in concatenations, are applied with a
+    single shift; the remaining edges are applied through 8-bit chunk tables.
+
+    Attributes:
+        positionCount (int): Number of positions in the pattern.
+        nullable (bool): Whether the pattern matches the empty string.
+        firstMask (int): Positions that can start a match.
+        lastMask (int): Positions that can end a match.
+        symbolMasks (Dict[str, int]): Positions reading each character.
+        shiftMask (int): Positions q reachable from q-1 by a follow edge.
+        jumpSources (int): Positions with follow edges other than p -> p+1.
+        jumpTables (List[Tuple[int, List[int]]]): (bit offset, table) pairs mapping
+            8 source bits to the union of their non-adjacent follow positions.
+    """
+
+    def __init__(self, ast: AstNode, max_positions: int = MAX_POSITIONS):
+        """
+        Build the position automaton and its bit masks.
+
+        Args:
+            ast (AstNode): The root of the regular expression AST.
+            max_positions (int, optional): Maximum number of positions. Defaults to MAX_POSITIONS.
+
+        Raises:
+            ValueError: If the pattern has more positions than allowed.
+        """
+        self.positionSymbols: List[set] = []
+        self.follow: List[int] = []
+        info = self.analyse(ast)
+        self.positionCount = len(self.positionSymbols)
+        if self.positionCount > max_positions:
+            raise ValueError(f"Pattern has {self.positionCount} positions, more than {max_positions}.")
+        self.nullable = info.nullable
+        self.firstMask = info.first
+        self.lastMask = info.last
+
+        self.symbolMasks: Dict[str, int] = {}
+        for position, symbols in enumerate(self.positionSymbols):
+            for symbol in symbols:
+                self.symbolMasks[symbol] = self.symbolMasks.get(symbol, 0) | (1 << position)
+
+        self.shiftMask = 0
+        self.jumpSources = 0
+        jumps = {}
+        for position, follow in enumerate(self.follow):
+            adjacent = 1 << (position + 1)
+            if follow & adjacent:
+                self.shiftMask |= adjacent
+            rest = follow & ~adjacent
+            if rest:
+                self.jumpSources |= 1 << position
+                jumps[position] = rest
+
+        self.jumpTables: List[Tuple[int, List[int]]] = []
+        for offset in range(0, self.positionCount, 8):
+            if (self.jumpSources >> offset) & 0xFF:
+                table = [0] * 256
+                for byte in range(1, 256):
+                    lowest = byte & -byte
+                    table[byte] = table[byte ^ lowest] | jumps.get(offset + lowest.bit_length() - 1, 0)
+                self.jumpTables.append((offset, table))
+
+    @staticmethod
+    def fromRegex(regex: str, max_positions: int = MAX_POSITIONS) -> "ShiftAndMatcher":
+        """
+        Build a matcher for a regular expression.
+
+        Args:
+            regex (str): The regular expression.
+            max_positions (int, optional): Maximum number of positions. Defaults to MAX_POSITIONS.
+
+        Returns:
+            ShiftAndMatcher: The matcher.
+        """
+        from Lexer import Lexer
+        from Parser import Parser
+
+        return ShiftAndMatcher(Parser(Lexer(regex).tokenize()).parse(), max_positions)
+
+    def analyse(self, node: AstNode) -> GlushkovInfo:
+        """
+        Number the positions of a node and compute its Glushkov facts.
+
+        Follow sets are accumulated in self.follow as a side effect.
+
+        Args:
+            node (AstNode): The node to analyse.
+
+        Returns:
+            GlushkovInfo: The facts of the node.
+
+        Raises:
+            ValueError: If an unsupported AST node type is encountered.
+        """
+        if isinstance(node, (LiteralAstNode, CharacterClassAstNode)):
+            bit = 1 << len(self.positionSymbols)
+            self.positionSymbols.append({node.char} if isinstance(node, LiteralAstNode) else set(node.char_set))
+            self.follow.append(0)
+            return GlushkovInfo(False, bit, bit)
+        elif isinstance(node, ConcatAstNode):
+            left, right = self.analyse(node.left), self.analyse(node.right)
+            self.addFollow(left.last, right.first)
+            first = left.first | (right.first if left.nullable else 0)
+            last = right.last | (left.last if right.nullable else 0)
+            return GlushkovInfo(left.nullable and right.nullable, first, last)
+        elif isinstance(node, OrAstNode):
+            left, right = self.analyse(node.left), self.analyse(node.right)
+            return GlushkovInfo(left.nullable or right.nullable, left.first | right.first, left.last | right.last)
+        elif isinstance(node, (StarAstNode, PlusAstNode)):
+            sub = self.analyse(node.sub_expr)
+            self.addFollow(sub.last, sub.first)
+            return GlushkovInfo(sub.nullable or isinstance(node, StarAstNode), sub.first, sub.last)
+        elif isinstance(node, OptionalAstNode):
+            sub = self.analyse(node.sub_expr)
+            return GlushkovInfo(True, sub.first, sub.last)
+        else:
+            raise ValueError(f"Unsupported AST node type: {type(node).__name__}")
+
+    def addFollow(self, sources: int, targets: int) -> None:
+        """
+        Add follow edges from every source position to every target position.
+
+        Args:
+            sources (int): Source positions.
+            targets (int): Target positions.
+        """
+        while sources:
+            lowest = sources & -sources
+            self.follow[lowest.bit_length() - 1] |= targets
+            sources ^= lowest
+
+    def accepts(self, text: Union[str, bytes]) -> bool:
+        """
+        Check whether the whole input matches.
+
+        Args:
+            text (Union[str, bytes]): The input; bytes are read as Latin-1.
+
+        Returns:
+            bool: True if the input matches the pattern.
+        """
+        if not isinstance(text, str):
+            text = bytes(text).decode("latin-1")
+        if not text:
+            return self.nullable
+        masks, shift_mask, jump_sources, jump_tables = self.symbolMasks, self.shiftMask, self.jumpSources, self.jumpTables
+        state = self.firstMask & masks.get(text[0], 0)
+        for char in text[1:]:
+            if not state:
+                return False
+            reached = (state << 1) & shift_mask
+            jumping = state & jump_sources
+            if jumping:
+                for offset, table in jump_tables:
+                    reached |= table[(jumping >> offset) & 0xFF]
+            state = reached & masks.get(char, 0)
+        return bool(state & self.lastMask)
+
+    def findEnds(self, text: Union[str, bytes]) -> Iterator[int]:
+        """
+        Find every position at which some match ends.
+
+        A match may start anywhere, so the first positions are re-entered after
+        every character.
+
+        Args:
+            text (Union[str, bytes]): The input; bytes are read as Latin-1.
+
+        Yields:
+            int: Each end position (exclusive index) of a match, in increasing order.
+        """
+        if not isinstance(text, str):
+            text = bytes(text).decode("latin-1")
+        masks, shift_mask, jump_sources, jump_tables = self.symbolMasks, self.shiftMask, self.jumpSources, self.jumpTables
+        first, last = self.firstMask, self.lastMask
+        if self.nullable:
+            yield 0
+        state = 0
+        for pos, char in enumerate(text, start=1):
+            reached = ((state << 1) & shift_mask) | first
+            jumping = state & jump_sources
+            if jumping:
+                for offset, table in jump_tables:
+                    reached |= table[(jumping >> offset) & 0xFF]
+            state = reached & masks.get(char, 0)
+            if state & last or self.nullable:
+                yield pos
+
+    def search(self, text: Union[str, bytes]) -> bool:
+        """
+        Check whether the input contains a match.
+
+        Args:
+            text (Union[str, bytes]): The input; bytes are read as Latin-1.
+
+        Returns:
+            bool: True if some substring matches the pattern.
+        """
+        return next(self.findEnds(text), None) is not None
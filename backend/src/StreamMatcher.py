@@ -0,0 +1,124 @@
+"""
+Stateful streaming matcher.
+
+This module validates inputs that arrive in pieces, such as socket or pipe data,
+against a compiled DFA. Only the current state is kept, so memory stays constant
+regardless of input length, and the state can be snapshotted and restored.
+"""
+
+import asyncio
+from typing import Tuple, Union
+from CompiledDFA import CompiledDFA
+
+
+class StreamMatcher:
+    """
+    Incremental whole-input matcher over a compiled DFA.
+
+    Attributes:
+        compiled (CompiledDFA): The automaton to run.
+        state (int): The current state, or DEAD once acceptance has become impossible.
+        consumed (int): Number of symbols fed so far.
+        finished (bool): Whether finish() has been called.
+    """
+
+    def __init__(self, compiled: CompiledDFA):
+        """
+        Initialize the matcher in the starting state.
+
+        Args:
+            compiled (CompiledDFA): The automaton to run.
+        """
+        self.compiled = compiled
+        self.reset()
+
+    def reset(self) -> None:
+        """Return to the starting state to match a new input."""
+        self.state = self.compiled.start
+        self.consumed = 0
+        self.finished = False
+
+    def feed(self, chunk: Union[str, bytes]) -> None:
+        """
+        Consume the next piece of input.
+
+        Once the matcher is dead the chunk is counted but not scanned.
+
+        Args:
+            chunk (Union[str, bytes]): The next piece of input; bytes are read as Latin-1.
+
+        Raises:
+            ValueError: If the matcher has already been finished.
+        """
+        if self.finished:
+            raise ValueError("Cannot feed a finished matcher.")
+        self.consumed += len(chunk)
+        if self.state != self.compiled.DEAD:
+            self.state = self.compiled.run(chunk, self.state)
+
+    def isAccepting(self) -> bool:
+        """
+        Check whether the input fed so far is accepted.
+
+        Returns:
+            bool: True if the current state is accepting.
+        """
+        return self.state != self.compiled.DEAD and self.compiled.accepting[self.state]
+
+    def isDead(self) -> bool:
+        """
+        Check whether no continuation of the input can be accepted.
+
+        Returns:
+            bool: True if acceptance has become impossible.
+        """
+        return self.compiled.isDead(self.state)
+
+    def finish(self) -> bool:
+        """
+        Mark the end of the input.
+
+        Returns:
+            bool: True if the whole input is accepted.
+        """
+        self.finished = True
+        return self.isAccepting()
+
+    def snapshot(self) -> Tuple[int, int, bool]:
+        """
+        Capture the matcher state.
+
+        Returns:
+            Tuple[int, int, bool]: An opaque snapshot for restore().
+        """
+        return self.state, self.consumed, self.finished
+
+    def restore(self, snapshot: Tuple[int, int, bool]) -> None:
+        """
+        Return to a previously captured state.
+
+        Args:
+            snapshot (Tuple[int, int, bool]): A snapshot returned by snapshot().
+        """
+        self.state, self.consumed, self.finished = snapshot
+
+    async def consume(self, reader: asyncio.StreamReader, chunk_size: int = 1 << 16) -> bool:
+        """
+        Feed everything read from an asyncio stream, then finish.
+
+        Reading stops as soon as the matcher is dead, so invalid uploads can be
+        rejected without waiting for the rest of the data.
+
+        Args:
+            reader (asyncio.StreamReader): The stream to read from.
+            chunk_size (int, optional): Maximum number of bytes per read. Defaults to 64 KiB.
+
+        Returns:
+            bool: True if the data read is accepted.
+        """
+        while not self.isDead():
+            chunk = await reader.read(chunk_size)
+            if not chunk:
+                break
+            self.feed(chunk)
+        return self.finish()
@@ -0,0 +1,283 @@
+"""
+Compressed transition tables for large alphabets.
+
+Dense rows indexed by symbol class waste most of their entries on dead
+transitions once the alphabet grows. This module offers two compressed layouts
+next to the dense one and picks one automatically from the measured density:
+- comb (row displacement): all rows are overlaid into shared `next`/`check`
+  arrays at per-state offsets `base`; lookups stay O(1)
+- ranges: each state keeps its transitions as sorted code point ranges that
+  are searched with `bisect`, O(log k) per lookup, and needs no symbol map
+
+The layouts are standalone: the search and scan engines keep CompiledDFA's
+dense rows, whose classification of whole chunks with `translate` a per-character
+`step` cannot match in Python.
+"""
+
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_right
+from typing import List, Tuple, Union
+import sys
+from DFA import DFA
+from CompiledDFA import CompiledDFA
+
+# Below this fraction of live entries, dense rows are replaced by a compressed layout
+DENSITY_THRESHOLD = 0.5
+
+
+class TransitionTable(ABC):
+    """
+    Base class for the transition table layouts.
+
+    Attributes:
+        DEAD (int): Result of a missing transition.
+        start (int): Number of the starting state.
+        accepting (List[bool]): Whether each state is accepting.
+    """
+
+    DEAD = CompiledDFA.DEAD
+
+    @abstractmethod
+    def __init__(self):
+        """Initialize the table."""
+        pass
+
+    @abstractmethod
+    def step(self, state: int, char: str) -> int:
+        """
+        Follow the transition from a state on a character.
+
+        Args:
+            state (int): The source state.
+            char (str): The input character.
+
+        Returns:
+            int: The next state, or DEAD.
+        """
+        pass
+
+    @abstractmethod
+    def memoryBytes(self) -> int:
+        """
+        Estimate the memory used by the transition data.
+
+        Returns:
+            int: Size in bytes.
+        """
+        pass
+
+    def accepts(self, data: Union[str, bytes]) -> bool:
+        """
+        Check whether the whole input is accepted.
+
+        Args:
+            data (Union[str, bytes]): The input; bytes are read as Latin-1.
+
+        Returns:
+            bool: True if the automaton ends in an accepting state.
+        """
+        if not isinstance(data, str):
+            data = bytes(data).decode("latin-1")
+        state = self.start
+        for char in data:
+            state = self.step(state, char)
+            if state == self.DEAD:
+                return False
+        return self.accepting[state]
+
+
+class DenseTable(TransitionTable):
+    """Dense rows indexed by symbol class, as produced by CompiledDFA."""
+
+    def __init__(self, compiled: CompiledDFA):
+        """
+        Wrap a compiled DFA.
+
+        Args:
+            compiled (CompiledDFA): The compiled DFA.
+        """
+        self.compiled = compiled
+        self.start = compiled.start
+        self.accepting = compiled.accepting
+
+    def step(self, state: int, char: str) -> int:
+        """Read the entry of the character's class in the state's dense row."""
+        return self.compiled.table[state][self.compiled.classOf.get(char, 0)]
+
+    def memoryBytes(self) -> int:
+        """Count the dense rows and the symbol class map."""
+        rows = sum(sys.getsizeof(row) + 8 * len(row) for row in self.compiled.table)
+        return rows + sys.getsizeof(self.compiled.classOf)
+
+    def accepts(self, data: Union[str, bytes]) -> bool:
+        """Run the compiled DFA, which classifies whole inputs at once."""
+        return self.compiled.accepts(data)
+
+
+class CombTable(TransitionTable):
+    """
+    Row-displacement (comb) layout.
+
+    Row s is stored at offset base[s]: the transition on class c is next[base[s] + c]
+    when check[base[s] + c] == s, and default[s], the target of the unknown-symbol
+    class 0, otherwise. Only entries differing from the default are stored. Rows
+    are placed first-fit, fullest first, so their entries interleave with the holes
+    of other rows.
+    """
+
+    def __init__(self, compiled: CompiledDFA):
+        """
+        Pack the rows of a compiled DFA.
+
+        Args:
+            compiled (CompiledDFA): The compiled DFA.
+        """
+        self.classOf = compiled.classOf
+        self.start = compiled.start
+        self.accepting = compiled.accepting
+        self.default = array("i", [row[0] for row in compiled.table])
+        rows = [[(cls, target) for cls, target in enumerate(row) if cls > 0 and target != row[0]]
+                for row in compiled.table]
+
+        self.base = array("i", [0] * len(rows))
+        next_states = array("i")
+        check = array("i")
+        # Slots taken so far, followed by a zero tail at least one row long
+        used = bytearray(compiled.classCount)
+        # Every slot below first_free is used, so no row can start below it
+        first_free = 0
+        for state in sorted(range(len(rows)), key=lambda s: -len(rows[s])):
+            entries = rows[state]
+            if not entries:
+                continue
+            low = entries[0][0]
+            deltas = [cls - low for cls, _ in entries[1:]]
+            # Candidate offsets put the row's first entry on the next free slot
+            slot = used.find(0, max(first_free, low))
+            while any(used[slot + delta] for delta in deltas):
+                slot = used.find(0, slot + 1)
+            offset = slot - low
+            self.base[state] = offset
+            end = offset + entries[-1][0] + 1
+            if len(check) < end:
+                grow = end - len(check)
+                used.extend(bytes(grow))
+                check.extend([-1] * grow)
+                next_states.extend([self.DEAD] * grow)
+            for cls, target in entries:
+                used[offset + cls] = 1
+                check[offset + cls] = state
+                next_states[offset + cls] = target
+            first_free = used.find(0, first_free)
+        self.next = next_states
+        self.check = check
+
+    def step(self, state: int, char: str) -> int:
+        """Read the slot of the character's class in the state's row, or the row's default."""
+        slot = self.base[state] + self.classOf.get(char, 0)
+        if slot < len(self.check) and self.check[slot] == state:
+            return self.next[slot]
+        return self.default[state]
+
+    def memoryBytes(self) -> int:
+        """Count the base, default, next and check arrays and the symbol class map."""
+        arrays = sum(sys.getsizeof(a) for a in (self.base, self.default, self.next, self.check))
+        return arrays + sys.getsizeof(self.classOf)
+
+
+class RangeTable(TransitionTable):
+    """
+    Sorted range layout.
+
+    Each state stores the start code point of every maximal range of characters
+    leading to the same target, searched with bisect. Code points outside the
+    alphabet, in gaps or beyond either end, lead to the target of the
+    unknown-symbol class 0, so every row starts with a range at code point 0.
+    No symbol map is needed, which suits large, range-shaped alphabets.
+    """
+
+    def __init__(self, compiled: CompiledDFA):
+        """
+        Build the ranges of a compiled DFA.
+
+        Args:
+            compiled (CompiledDFA): The compiled DFA.
+        """
+        self.start = compiled.start
+        self.accepting = compiled.accepting
+        symbols = sorted(compiled.classOf, key=ord)
+        self.starts: List[array] = []
+        self.targets: List[array] = []
+        for row in compiled.table:
+            default = row[0]
+            starts, targets = array("I", [0]), array("i", [default])
+            previous_code, previous_target = None, default
+            for symbol in symbols:
+                code, target = ord(symbol), row[compiled.classOf[symbol]]
+                # A gap in the alphabet goes back to the default
+                if previous_code is not None and code != previous_code + 1 and previous_target != default:
+                    starts.append(previous_code + 1)
+                    targets.append(default)
+                    previous_target = default
+                if target != previous_target:
+                    if starts[-1] == code:
+                        targets[-1] = target
+                    else:
+                        starts.append(code)
+                        targets.append(target)
+                    previous_target = target
+                previous_code = code
+            if previous_code is not None and previous_target != default:
+                starts.append(previous_code + 1)
+                targets.append(default)
+            self.starts.append(starts)
+            self.targets.append(targets)
+
+    def step(self, state: int, char: str) -> int:
+        """Find the range of the state containing the character's code point."""
+        return self.targets[state][bisect_right(self.starts[state], ord(char)) - 1]
+
+    def memoryBytes(self) -> int:
+        """Count the range start and target arrays of every state."""
+        return sum(sys.getsizeof(a) for a in self.starts + self.targets)
+
+
+def measureDensity(compiled: CompiledDFA) -> float:
+    """
+    Measure the fraction of live entries in the dense table.
+
+    Args:
+        compiled (CompiledDFA): The compiled DFA.
+
+    Returns:
+        float: Live entries divided by all entries, over the alphabet classes. An
+            entry is live when it differs from the row's unknown-symbol target,
+            which the compressed layouts store once per row.
+    """
+    classes = compiled.classCount - 1
+    if not compiled.table or classes == 0:
+        return 1.0
+    live = sum(1 for row in compiled.table for target in row[1:] if target != row[0])
+    return live / (len(compiled.table) * classes)
+
+
+def compressTable(dfa: Union[DFA, CompiledDFA]) -> Tuple[TransitionTable, float]:
+    """
+    Choose a transition table layout from the measured density.
+
+    Dense tables are kept when most entries are live; otherwise the smaller of
+    the comb and range layouts is used.
+
+    Args:
+        dfa (Union[DFA, CompiledDFA]): The DFA, or its compiled form.
+
+    Returns:
+        Tuple[TransitionTable, float]: The chosen table and the measured density.
+    """
+    compiled = dfa if isinstance(dfa, CompiledDFA) else CompiledDFA(dfa)
+    density = measureDensity(compiled)
+    if density >= DENSITY_THRESHOLD:
+        return DenseTable(compiled), density
+    candidates = [CombTable(compiled), RangeTable(compiled)]
+    return min(candidates, key=lambda table: table.memoryBytes()), density
@@ -0,0 +1,292 @@
+"""
+UTF-8 byte-level automata.
+
+Character-level automata read their input as `str`, and bytes as Latin-1, so a
+non-ASCII literal never matches the UTF-8 encoding of a file. This module builds
+automata whose symbols are bytes instead: every character becomes the chain of
+its UTF-8 bytes, and every character class is split into ranges of UTF-8 byte
+sequences whose common continuation-byte suffixes share states. A byte symbol b
+is stored as the character chr(b), so the resulting DFAs compile into the usual
+tables with at most 256 symbols and run directly over `bytes`, `bytearray` and
+`mmap` buffers through their byte translation, without ever decoding to `str`.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from NFA import NFA
+from NFABuilder import NFABuilder
+from NFAtoDFA import NFAtoDFA
+from DFAMinimizer import DFAMinimizer
+from CompiledDFA import CompiledDFA
+from LiteralExtractor import LiteralExtractor, LiteralInfo
+from Budget import Budget
+
+# Largest code point of each UTF-8 encoding length
+ENCODING_BOUNDS = (0x7F, 0x7FF, 0xFFFF, 0x10FFFF)
+SURROGATES = (0xD800, 0xDFFF)
+
+# A byte range for every byte of an encoding, e.g. ((0xC3, 0xC3), (0x80, 0xBF))
+ByteSequence = Tuple[Tuple[int, int], ...]
+
+
+def encodeText(text: str) -> str:
+    """
+    Convert text to its byte-level symbols.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        str: One character per UTF-8 byte of the text, chr(b) for byte b.
+    """
+    return text.encode("utf-8").decode("latin-1")
+
+
+def codePointRanges(chars: Iterable[str]) -> List[Tuple[int, int]]:
+    """
+    Coalesce characters into sorted ranges of consecutive code points.
+
+    Args:
+        chars (Iterable[str]): The characters.
+
+    Returns:
+        List[Tuple[int, int]]: Inclusive (low, high) code point ranges.
+    """
+    ranges = []
+    for code in sorted(set(map(ord, chars))):
+        if ranges and ranges[-1][1] == code - 1:
+            ranges[-1] = (ranges[-1][0], code)
+        else:
+            ranges.append((code, code))
+    return ranges
+
+
+def utf8Sequences(low: int, high: int) -> List[ByteSequence]:
+    """
+    Split a code point range into ranges of UTF-8 byte sequences.
+
+    Every returned sequence matches exactly the encodings of a sub-range, byte
+    range by byte range, and together they match the encodings of the whole
+    range and nothing else. Surrogates, which have no UTF-8 encoding, are skipped.
+
+    Args:
+        low (int): First code point of the range.
+        high (int): Last code point of the range, inclusive.
+
+    Returns:
+        List[ByteSequence]: The byte sequences, in code point order.
+    """
+    sequences = []
+    # Pending ranges; the lower half of a split is pushed last so it is handled first
+    stack = [(low, high)]
+    while stack:
+        low, high = stack.pop()
+        if low > high:
+            continue
+        if low <= SURROGATES[1] and high >= SURROGATES[0]:
+            stack.append((SURROGATES[1] + 1, high))
+            stack.append((low, SURROGATES[0] - 1))
+            continue
+        # Both ends must have encodings of the same length
+        bound = next(bound for bound in ENCODING_BOUNDS if low <= bound)
+        if high > bound:
+            stack.append((bound + 1, high))
+            stack.append((low, bound))
+            continue
+        if high <= 0x7F:
+            sequences.append(((low, high),))
+            continue
+        # Split until every continuation byte spans its full range or a single value
+        for i in range(1, 4):
+            mask = (1 << (6 * i)) - 1
+            if low & ~mask == high & ~mask:
+                continue
+            if low & mask:
+                stack.append(((low | mask) + 1, high))
+                stack.append((low, low | mask))
+                break
+            if high & mask != mask:
+                stack.append((high & ~mask, high))
+                stack.append((low, (high & ~mask) - 1))
+                break
+        else:
+            first, last = chr(low).encode("utf-8"), chr(high).encode("utf-8")
+            sequences.append(tuple(zip(first, last)))
+    return sequences
+
+
+class ByteNFABuilder(NFABuilder):
+    """
+    Builder of NFAs over UTF-8 bytes.
+
+    Operators are built as in NFABuilder; only literals and character classes
+    differ. Subtree fragments are never cached, since a cache filled by a
+    character-level builder would hold fragments over characters.
+    """
+
+    def __init__(self, budget: Optional[Budget] = None):
+        """
+        Initialize the builder.
+
+        Args:
+            budget (Optional[Budget], optional): Limits on NFA states and time checked
+                as states are created. Defaults to None.
+        """
+        super().__init__(budget)
+
+    def createBasicNFA(self, nfa: NFA, symbol: str) -> Tuple[str, str]:
+        """
+        Create an NFA reading the UTF-8 bytes of one character.
+
+        Args:
+            nfa (NFA): The NFA to modify.
+            symbol (str): The character.
+
+        Returns:
+            Tuple[str, str]: Start and end states of the created NFA.
+        """
+        start_state = self.getNextState()
+        nfa.addState(start_state, False)
+        state = start_state
+        for byte in encodeText(symbol):
+            next_state = self.getNextState()
+            nfa.addState(next_state, False)
+            nfa.addTransition(state, byte, next_state)
+            state = next_state
+        return start_state, state
+
+    def createCharacterClassNFA(self, nfa: NFA, char_set: set[chr]) -> Tuple[str, str]:
+        """
+        Create an NFA reading the UTF-8 bytes of any character of a class.
+
+        The class is split into UTF-8 byte sequences, which are built from their
+        last byte backwards: a state is shared by every sequence with the same
+        byte range leading to the same target, so continuation-byte suffixes such
+        as [80-BF][80-BF] exist only once.
+
+        Args:
+            nfa (NFA): The NFA to modify.
+            char_set (set[chr]): Set of characters in the character class.
+
+        Returns:
+            Tuple[str, str]: Start and end states of the created NFA.
+        """
+        start_state = self.getNextState()
+        end_state = self.getNextState()
+        nfa.addState(start_state, False)
+        nfa.addState(end_state, False)
+
+        suffixes: Dict[Tuple[int, int, str], str] = {}
+        for low, high in codePointRanges(char_set):
+            for sequence in utf8Sequences(low, high):
+                target = end_state
+                for first, last in reversed(sequence[1:]):
+                    key = (first, last, target)
+                    state = suffixes.get(key)
+                    if state is None:
+                        state = self.getNextState()
+                        nfa.addState(state, False)
+                        for byte in range(first, last + 1):
+                            nfa.addTransition(state, chr(byte), target)
+                        suffixes[key] = state
+                    target = state
+                first, last = sequence[0]
+                for byte in range(first, last + 1):
+                    nfa.addTransition(start_state, chr(byte), target)
+
+        return start_state, end_state
+
+
+class ByteAutomata:
+    """
+    The byte-level automata of a regular expression.
+
+    Attributes:
+        regex (str): The regular expression.
+        ast (AstNode): Its abstract syntax tree.
+        nfa (NFA): The NFA over UTF-8 bytes.
+        dfa (DFA): The minimized DFA over UTF-8 bytes.
+        compiled (CompiledDFA): The compiled tables of the DFA, with at most 256 symbols.
+        literals (LiteralInfo): Literal facts of the pattern, as byte-level symbols.
+    """
+
+    def __init__(self, regex: str, budget: Optional[Budget] = None):
+        """
+        Compile a regular expression into byte-level automata.
+
+        Args:
+            regex (str): The regular expression; literals and ranges may be non-ASCII.
+            budget (Optional[Budget], optional): Limits applied to every construction. Defaults to None.
+
+        Raises:
+            ValueError: If the regex is invalid.
+            BudgetExceededError: If a construction exceeds the budget.
+        """
+        from Lexer import Lexer
+        from Parser import Parser
+
+        self.regex = regex
+        self.ast = Parser(Lexer(regex).tokenize()).parse()
+        self.nfa = ByteNFABuilder(budget).buildFromAST(self.ast)
+        self.dfa = DFAMinimizer(NFAtoDFA(self.nfa, budget).convert(), budget).minimize()
+        self.compiled = CompiledDFA(self.dfa)
+        info = LiteralExtractor().extract(self.ast)
+        self.literals = LiteralInfo(None if info.complete is None else encodeText(info.complete),
+                                    encodeText(info.prefix), encodeText(info.suffix), encodeText(info.required))
+
+    def accepts(self, buffer: Union[bytes, bytearray, memoryview, Iterable], chunk_size: int = 1 << 20) -> bool:
+        """
+        Check whether a whole buffer is accepted.
+
+        Args:
+            buffer: A bytes-like object such as an mmap, or an iterable of byte chunks.
+            chunk_size (int, optional): Bytes classified at a time. Defaults to 1 MiB.
+
+        Returns:
+            bool: True if the UTF-8 bytes of the buffer match the pattern.
+        """
+        compiled = self.compiled
+        state = compiled.start
+        for chunk in bufferChunks(buffer, chunk_size):
+            state = compiled.run(chunk, state)
+            if state == compiled.DEAD:
+                return False
+        return compiled.accepting[state]
+
+    def searcher(self):
+        """
+        Build a search engine over the byte-level DFA.
+
+        Its spans are byte offsets, and its literal prefilters are byte strings,
+        so it can search bytes and memory maps as they are.
+
+        Returns:
+            DFASearcher: The searcher.
+        """
+        from DFASearcher import DFASearcher
+
+        return DFASearcher(self.dfa, self.nfa, self.literals)
+
+
+def bufferChunks(buffer: Union[bytes, bytearray, memoryview, Iterable],
+                 chunk_size: int = 1 << 20) -> Iterator[Union[bytes, memoryview]]:
+    """
+    Cut a buffer into chunks without copying it.
+
+    The chunks are views of the buffer, so they must be dropped before an mmap
+    can be closed.
+
+    Args:
+        buffer: A bytes-like object such as an mmap, or an iterable of byte chunks,
+            which is passed through.
+        chunk_size (int, optional): Size of every chunk but the last. Defaults to 1 MiB.
+
+    Yields:
+        Union[bytes, memoryview]: Consecutive chunks of the buffer.
+    """
+    try:
+        view = memoryview(buffer)
+    except TypeError:
+        yield from buffer
+        return
+    for offset in range(0, len(view), chunk_size):
+        yield view[offset:offset + chunk_size]
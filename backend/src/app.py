@@ -1,10 +1,22 @@
 import os
 import json
+import argparse
 import subprocess
 import shutil
 import tempfile
 from flask import Flask, request, jsonify
 from flask_cors import CORS
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from main import BUDGET_EXIT_CODE
+from Budget import BudgetExceededError
+from CompileService import CompileService, ServiceBusy
+from Pipeline import parseStages
+
+# Construction budgets applied to every /generate request
+MAX_NFA_STATES = 5000
+MAX_DFA_STATES = 5000
+MAX_TRANSITIONS = 100000
+GENERATE_TIMEOUT = 5.0
 
 
 app = Flask(__name__)
@@ -25,42 +37,63 @@ def generate_automata():
     if not regex:
         return jsonify({"error": "Regex parameter is required"}), 400
 
+    # Only the requested automata are built and returned
+    try:
+        stages = parseStages(data.get('stages'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # In serving mode, compile in the worker pool instead of a subprocess per request
+    service = app.config.get("COMPILE_SERVICE")
+    if service is not None:
+        return generate_in_pool(service, regex, stages)
+
     # Create a temporary directory for output files
     output_dir = tempfile.mkdtemp()
     try:
         # Execute the main.py script with the provided regex and output directory
         result = subprocess.run(
-            ['python', 'main.py', regex, output_dir],
+            ['python', 'main.py', regex, output_dir,
+             '--max-nfa-states', str(MAX_NFA_STATES),
+             '--max-dfa-states', str(MAX_DFA_STATES),
+             '--max-transitions', str(MAX_TRANSITIONS),
+             '--timeout', str(GENERATE_TIMEOUT),
+             '--stages', ','.join(stages),
+             '--compact'],
             capture_output=True,
             text=True,
-            check=True
+            check=True,
+            # The budget stops the pipeline itself; this only catches a stuck process
+            timeout=2 * GENERATE_TIMEOUT
         )
 
     except subprocess.CalledProcessError as e:
+        if e.returncode == BUDGET_EXIT_CODE:
+            # The regex is too expensive to compile: reject it with the partial statistics
+            return jsonify({
+                "error": "Regex exceeds the compilation budget",
+                "budget": json.loads(e.stderr.strip().splitlines()[-1])
+            }), 422
+        
         # Return error details if the script fails
         return jsonify({
             "error": "Failed to generate automata",
             "details": e.stderr.strip()
         }), 400
 
+    except subprocess.TimeoutExpired:
+        return jsonify({"error": "Automata generation timed out"}), 504
+
     except Exception as e:
         return jsonify({"error": str(e)}), 500
     
     else:
         # Read the generated JSON files
         try:
-            nfa = read_json_file(os.path.join(output_dir, 'nfa.json'))
-            dfa = read_json_file(os.path.join(output_dir, 'dfa.json'))
-            min_dfa = read_json_file(os.path.join(output_dir, 'min_dfa.json'))
+            response = {stage: read_json_file(os.path.join(output_dir, f'{stage}.json')) for stage in stages}
         except FileNotFoundError as e:
             return jsonify({"error": f"Missing output file: {str(e)}"}), 500
         
-        # Prepare the response
-        response = {
-            "nfa": nfa,
-            "dfa": dfa,
-            "min_dfa": min_dfa
-        }
         print(response)
         return jsonify(response)
     
@@ -68,5 +101,47 @@ def generate_automata():
         # Clean up the temporary directory
         shutil.rmtree(output_dir)
 
+
+def generate_in_pool(service, regex, stages):
+    """Compile a regex in the worker pool and build the /generate response."""
+    try:
+        future = service.submit(regex, stages)
+    except ServiceBusy as e:
+        response = jsonify({"error": "Too many compiles in progress, retry later", "details": str(e)})
+        response.headers["Retry-After"] = "1"
+        return response, 503
+
+    try:
+        return jsonify(future.result(timeout=2 * GENERATE_TIMEOUT))
+    except BudgetExceededError as e:
+        return jsonify({"error": "Regex exceeds the compilation budget", "budget": e.toDict()}), 422
+    except FutureTimeoutError:
+        return jsonify({"error": "Automata generation timed out"}), 504
+    except Exception as e:
+        return jsonify({"error": "Failed to generate automata", "details": str(e)}), 400
+
+
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Regex to automata web server.")
+    parser.add_argument("--serve", action="store_true",
+                        help="serving mode: compile in a bounded worker pool instead of the debug server")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="number of compile workers")
+    parser.add_argument("--queue-size", type=int, default=16, help="compiles allowed to wait for a worker")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    options = parser.parse_args()
+
+    if options.serve:
+        app.config["COMPILE_SERVICE"] = CompileService(options.workers, options.queue_size, {
+            "max_nfa_states": MAX_NFA_STATES,
+            "max_dfa_states": MAX_DFA_STATES,
+            "max_transitions": MAX_TRANSITIONS,
+            "timeout": GENERATE_TIMEOUT,
+        })
+        try:
+            # Handlers only wait on the pool, so threads keep cheap requests flowing
+            app.run(host=options.host, port=options.port, threaded=True)
+        finally:
+            app.config["COMPILE_SERVICE"].shutdown()
+    else:
+        app.run(host=options.host, port=options.port, debug=True)
\ No newline at end of file
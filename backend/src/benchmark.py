@@ -0,0 +1,102 @@
+"""
+Benchmark suite for the matching engines.
+
+Usage: python benchmark.py [repeat]
+
+Each benchmark compiles a pattern, builds its inputs and reports the best time
+of several runs for every engine, so engines can be compared on equal inputs.
+"""
+
+import random
+import sys
+import tempfile
+import timeit
+from DFASearcher import DFASearcher
+from CodeGenerator import MatcherCodeGenerator
+from CompiledDFA import CompiledDFA
+from BatchMatcher import BatchMatcher
+from Pipeline import Pipeline
+
+# (pattern, alphabet used to generate inputs)
+PATTERNS = [
+    ("(a|b)*abb", "ab"),
+    ("[a-z]+[0-9]*", "abcxyz0189"),
+    ("x(ab|a)*y", "abxy"),
+]
+
+
+def best_time(function, repeat):
+    """Return the best wall-clock time of several runs of a function"""
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def report(name, pattern, seconds, symbols):
+    """Print one benchmark result line"""
+    print(f"{name:<28} {pattern:<16} {seconds * 1000:9.2f} ms {symbols / seconds / 1e6:8.2f} Msym/s")
+
+
+def bench_codegen(repeat):
+    """Compare the generic compiled table with generated matchers"""
+    print("== Whole-string matching: compiled table vs generated code ==")
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for pattern, alphabet in PATTERNS:
+            searcher = DFASearcher.fromRegex(pattern)
+            inputs = ["".join(random.choice(alphabet) for _ in range(random.randint(1, 40)))
+                      for _ in range(20000)]
+            symbols = sum(len(text) for text in inputs)
+            generator = MatcherCodeGenerator(searcher.dfa)
+            engines = [("compiled table", searcher.forward.accepts)]
+            for style in MatcherCodeGenerator.STYLES:
+                engines.append((f"generated ({style})", generator.buildMatcher(style, cache_dir)))
+            expected = [searcher.forward.accepts(text) for text in inputs]
+            for name, match in engines:
+                assert [match(text) for text in inputs] == expected, name
+                report(name, pattern, best_time(lambda: [match(text) for text in inputs], repeat), symbols)
+
+
+def bench_layout(repeat):
+    """Compare state layouts of a large compiled table in the batch and table engines"""
+    print("== State layout of a large table: shuffled vs BFS/DFS vs visit profile ==")
+    random.seed(0)
+    # The n-th symbol from the end must be an a: the minimal DFA has 2^n states
+    pattern = "(a|b)*a" + "(a|b)" * 11
+    dfa = Pipeline(pattern).min_dfa
+
+    def sample(length):
+        # Skewed input, so some states are visited far more often than others
+        return "".join(random.choices("ab", weights=(9, 1), k=length))
+
+    training = sample(100000)
+    inputs = [sample(random.randint(1, 200)) for _ in range(5000)]
+    symbols = sum(len(text) for text in inputs)
+    expected = None
+    for layout in ("shuffled", "bfs", "dfs", "profile"):
+        compiled = CompiledDFA(dfa)
+        if layout == "shuffled":
+            # Stands for a table built without any locality
+            others = list(range(1, len(compiled.table)))
+            random.shuffle(others)
+            compiled = compiled.renumber([compiled.start] + others)
+        elif layout == "profile":
+            compiled = compiled.reorder("profile", compiled.visitCounts(training))
+        else:
+            compiled = compiled.reorder(layout)
+        batch = BatchMatcher(compiled)
+        result = batch.matchAll(inputs)
+        assert expected is None or result == expected, layout
+        expected = result
+        label = f"{len(compiled.table)} states"
+        report(f"batch ({layout})", label, best_time(lambda: batch.matchAll(inputs), repeat), symbols)
+        report(f"table ({layout})", label, best_time(lambda: [compiled.accepts(text) for text in inputs], repeat),
+               symbols)
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    bench_codegen(repeat)
+    bench_layout(repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,84 +1,118 @@
 import sys
 import os
-from Lexer import Lexer
-from Parser import Parser
-from NFABuilder import NFABuilder
-from NFAtoDFA import NFAtoDFA
-from DFAMinimizer import DFAMinimizer
+import json
+import mmap
+import time
+import argparse
+from Utf8Automata import ByteAutomata
+from EnginePlanner import EnginePlan, EnginePlanner
+from Budget import Budget, BudgetExceededError
+from Pipeline import Pipeline, STAGES, parseStages
+
+# Size of the blocks read from a memory-mapped file at a time
+SCAN_BLOCK_SIZE = 1 << 20
+
+# Exit status reported when a construction budget is exceeded
+BUDGET_EXIT_CODE = 3
+
+# Display names of the pipeline stages
+STAGE_NAMES = {"nfa": "NFA", "dfa": "DFA", "min_dfa": "Minimized DFA"}
 
 def main():
     # Check if regex is provided as command line argument
     if len(sys.argv) < 2:
-        print("Usage: python main.py \"regex_pattern\" [output_dir]")
+        print("Usage: python main.py \"regex_pattern\" [output_dir] [--max-nfa-states N] [--max-dfa-states N]")
+        print("                      [--max-transitions N] [--timeout SECONDS] [--stages nfa,dfa,min_dfa]")
+        print("                      [--compact]")
+        print("       python main.py --scan \"regex_pattern\" file [--offsets | --count] [--stats]")
         print("Example: python main.py \"(a|b)*abb\" output")
         return
     
+    # A flag cannot collide with a pattern: no valid regex starts with "--"
+    if sys.argv[1] == "--scan":
+        scan(sys.argv[2:])
+        return
+    
+    options = parse_generate_args(sys.argv[1:])
+    
     # Get the regex pattern
-    regex = sys.argv[1]
+    regex = options.regex
     
     # Get output directory (default is current directory)
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else "."
+    output_dir = options.output_dir
     
     # Create output directory if it doesn't exist
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
     
     print(f"Processing regex: {regex}")
+    budget = Budget(options.max_nfa_states, options.max_dfa_states, options.max_transitions, options.timeout)
     
     try:
+        stages = parseStages(options.stages.split(",") if options.stages else None)
+        pipeline = Pipeline(regex, budget)
+        
         # Step 1: Tokenize the regex
         print("Step 1: Tokenizing regex...")
-        lexer = Lexer(regex)
-        tokens = lexer.tokenize()
+        tokens = pipeline.tokens
+        words = pipeline.words
+        if words is not None:
+            # Pure literal alternations get their minimal DFA straight from the word list
+            print(f"Detected an alternation of {len(words)} literals among {len(tokens)} tokens")
         
-        # Step 2: Parse tokens into AST
-        print("Step 2: Parsing tokens into AST...")
-        parser = Parser(tokens)
-        ast = parser.parse()
+        # Automata computed so far, by stage
+        automata = {}
         
-        # Step 3: Build NFA from AST
-        print("Step 3: Building NFA from AST...")
-        nfa_builder = NFABuilder()
-        nfa = nfa_builder.buildFromAST(ast)
+        # Steps 2 and 3 only run when the NFA is requested or needed by the DFA
+        if "nfa" in stages or words is None:
+            print("Step 2: Parsing tokens into AST...")
+            ast = pipeline.ast
+            print("Step 3: Building NFA from AST...")
+            automata["nfa"] = pipeline.nfa
         
-        # Step 4: Convert NFA to DFA
-        print("Step 4: Converting NFA to DFA...")
-        nfa_to_dfa = NFAtoDFA(nfa)
-        dfa = nfa_to_dfa.convert()
+        # Steps 4 and 5 only run when their automaton, or a later one, is requested
+        if "dfa" in stages or "min_dfa" in stages:
+            print("Step 4: Building DFA from the word list..." if words is not None
+                  else "Step 4: Converting NFA to DFA...")
+            automata["dfa"] = pipeline.dfa
+        if "min_dfa" in stages:
+            if words is None:
+                print("Step 5: Minimizing DFA...")
+            # The DFA of a word list is already minimal and is returned as is
+            automata["min_dfa"] = pipeline.min_dfa
         
-        # Step 5: Minimize DFA
-        print("Step 5: Minimizing DFA...")
-        dfa_minimizer = DFAMinimizer(dfa)
-        min_dfa = dfa_minimizer.minimize()
+        # Choose the matching engine this pattern would get
+        if words is not None:
+            plan = EnginePlan("eager-dfa", [f"minimal DFA built directly from {len(words)} literals"],
+                              {"words": len(words)})
+        else:
+            plan = EnginePlanner().plan(ast, automata["nfa"])
         
         # Step 6: Save outputs to files
         print("Step 6: Saving outputs to files...")
-        
-        # Save NFA
-        nfa_path = os.path.join(output_dir, "nfa.json")
-        with open(nfa_path, "w") as f:
-            f.write(nfa.toJson())
-        
-        # Save DFA
-        dfa_path = os.path.join(output_dir, "dfa.json")
-        with open(dfa_path, "w") as f:
-            f.write(dfa.toJson())
-        
-        # Save minimized DFA
-        min_dfa_path = os.path.join(output_dir, "min_dfa.json")
-        with open(min_dfa_path, "w") as f:
-            f.write(min_dfa.toJson())
+        paths = {}
+        for stage in stages:
+            paths[stage] = os.path.join(output_dir, f"{stage}.json")
+            with open(paths[stage], "w") as f:
+                automata[stage].writeJson(f, None if options.compact else 4)
         
         print("\nConversion completed successfully!")
-        print(f"NFA saved to: {nfa_path}")
-        print(f"DFA saved to: {dfa_path}")
-        print(f"Minimized DFA saved to: {min_dfa_path}")
+        for stage, path in paths.items():
+            print(f"{STAGE_NAMES[stage]} saved to: {path}")
         
         # Print some statistics
         print("\nStatistics:")
-        print(f"NFA states: {count_states(nfa)}")
-        print(f"DFA states: {count_states(dfa)}")
-        print(f"Minimized DFA states: {count_states(min_dfa)}")
+        for stage in stages:
+            print(f"{STAGE_NAMES[stage]} states: {count_states(automata[stage])}")
+        print(f"Planned engine: {plan.engine}")
+        for reason in plan.reasons:
+            print(f"  - {reason}")
+        
+    except BudgetExceededError as e:
+        # Report the partial statistics on stderr so callers can reject the request
+        print(f"Error: {e}")
+        print(json.dumps(e.toDict()), file=sys.stderr)
+        sys.exit(BUDGET_EXIT_CODE)
         
     except Exception as e:
         print(f"Error: {e}")
@@ -86,6 +120,142 @@ def main():
         traceback.print_exc()
 
 
+def parse_generate_args(args):
+    """Parse the arguments of the default automata generation command"""
+    parser = argparse.ArgumentParser(prog="main.py", description="Generate the automata of a regex.")
+    parser.add_argument("regex", help="regular expression to convert")
+    parser.add_argument("output_dir", nargs="?", default=".", help="directory for the JSON files")
+    parser.add_argument("--max-nfa-states", type=int, help="abort if the NFA has more states")
+    parser.add_argument("--max-dfa-states", type=int, help="abort if the DFA has more states")
+    parser.add_argument("--max-transitions", type=int, help="abort if the DFA has more transitions")
+    parser.add_argument("--timeout", type=float, help="abort after this many seconds")
+    parser.add_argument("--compact", action="store_true", help="write JSON without indentation")
+    parser.add_argument("--stages", help=f"comma-separated automata to build and save, among {','.join(STAGES)}")
+    return parser.parse_args(args)
+
+
+def scan(args):
+    """Compile a pattern once and scan a file for it through a memory map"""
+    parser = argparse.ArgumentParser(prog="main.py --scan", description="Scan a file for a regex, grep-style.")
+    parser.add_argument("regex", help="pattern to search for")
+    parser.add_argument("file", help="file to scan")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--offsets", action="store_true", help="print start:end byte offsets of every match")
+    mode.add_argument("--count", action="store_true", help="only print the number of matching lines")
+    parser.add_argument("--stats", action="store_true", help="print throughput statistics to stderr")
+    options = parser.parse_args(args)
+    
+    compile_start = time.perf_counter()
+    # Byte-level automata match the UTF-8 bytes of the file, non-ASCII literals included
+    searcher = ByteAutomata(options.regex).searcher()
+    compile_time = time.perf_counter() - compile_start
+    
+    out = sys.stdout.buffer
+    scan_start = time.perf_counter()
+    with open(options.file, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        # Empty files cannot be memory-mapped
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        try:
+            found = 0
+            # Patterns cannot contain a newline, so no match spans lines
+            if options.offsets:
+                # Only matching lines need span recovery
+                for line_start, line_end in scan_lines(searcher, mm, size):
+                    for start, end in searcher.finditer(mm[line_start:line_end]):
+                        out.write(f"{line_start + start}:{line_start + end}\n".encode())
+                        found += 1
+            else:
+                for start, end in scan_lines(searcher, mm, size):
+                    if not options.count:
+                        out.write(mm[start:end] + b"\n")
+                    found += 1
+                if options.count:
+                    out.write(f"{found}\n".encode())
+        finally:
+            if size:
+                mm.close()
+    out.flush()
+    scan_time = time.perf_counter() - scan_start
+    
+    if options.stats:
+        throughput = size / scan_time / (1 << 20) if scan_time > 0 else float("inf")
+        unit = "matches" if options.offsets else "matching lines"
+        print(f"Compiled in {compile_time * 1000:.1f} ms ({count_states(searcher.dfa)} DFA states)", file=sys.stderr)
+        print(f"Scanned {size} bytes in {scan_time:.3f} s ({throughput:.1f} MiB/s), {found} {unit}", file=sys.stderr)
+
+
+def scan_lines(searcher, data, size):
+    """Yield the (start, end) byte offsets of every line containing a match"""
+    required = searcher.requiredLiteral.encode("latin-1")
+    if required:
+        # Only lines containing the required literal can match: find them at C speed
+        yield from scan_candidate_lines(searcher, data, size, required)
+        return
+    
+    compiled = searcher.unanchored
+    table, accepting, translation = compiled.table, compiled.accepting, compiled.byteTranslation
+    byte_classes = compiled.byteClasses
+    start_state = compiled.start
+    state = start_state
+    matched = accepting[state]
+    line_start = 0
+    
+    for block_start in range(0, size, SCAN_BLOCK_SIZE):
+        block = data[block_start:block_start + SCAN_BLOCK_SIZE]
+        if translation is not None:
+            classes = block.translate(translation)
+        else:
+            classes = [byte_classes[b] for b in block]
+        i = 0
+        length = len(block)
+        while i < length:
+            newline = block.find(b"\n", i)
+            segment_end = length if newline == -1 else newline
+            # Once a line matched, the rest of it does not need to be run
+            if not matched:
+                for j in range(i, segment_end):
+                    state = table[state][classes[j]]
+                    if accepting[state]:
+                        matched = True
+                        break
+            if newline == -1:
+                break
+            if matched:
+                yield line_start, block_start + newline
+            line_start = block_start + newline + 1
+            state = start_state
+            matched = accepting[state]
+            i = newline + 1
+    
+    if line_start < size and matched:
+        yield line_start, size
+
+
+def scan_candidate_lines(searcher, data, size, required):
+    """Yield the offsets of matching lines, running the DFA only on lines containing a literal"""
+    compiled = searcher.unanchored
+    pos = 0
+    while pos < size:
+        hit = data.find(required, pos)
+        if hit == -1:
+            return
+        line_start = data.rfind(b"\n", 0, hit) + 1
+        line_end = data.find(b"\n", hit)
+        if line_end == -1:
+            line_end = size
+        state = compiled.start
+        table, accepting = compiled.table, compiled.accepting
+        if not accepting[state]:
+            for cls in compiled.classify(data[line_start:line_end]):
+                state = table[state][cls]
+                if accepting[state]:
+                    break
+        if accepting[state]:
+            yield line_start, line_end
+        pos = line_end + 1
+
+
 def count_states(automaton):
     """Count the number of states in an NFA or DFA"""
     # Count all keys except 'startingState'
@@ -11,6 +11,19 @@ import re
 alphanumeric = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
 
 
+def isLiteral(char: str) -> bool:
+    """
+    Check whether a character is a literal: alphanumeric or non-ASCII.
+    
+    Args:
+        char (str): The character to check.
+        
+    Returns:
+        bool: True if the character stands for itself in a regex.
+    """
+    return char.isalnum() or not char.isascii()
+
+
 def validateRegex(regex: str) -> bool:
     """
     Validate if a string is a valid regular expression.
@@ -69,21 +82,21 @@ def preprocessRegex(regex: str) -> str:
             # Insert concatenation operator between various character combinations
             # where concatenation is implied
             if (
-                # Alphanumeric or closing symbols followed by opening elements
-                (char.isalnum() or char in ")*.") and 
-                (next_char.isalnum() or next_char in "([.")
+                # Literals or closing symbols followed by opening elements
+                (isLiteral(char) or char in ")*.") and 
+                (isLiteral(next_char) or next_char in "([.")
             ) or (
                 # Quantifiers followed by opening elements
                 (char in "*+?") and 
-                (next_char.isalnum() or next_char in "([.")
+                (isLiteral(next_char) or next_char in "([.")
             ) or (
                 # Closing parenthesis followed by opening elements
                 (char == ')') and 
-                (next_char.isalnum() or next_char in "([.")
+                (isLiteral(next_char) or next_char in "([.")
             ) or (
                 # Closing character class followed by opening elements
                 (char == ']') and 
-                (next_char.isalnum() or next_char in "([.")
+                (isLiteral(next_char) or next_char in "([.")
             ):
                 res += '$'
                 
@@ -0,0 +1,33 @@
+"""Make the backend modules importable by their flat names, as main.py and app.py import them."""
+
+import os
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC_DIR)
+
+
+def leftmostLongest(pattern, text):
+    """
+    Find the non-overlapping leftmost-longest matches of a pattern with Python's re.
+
+    Args:
+        pattern (str): A pattern in the syntax shared by this package and re.
+        text (str): The input.
+
+    Returns:
+        List[Tuple[int, int]]: The (start, end) span of each match.
+    """
+    import re
+
+    regex = re.compile(pattern)
+    spans = []
+    pos = 0
+    while pos <= len(text):
+        span = next(((start, end) for start in range(pos, len(text) + 1)
+                     for end in range(len(text), start - 1, -1) if regex.fullmatch(text, start, end)), None)
+        if span is None:
+            break
+        spans.append(span)
+        pos = span[1] if span[1] > span[0] else span[1] + 1
+    return spans
@@ -0,0 +1,24 @@
+"""Tests of batch matching."""
+
+import itertools
+import re
+
+import pytest
+
+from BatchMatcher import BatchMatcher, np
+from CompiledDFA import CompiledDFA
+from Pipeline import Pipeline
+
+ENGINES = [False, pytest.param(True, marks=pytest.mark.skipif(np is None, reason="NumPy is not installed"))]
+STRINGS = ["".join(chars) for length in range(6) for chars in itertools.product("abx", repeat=length)]
+
+
+@pytest.mark.parametrize("regex", ["(a|b)*abb", "a+b?", "[a-b]*x"])
+@pytest.mark.parametrize("use_numpy", ENGINES)
+@pytest.mark.parametrize("batch_size", [7, 1 << 16])
+def test_match_all_agrees_with_re(regex, use_numpy, batch_size):
+    matcher = BatchMatcher(CompiledDFA(Pipeline(regex).min_dfa), use_numpy, batch_size)
+    expected = [bool(re.fullmatch(regex, string)) for string in STRINGS]
+    assert matcher.matchAll(STRINGS) == expected
+    assert matcher.matchAll([string.encode("latin-1") for string in STRINGS]) == expected
+    assert matcher.matchAll([]) == []
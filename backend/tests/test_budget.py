@@ -0,0 +1,48 @@
+"""Tests of construction budgets."""
+
+import pickle
+
+import pytest
+
+from Budget import Budget, BudgetExceededError
+from Pipeline import Pipeline
+
+REGEX = "(a|b)*a(a|b)(a|b)(a|b)(a|b)"
+
+
+@pytest.mark.parametrize("limits, stage, resource", [
+    ({"max_nfa_states": 10}, "nfa", "nfa_states"),
+    ({"max_dfa_states": 10}, "dfa", "dfa_states"),
+    ({"max_transitions": 20}, "dfa", "transitions"),
+])
+def test_stages_stop_at_their_limit(limits, stage, resource):
+    with pytest.raises(BudgetExceededError) as info:
+        getattr(Pipeline(REGEX, Budget(**limits)), stage)
+    error = info.value
+    assert error.resource == resource
+    assert error.limit == next(iter(limits.values()))
+    assert error.stats[resource] > error.limit
+    assert error.toDict()["stats"]["stage"] == error.stats["stage"]
+
+
+def test_deadline_is_checked_during_construction():
+    budget = Budget(timeout=0.5)
+    budget.started -= 1
+    with pytest.raises(BudgetExceededError) as info:
+        Pipeline(REGEX, budget).min_dfa
+    assert info.value.resource == "time"
+    assert info.value.stats["elapsed"] >= 1
+
+
+def test_generous_limits_do_not_change_the_result():
+    budget = Budget(max_nfa_states=1000, max_dfa_states=1000, max_transitions=10000, timeout=60)
+    limited, unlimited = Pipeline(REGEX, budget), Pipeline(REGEX)
+    assert limited.min_dfa.equivalent(unlimited.min_dfa)
+    assert limited.canonical_hash == unlimited.canonical_hash
+
+
+def test_error_keeps_its_fields_across_processes():
+    error = BudgetExceededError("dfa_states", 10, {"stage": "subset construction", "dfa_states": 11})
+    copy = pickle.loads(pickle.dumps(error))
+    assert (copy.resource, copy.limit, copy.stats) == (error.resource, error.limit, error.stats)
+    assert str(copy) == str(error)
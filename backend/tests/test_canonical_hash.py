@@ -0,0 +1,43 @@
+"""Tests of canonical DFA numbering and content hashing."""
+
+import itertools
+import os
+import re
+import subprocess
+import sys
+
+from conftest import SRC_DIR
+from Pipeline import Pipeline
+
+PATTERNS = ["(a|b)*abb", "(b|a)*abb", "(a*b*)*abb", "a(a|b)*", "a(b|a)*", "a+(a|b)*", "(ab)*a", "a(ba)*", "[a-b]*"]
+STRINGS = ["".join(chars) for length in range(8) for chars in itertools.product("ab", repeat=length)]
+
+
+def test_hashes_are_equal_exactly_for_equal_languages():
+    hashes = {regex: Pipeline(regex).canonical_hash for regex in PATTERNS}
+    languages = {regex: tuple(bool(re.fullmatch(regex, text)) for text in STRINGS) for regex in PATTERNS}
+    for first, second in itertools.combinations(PATTERNS, 2):
+        assert (hashes[first] == hashes[second]) == (languages[first] == languages[second]), (first, second)
+
+
+def test_equal_languages_have_identical_canonical_copies():
+    first, second = Pipeline("(a|b)*abb").min_dfa, Pipeline("(a*b*)*abb").min_dfa
+    assert first.canonicalize().structure == second.canonicalize().structure
+    assert list(first.canonicalize().structure) == list(second.canonicalize().structure)
+
+
+def test_hash_does_not_depend_on_the_hash_seed():
+    script = "from Pipeline import Pipeline; print(Pipeline('(a|b)*abb').canonical_hash)"
+    digests = set()
+    for seed in ("1", "2"):
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        result = subprocess.run([sys.executable, "-c", script], cwd=SRC_DIR, env=env,
+                                capture_output=True, text=True, check=True)
+        digests.add(result.stdout.strip())
+    assert digests == {Pipeline("(a|b)*abb").canonical_hash}
+
+
+def test_equal_languages_share_compiled_tables():
+    first, second = Pipeline("(a|b)*abb"), Pipeline("(b|a)*abb")
+    assert first.compiled is second.compiled
+    assert first.compiled is not Pipeline("(a|b)*ab").compiled
@@ -0,0 +1,46 @@
+"""Tests of the generated matchers and their on-disk cache."""
+
+import itertools
+import os
+import re
+
+import pytest
+
+from CodeGenerator import MatcherCodeGenerator
+from Pipeline import Pipeline
+
+STRINGS = ["".join(chars) for length in range(6) for chars in itertools.product("abcé", repeat=length)]
+
+
+@pytest.mark.parametrize("regex", ["(a|b)*abb", "a+(b|c)?", "[a-c]*é", "c"])
+@pytest.mark.parametrize("style", MatcherCodeGenerator.STYLES)
+def test_generated_matchers_agree_with_re(tmp_path, regex, style):
+    generator = MatcherCodeGenerator(Pipeline(regex).min_dfa)
+    generated = generator.buildMatcher(style)
+    cached = generator.buildMatcher(style, str(tmp_path))
+    reloaded = MatcherCodeGenerator(Pipeline(regex).min_dfa).buildMatcher(style, str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 1
+    for string in STRINGS:
+        expected = bool(re.fullmatch(regex, string))
+        assert generated(string) == cached(string) == reloaded(string) == expected, string
+        assert generated(string.encode("latin-1")) == expected
+
+
+def test_cache_entries_are_keyed_by_language_and_style(tmp_path):
+    for regex in ["(a|b)*abb", "(b|a)*abb", "a*"]:
+        for style in MatcherCodeGenerator.STYLES:
+            MatcherCodeGenerator(Pipeline(regex).min_dfa).buildMatcher(style, str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 4
+
+
+@pytest.mark.parametrize("contents", [b"", b"\xe3\x00", b"\xe9\x07\x00\x00\x00"])
+def test_corrupt_cache_entry_is_regenerated(tmp_path, contents):
+    generator = MatcherCodeGenerator(Pipeline("(a|b)*abb").min_dfa)
+    generator.buildMatcher("branches", str(tmp_path))
+    (entry,) = os.listdir(tmp_path)
+    (tmp_path / entry).write_bytes(contents)
+
+    match = generator.buildMatcher("branches", str(tmp_path))
+    assert match("babb") and not match("abba")
+    assert (tmp_path / entry).read_bytes() != contents
+    assert generator.buildMatcher("branches", str(tmp_path))("aabb")
@@ -0,0 +1,45 @@
+"""Tests of the compact array-backed NFA."""
+
+import itertools
+import re
+
+import pytest
+
+from CompactNFA import CompactNFA
+from Pipeline import Pipeline
+
+PATTERNS = ["(a|b)*abb", "a+(b|c)?", "[a-c]*c", "((ab)*|c+)b?", "a?b?c?"]
+STRINGS = ["".join(chars) for length in range(7) for chars in itertools.product("abc", repeat=length)]
+
+
+def normalized(nfa, names=None):
+    """The structure of an NFA with its states renamed and every transition list sorted."""
+    names = names or {}
+
+    def rename(state):
+        return names.get(state, state)
+
+    return {"startingState" if state == "startingState" else rename(state):
+            rename(value) if state == "startingState" else
+            {key: sorted(map(rename, targets)) if isinstance(targets, list) else targets
+             for key, targets in value.items()}
+            for state, value in nfa.structure.items()}
+
+
+@pytest.mark.parametrize("regex", PATTERNS)
+def test_round_trips_preserve_the_structure(regex):
+    pipeline = Pipeline(regex)
+    expected = normalized(pipeline.nfa)
+    assert normalized(CompactNFA.fromAST(pipeline.ast).toNFA()) == expected
+    # fromNFA numbers the states in structure order
+    states = [state for state in pipeline.nfa.structure if state != "startingState"]
+    names = {state: f"S{index}" for index, state in enumerate(states)}
+    assert normalized(CompactNFA.fromNFA(pipeline.nfa).toNFA()) == normalized(pipeline.nfa, names)
+
+
+@pytest.mark.parametrize("regex", PATTERNS)
+def test_accepts_agrees_with_re(regex):
+    compact = CompactNFA.fromAST(Pipeline(regex).ast)
+    pattern = re.compile(regex)
+    for text in STRINGS:
+        assert compact.accepts(text) == bool(pattern.fullmatch(text)), text
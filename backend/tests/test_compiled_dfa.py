@@ -0,0 +1,48 @@
+"""Tests of compiled DFA tables and their state layouts."""
+
+import itertools
+import re
+
+import pytest
+
+from CompiledDFA import CompiledDFA
+from Pipeline import Pipeline
+
+PATTERNS = ["(a|b)*abb", "(ab|c)*a?", "[a-c]*c(a|b)"]
+STRINGS = ["".join(chars) for length in range(7) for chars in itertools.product("abcx", repeat=length)]
+
+
+@pytest.mark.parametrize("regex", PATTERNS)
+@pytest.mark.parametrize("order", CompiledDFA.ORDERS)
+def test_layouts_agree_with_re_and_leave_the_source_unchanged(regex, order):
+    compiled = CompiledDFA(Pipeline(regex).min_dfa)
+    table, accepting = [list(row) for row in compiled.table], list(compiled.accepting)
+    profile = compiled.visitCounts("abcabbacbbabb" * 4) if order == "profile" else None
+    layouts = [compiled.reorder(order, profile)]
+    if order != "profile":
+        layouts.append(CompiledDFA(Pipeline(regex).min_dfa, order=order))
+    pattern = re.compile(regex)
+    for layout in layouts:
+        assert layout.start == 0
+        assert len(layout.table) == len(table)
+        for text in STRINGS:
+            assert layout.accepts(text) == bool(pattern.fullmatch(text)), (order, text)
+    assert compiled.table == table and compiled.accepting == accepting
+
+
+def test_profile_order_puts_hot_states_first():
+    compiled = CompiledDFA(Pipeline("(a|b)*abb").min_dfa)
+    profile = compiled.visitCounts("b" * 50 + "abb")
+    layout = compiled.stateOrder("profile", profile)
+    counts = [profile[state] for state in layout[1:]]
+    assert layout[0] == compiled.start and counts == sorted(counts, reverse=True)
+
+
+def test_invalid_layouts_are_rejected():
+    compiled = CompiledDFA(Pipeline("(a|b)*abb").min_dfa)
+    with pytest.raises(ValueError):
+        compiled.stateOrder("random")
+    with pytest.raises(ValueError):
+        compiled.stateOrder("profile")
+    with pytest.raises(ValueError):
+        compiled.renumber(list(range(1, len(compiled.table))) + [0])
@@ -0,0 +1,77 @@
+"""Tests of the language operations and comparisons of DFAs."""
+
+import itertools
+import re
+
+import pytest
+
+from CompiledDFA import CompiledDFA
+from Pipeline import Pipeline
+
+ALPHABET = "abc"
+PAIRS = [("(a|b)*abb", "a(a|b)*"), ("[a-c]*c", "(ab|c)+"), ("a*b*", "(a|b)*ba(a|b)*"), ("abc", "abc")]
+
+
+def allStrings(max_length):
+    """Every string over the test alphabet up to a length."""
+    for length in range(max_length + 1):
+        for chars in itertools.product(ALPHABET, repeat=length):
+            yield "".join(chars)
+
+
+def minimalDfa(regex):
+    """The minimized DFA of a regex."""
+    return Pipeline(regex).min_dfa
+
+
+@pytest.mark.parametrize("left, right", PAIRS)
+@pytest.mark.parametrize("minimize", [False, True])
+def test_product_operations_agree_with_re(left, right, minimize):
+    first, second = minimalDfa(left), minimalDfa(right)
+    operations = {
+        "intersect": (first.intersect(second, minimize), lambda x, y: x and y),
+        "union": (first.union(second, minimize), lambda x, y: x or y),
+        "difference": (first.difference(second, minimize), lambda x, y: x and not y),
+    }
+    tables = {name: CompiledDFA(dfa) for name, (dfa, _) in operations.items()}
+    complement = CompiledDFA(first.complement(ALPHABET, minimize))
+    for text in allStrings(6):
+        in_left, in_right = bool(re.fullmatch(left, text)), bool(re.fullmatch(right, text))
+        for name, (_, rule) in operations.items():
+            assert tables[name].accepts(text) == rule(in_left, in_right), (name, text)
+        assert complement.accepts(text) != in_left, text
+
+
+def shortestDifference(left, right, max_length=8):
+    """Length of the shortest string matched by exactly one of two patterns, per re."""
+    return next((len(text) for text in allStrings(max_length)
+                 if bool(re.fullmatch(left, text)) != bool(re.fullmatch(right, text))), None)
+
+
+def shortestMissing(outer, inner, max_length=8):
+    """Length of the shortest string matched by the inner pattern but not the outer one, per re."""
+    return next((len(text) for text in allStrings(max_length)
+                 if re.fullmatch(inner, text) and not re.fullmatch(outer, text)), None)
+
+
+@pytest.mark.parametrize("left, right", PAIRS + [("(a|b)*", "(a*b*)*"), ("a(ba)*", "(ab)*a"), ("a?", "a*")])
+def test_equivalence_reports_a_shortest_counterexample(left, right):
+    result = minimalDfa(left).equivalent(minimalDfa(right))
+    expected = shortestDifference(left, right)
+    assert bool(result) == (expected is None)
+    if expected is None:
+        assert result.counterexample is None
+    else:
+        assert len(result.counterexample) == expected
+        assert bool(re.fullmatch(left, result.counterexample)) != bool(re.fullmatch(right, result.counterexample))
+
+
+@pytest.mark.parametrize("outer, inner", [("(a|b)*", "a*b"), ("a*b", "(a|b)*"), ("[a-c]*c", "(ab|c)+"),
+                                          ("(a|b)*abb", "a*abb"), ("(ab)*", "(ab)*ab")])
+def test_inclusion_reports_a_shortest_counterexample(outer, inner):
+    result = minimalDfa(outer).includes(minimalDfa(inner))
+    expected = shortestMissing(outer, inner)
+    assert bool(result) == (expected is None)
+    if expected is not None:
+        assert len(result.counterexample) == expected
+        assert re.fullmatch(inner, result.counterexample) and not re.fullmatch(outer, result.counterexample)
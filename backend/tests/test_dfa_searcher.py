@@ -0,0 +1,55 @@
+"""Tests of unanchored search with DFAs."""
+
+import re
+
+import pytest
+
+from conftest import leftmostLongest
+from DFASearcher import DFASearcher
+
+CASES = [
+    ("(a|b)*abb", "xxabbabbbaabbz abb"),
+    ("a+", "baaab aa a"),
+    ("a*", "baab"),
+    ("ab|abc|c", "abcabxcc"),
+    ("[0-9]+(x[0-9]+)?", "12x 4x56 x7 89"),
+    ("(ab)*c?", "ababcab cc"),
+    ("hello|help", "helhellohelp he"),
+]
+
+
+@pytest.mark.parametrize("regex, text", CASES)
+def test_finditer_in_memory_matches_leftmost_longest(regex, text):
+    searcher = DFASearcher.fromRegex(regex)
+    expected = leftmostLongest(regex, text)
+    assert list(searcher.finditer(text)) == expected
+    assert list(searcher.finditer(text.encode("latin-1"))) == expected
+    assert searcher.search(text) == (expected[0] if expected else None)
+
+
+@pytest.mark.parametrize("regex, text", CASES)
+@pytest.mark.parametrize("chunk_size", [1, 3, 64])
+def test_finditer_streaming_matches_leftmost_longest(regex, text, chunk_size):
+    searcher = DFASearcher.fromRegex(regex)
+    chunks = (text[begin:begin + chunk_size] for begin in range(0, len(text), chunk_size))
+    assert list(searcher.finditer(chunks)) == leftmostLongest(regex, text)
+
+
+@pytest.mark.parametrize("regex, text", CASES)
+def test_find_ends_reports_every_match_end(regex, text):
+    pattern = re.compile(regex)
+    expected = [end for end in range(len(text) + 1)
+                if any(pattern.fullmatch(text, start, end) for start in range(end + 1))]
+    assert list(DFASearcher.fromRegex(regex).findEnds(text)) == expected
+
+
+@pytest.mark.parametrize("regex, text", CASES)
+def test_reversed_automata_find_leftmost_starts(regex, text):
+    searcher = DFASearcher.fromRegex(regex)
+    pattern = re.compile(regex)
+    spans = list(searcher.iterEndSpans(text))
+    assert [end for _, end in spans] == list(searcher.findEnds(text))
+    for start, end in spans:
+        assert start == min(begin for begin in range(end + 1) if pattern.fullmatch(text, begin, end))
+        assert searcher.leftmostStart(text, end) == start
+        assert searcher.leftmostStart(text, end, lower=end) == (end if pattern.fullmatch(text, end, end) else None)
@@ -0,0 +1,54 @@
+"""Tests of the engine planner."""
+
+import itertools
+import re
+
+import pytest
+
+from EnginePlanner import EnginePlanner, compileMatcher
+from Pipeline import Pipeline
+
+BLOWUP = "(a|b)*a" + "(a|b)" * 16
+STRINGS = ["".join(chars) for length in range(7) for chars in itertools.product("abc", repeat=length)]
+
+
+def buildMatcher(regex, expected_input=None, **limits):
+    """Plan and build a matcher for a regex with the given planner limits."""
+    pipeline = Pipeline(regex)
+    return EnginePlanner(**limits).build(pipeline.ast, pipeline.nfa, expected_input)
+
+
+@pytest.mark.parametrize("regex, expected_input, limits, engine", [
+    ("(a|b)*abb", 100, {}, "bit-parallel"),
+    ("(a|b)*abb", 100, {"max_positions": 3}, "nfa-simulation"),
+    ("(a|b)*abb", None, {}, "eager-dfa"),
+    ("(a|b)*abb", 1 << 20, {}, "eager-dfa"),
+    (BLOWUP, None, {}, "lazy-dfa"),
+    ("(a|b)*a(a|b)(a|b)(a|b)", None, {"max_dfa_states": 4}, "lazy-dfa"),
+])
+def test_engine_choice_and_results(regex, expected_input, limits, engine):
+    matcher = buildMatcher(regex, expected_input, **limits)
+    assert matcher.plan.engine == engine
+    assert matcher.plan.reasons
+    pattern = re.compile(regex)
+    for text in STRINGS:
+        assert matcher.accepts(text) == bool(pattern.fullmatch(text)), text
+        assert matcher.search(text) == bool(pattern.search(text)), text
+
+
+def test_compile_matcher_plans_from_the_regex():
+    matcher = compileMatcher("(a|b)*abb")
+    assert matcher.plan.engine == "eager-dfa"
+    assert matcher.plan.metrics["dfa_states"] == 4
+    assert compileMatcher("(a|b)*abb", expected_input=10).plan.engine == "bit-parallel"
+    assert compileMatcher(BLOWUP).plan.toDict()["engine"] == "lazy-dfa"
+
+
+def test_eager_dfa_over_budget_falls_back_to_the_lazy_dfa():
+    # Estimated at 9 states, while the subset construction needs 10
+    regex = "(a|ab)(c|bcd)(d*)"
+    matcher = buildMatcher(regex, max_dfa_states=9)
+    assert matcher.plan.engine == "lazy-dfa"
+    assert "Fell back to the lazy DFA" in matcher.plan.reasons[-1]
+    for text in ["ac", "abcdd", "abcd", "acdd", "abd", ""]:
+        assert matcher.accepts(text) == bool(re.fullmatch(regex, text))
@@ -0,0 +1,53 @@
+"""Tests of the NFA fragment cache."""
+
+import itertools
+import re
+
+import pytest
+
+from CompiledDFA import CompiledDFA
+from NFABuilder import FragmentCache
+from NFAtoDFA import NFAtoDFA
+from Pipeline import Pipeline
+
+STRINGS = ["".join(chars) for length in range(7) for chars in itertools.product("abc", repeat=length)]
+
+
+def stateCount(nfa):
+    """Number of states of an NFA."""
+    return len(nfa.structure) - 1
+
+
+@pytest.mark.parametrize("regexes", [
+    ["(ab|c)*abc", "(ab|c)*abb", "c(ab|c)*abc"],
+    ["(a|b)+(a|b)+", "((a|b)+c)*(a|b)+"],
+])
+def test_cached_builds_agree_with_re_and_uncached_builds(regexes):
+    cache = FragmentCache()
+    for regex in regexes:
+        cached, uncached = Pipeline(regex, cache=cache).nfa, Pipeline(regex).nfa
+        assert stateCount(cached) == stateCount(uncached)
+        compiled = CompiledDFA(NFAtoDFA(cached).convert())
+        for text in STRINGS:
+            assert compiled.accepts(text) == bool(re.fullmatch(regex, text)), (regex, text)
+    assert cache.hits > 0
+
+
+def test_repeated_subtrees_are_reused_within_one_build():
+    cache = FragmentCache()
+    Pipeline("(ab|c)*x(ab|c)*", cache=cache).nfa
+    assert cache.hits >= 1
+    misses = cache.misses
+    Pipeline("(ab|c)*x(ab|c)*", cache=cache).nfa
+    assert cache.misses == misses
+
+
+def test_least_recently_used_fragments_are_evicted():
+    cache = FragmentCache(max_size=2)
+    cache.put("first", "fragment 1")
+    cache.put("second", "fragment 2")
+    assert cache.get("first") == "fragment 1"
+    cache.put("third", "fragment 3")
+    assert cache.get("second") is None
+    assert list(cache.fragments) == ["first", "third"]
+    assert (cache.hits, cache.misses) == (1, 1)
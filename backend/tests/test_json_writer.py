@@ -0,0 +1,23 @@
+"""Tests of the streaming JSON writer."""
+
+import io
+import json
+
+import pytest
+
+from Pipeline import STAGES, Pipeline
+
+
+@pytest.mark.parametrize("regex", ["(a|b)*abb", "[a-c]+x?", "(alpha|beta)"])
+@pytest.mark.parametrize("stage", STAGES)
+@pytest.mark.parametrize("indent", [None, 4])
+def test_streamed_json_matches_in_memory_json(regex, stage, indent):
+    pipeline = Pipeline(regex)
+    stream = io.StringIO()
+    pipeline.writeJson(stage, stream, indent)
+    text = stream.getvalue()
+    assert json.loads(text) == json.loads(pipeline.toJson(stage))
+    if indent is None:
+        assert "\n" not in text
+    else:
+        assert text == pipeline.toJson(stage)
@@ -0,0 +1,52 @@
+"""Tests of minimal DFAs built directly from word lists."""
+
+import random
+
+import pytest
+
+from Budget import Budget, BudgetExceededError
+from CompiledDFA import CompiledDFA
+from DFAMinimizer import DFAMinimizer
+from LiteralDFABuilder import LiteralDFABuilder, literalWords
+from Lexer import Lexer
+from NFABuilder import NFABuilder
+from NFAtoDFA import NFAtoDFA
+from Parser import Parser
+
+
+def randomWords(count, seed):
+    """Random words over a small alphabet, so that prefixes and suffixes are shared."""
+    generator = random.Random(seed)
+    return ["".join(generator.choice("abc") for _ in range(generator.randint(1, 6))) for _ in range(count)]
+
+
+@pytest.mark.parametrize("words", [["a"], ["tap", "taps", "top", "tops"], randomWords(40, 1), randomWords(60, 2)])
+def test_matches_the_minimized_thompson_construction(words):
+    regex = "|".join(words)
+    dfa = LiteralDFABuilder().build(words)
+    nfa = NFABuilder().buildFromAST(Parser(Lexer(regex).tokenize()).parse())
+    expected = DFAMinimizer(NFAtoDFA(nfa).convert()).minimize()
+    assert dfa.equivalent(expected)
+    assert len(dfa.structure) == len(expected.structure)
+    compiled = CompiledDFA(dfa)
+    for word in set(words) | {word + "a" for word in words} | {word[:-1] for word in words}:
+        assert compiled.accepts(word) == (word in words)
+
+
+@pytest.mark.parametrize("regex, words", [
+    ("(alpha|beta|gamma)", ["alpha", "beta", "gamma"]),
+    ("((ab|cd))", ["ab", "cd"]),
+    ("abc", ["abc"]),
+    ("(ab)|(cd)", None),
+    ("a*|b", None),
+    ("[ab]|c", None),
+])
+def test_literal_alternations_are_detected(regex, words):
+    assert literalWords(Lexer(regex).tokenize()) == words
+
+
+def test_invalid_inputs_and_budget():
+    with pytest.raises(ValueError):
+        LiteralDFABuilder().build([])
+    with pytest.raises(BudgetExceededError):
+        LiteralDFABuilder(Budget(max_dfa_states=5)).build([f"word{index}" for index in range(3000)])
@@ -0,0 +1,39 @@
+"""Tests of literal extraction and the search prefilter built on it."""
+
+import itertools
+import re
+
+import pytest
+
+from conftest import leftmostLongest
+from DFASearcher import DFASearcher
+from LiteralExtractor import LiteralExtractor
+from Pipeline import Pipeline
+
+PATTERNS = ["hello", "ab(c|d)ef", "x(ab)*y", "foo(bar|baz)+", "(ab|ac)d", "a?bc", "[a-c]+d"]
+STRINGS = ["".join(chars) for length in range(7) for chars in itertools.product("abcdxy", repeat=length)]
+
+
+@pytest.mark.parametrize("regex", PATTERNS)
+def test_literals_hold_for_every_match(regex):
+    info = LiteralExtractor().extract(Pipeline(regex).ast)
+    pattern = re.compile(regex)
+    samples = STRINGS + ["hello", "abcef", "abdef", "foobar", "foobazbar", "xababy"]
+    matches = [text for text in samples if pattern.fullmatch(text)]
+    assert matches
+    for text in matches:
+        assert text.startswith(info.prefix) and text.endswith(info.suffix) and info.required in text
+        assert info.complete is None or text == info.complete
+    assert info.complete == (regex if re.escape(regex) == regex else None)
+
+
+@pytest.mark.parametrize("regex", PATTERNS)
+def test_prefilter_does_not_change_matches(regex):
+    text = "xx hello abcef abdefx xababyy foobarbaz acd abd bc abc ccd " * 3
+    pipeline = Pipeline(regex)
+    filtered = DFASearcher.fromRegex(regex)
+    unfiltered = DFASearcher(pipeline.min_dfa, pipeline.nfa)
+    expected = leftmostLongest(regex, text)
+    assert list(filtered.finditer(text)) == list(unfiltered.finditer(text)) == expected
+    assert list(filtered.finditer(text.encode("latin-1"))) == expected
+    assert list(filtered.finditer("nothing to see")) == leftmostLongest(regex, "nothing to see")
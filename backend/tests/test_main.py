@@ -0,0 +1,42 @@
+"""Tests of the command line entry point."""
+
+import json
+import os
+import subprocess
+import sys
+
+from conftest import SRC_DIR
+
+
+def runMain(*args, cwd):
+    """Run main.py with arguments and return the completed process."""
+    return subprocess.run([sys.executable, os.path.join(SRC_DIR, "main.py"), *args],
+                          cwd=cwd, capture_output=True, text=True, timeout=60)
+
+
+def test_regex_named_scan_still_generates_automata(tmp_path):
+    result = runMain("scan", str(tmp_path), "--max-nfa-states", "100", "--compact", cwd=tmp_path)
+    assert result.returncode == 0, result.stderr
+    for stage in ("nfa", "dfa", "min_dfa"):
+        with open(tmp_path / f"{stage}.json") as f:
+            assert json.load(f)["startingState"] == "S0"
+
+
+def test_scan_flag_prints_matching_lines_and_offsets(tmp_path):
+    log = tmp_path / "log.txt"
+    log.write_bytes("hello world\nhéllo wörld\nnothing\n".encode("utf-8"))
+    result = runMain("--scan", "h(é|e)llo", str(log), cwd=tmp_path)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines() == ["hello world", "héllo wörld"]
+    result = runMain("--scan", "w(ö|o)rld", str(log), "--offsets", cwd=tmp_path)
+    assert result.stdout.split() == ["6:11", "19:25"]
+    result = runMain("--scan", "[a-z]+", str(log), "--count", cwd=tmp_path)
+    assert result.stdout.strip() == "3"
+
+
+def test_budget_exceeded_exits_with_budget_code(tmp_path):
+    result = runMain("(a|b)*a(a|b)(a|b)(a|b)(a|b)(a|b)(a|b)", str(tmp_path), "--max-dfa-states", "10", cwd=tmp_path)
+    assert result.returncode == 3
+    error = json.loads(result.stderr.strip().splitlines()[-1])
+    assert error["resource"] == "dfa_states"
+    assert error["limit"] == 10
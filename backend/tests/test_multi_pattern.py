@@ -0,0 +1,40 @@
+"""Tests of multi-pattern compilation into one tagged DFA."""
+
+import itertools
+import re
+
+import pytest
+
+from MultiPatternCompiler import compile_set
+
+PATTERNS = ["ab*", "a(b|c)*", "[a-c]+", "c(a|b)?", "(ab)+"]
+
+
+def allStrings(alphabet, max_length):
+    """Every string over an alphabet up to a length."""
+    for length in range(max_length + 1):
+        for chars in itertools.product(alphabet, repeat=length):
+            yield "".join(chars)
+
+
+@pytest.mark.parametrize("deduplicate", [False, True])
+def test_matches_agree_with_re(deduplicate):
+    pattern_set = compile_set(PATTERNS, deduplicate=deduplicate)
+    regexes = [re.compile(pattern) for pattern in PATTERNS]
+    for text in allStrings("abcd", 5):
+        expected = [index for index, regex in enumerate(regexes) if regex.fullmatch(text)]
+        assert pattern_set.matches(text) == expected, text
+        assert pattern_set.match(text) == (expected[0] if expected else None)
+
+
+def test_equivalent_patterns_share_a_tag():
+    pattern_set = compile_set(["a(b|c)", "ab|ac", "a*", "b"], deduplicate=True)
+    assert pattern_set.groups == [[0, 1], [2], [3]]
+    assert pattern_set.matches("ac") == [0, 1]
+    assert pattern_set.matches("") == [2]
+    assert compile_set(["a(b|c)", "ab|ac"]).groups == [[0], [1]]
+
+
+def test_empty_pattern_list_is_rejected():
+    with pytest.raises(ValueError):
+        compile_set([])
@@ -0,0 +1,37 @@
+"""Tests of parallel chunked scanning."""
+
+import re
+
+import pytest
+
+from CompiledDFA import CompiledDFA
+from DFASearcher import DFASearcher
+from ParallelScanner import ParallelScanner
+from Pipeline import Pipeline
+
+TEXT = b"abbaabbbabab" * 20 + b"abb"
+
+
+@pytest.mark.parametrize("regex", ["(a|b)*abb", "(ab|b)*a*"])
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_chunked_scan_agrees_with_re(tmp_path, regex, chunk_size):
+    compiled = CompiledDFA(Pipeline(regex).min_dfa)
+    scanner = ParallelScanner(compiled, workers=2, chunk_size=chunk_size)
+    text = TEXT.decode("latin-1")
+    prefixes = sum(1 for end in range(len(text) + 1) if re.fullmatch(regex, text[:end]))
+    state, count = scanner.scanBytes(TEXT)
+    assert state == compiled.run(TEXT)
+    assert count == prefixes
+    assert scanner.accepts(TEXT) == bool(re.fullmatch(regex, text))
+    assert scanner.accepts(TEXT + b"c") is False
+
+    path = tmp_path / "input.txt"
+    path.write_bytes(TEXT)
+    assert scanner.scanFile(str(path)) == (state, count)
+
+
+def test_unanchored_scan_counts_match_ends():
+    searcher = DFASearcher.fromRegex("ab+a")
+    scanner = ParallelScanner(searcher.unanchored, workers=2, chunk_size=5)
+    _, count = scanner.scanBytes(TEXT)
+    assert count == len(list(searcher.findEnds(TEXT)))
@@ -0,0 +1,33 @@
+"""Tests of the lazily evaluated pipeline."""
+
+import json
+
+import pytest
+
+from Pipeline import STAGES, Pipeline, parseStages
+
+
+def test_stages_are_computed_on_demand():
+    pipeline = Pipeline("(a|b)*abb")
+    assert not any(pipeline.isComputed(stage) for stage in ("tokens", "ast") + STAGES)
+    structures = pipeline.toDict(["dfa"])
+    assert list(structures) == ["dfa"]
+    assert pipeline.isComputed("nfa") and pipeline.isComputed("dfa")
+    assert not pipeline.isComputed("min_dfa")
+    assert json.loads(pipeline.toJson("min_dfa")) == pipeline.toDict(["min_dfa"])["min_dfa"]
+
+
+def test_word_lists_skip_the_nfa():
+    pipeline = Pipeline("(alpha|beta|gamma)")
+    assert pipeline.words == ["alpha", "beta", "gamma"]
+    assert pipeline.min_dfa is pipeline.dfa
+    assert not pipeline.isComputed("nfa")
+
+
+def test_stage_selection_is_validated_and_ordered():
+    assert parseStages(None) == list(STAGES)
+    assert parseStages(["min_dfa", "nfa", "min_dfa"]) == ["nfa", "min_dfa"]
+    with pytest.raises(ValueError):
+        parseStages(["ast"])
+    with pytest.raises(ValueError):
+        parseStages([])
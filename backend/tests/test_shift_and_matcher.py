@@ -0,0 +1,38 @@
+"""Tests of the bit-parallel Shift-And matcher."""
+
+import itertools
+import re
+
+import pytest
+
+from ShiftAndMatcher import ShiftAndMatcher
+
+PATTERNS = ["(a|b)*abb", "a+b?c*", "(ab|ba)+", "[a-c]x?", "a*", "((a|b)(b|c))*c",
+            "(a|b)*a(a|b)(a|b)(a|b)(a|b)(a|b)(a|b)(a|b)(a|b)(a|b)"]
+STRINGS = ["".join(chars) for length in range(8) for chars in itertools.product("abcx", repeat=length)]
+
+
+@pytest.mark.parametrize("regex", PATTERNS)
+def test_accepts_and_search_agree_with_re(regex):
+    matcher = ShiftAndMatcher.fromRegex(regex)
+    pattern = re.compile(regex)
+    for text in STRINGS:
+        assert matcher.accepts(text) == bool(pattern.fullmatch(text)), text
+        assert matcher.search(text) == bool(pattern.search(text)), text
+    assert matcher.accepts(b"abb") == bool(pattern.fullmatch("abb"))
+
+
+@pytest.mark.parametrize("regex", PATTERNS)
+def test_find_ends_agree_with_re(regex):
+    matcher = ShiftAndMatcher.fromRegex(regex)
+    pattern = re.compile(regex)
+    text = "abbabcxbaabbbacc"
+    expected = [end for end in range(len(text) + 1)
+                if any(pattern.fullmatch(text, start, end) for start in range(end + 1))]
+    assert list(matcher.findEnds(text)) == expected
+
+
+def test_position_limit():
+    with pytest.raises(ValueError):
+        ShiftAndMatcher.fromRegex("abcdefgh", max_positions=7)
+    assert ShiftAndMatcher.fromRegex("abcdefgh", max_positions=8).positionCount == 8
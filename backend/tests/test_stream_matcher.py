@@ -0,0 +1,53 @@
+"""Tests of the incremental stream matcher."""
+
+import asyncio
+import itertools
+import re
+
+import pytest
+
+from CompiledDFA import CompiledDFA
+from Pipeline import Pipeline
+from StreamMatcher import StreamMatcher
+
+STRINGS = ["".join(chars) for length in range(7) for chars in itertools.product("abc", repeat=length)]
+EXTENSIONS = STRINGS[:1 + 3 + 9 + 27]
+
+
+@pytest.mark.parametrize("regex", ["(a|b)*abb", "ab+c", "(ab|c)*"])
+def test_fed_pieces_agree_with_re(regex):
+    matcher = StreamMatcher(CompiledDFA(Pipeline(regex).min_dfa))
+    pattern = re.compile(regex)
+    for text in STRINGS:
+        matcher.reset()
+        for split in range(0, len(text), 2):
+            matcher.feed(text[split:split + 2])
+            prefix = text[:split + 2]
+            assert matcher.isAccepting() == bool(pattern.fullmatch(prefix))
+            assert matcher.isDead() == (not any(pattern.fullmatch(prefix + rest) for rest in EXTENSIONS))
+        assert matcher.consumed == len(text)
+        assert matcher.finish() == bool(pattern.fullmatch(text))
+
+
+def test_snapshot_restores_and_finish_is_final():
+    matcher = StreamMatcher(CompiledDFA(Pipeline("(a|b)*abb").min_dfa))
+    matcher.feed(b"ab")
+    snapshot = matcher.snapshot()
+    matcher.feed("b")
+    assert matcher.isAccepting()
+    matcher.restore(snapshot)
+    matcher.feed("a")
+    assert not matcher.finish()
+    with pytest.raises(ValueError):
+        matcher.feed("b")
+
+
+def test_consume_reads_an_asyncio_stream():
+    async def consume(data):
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return await StreamMatcher(CompiledDFA(Pipeline("(a|b)*abb").min_dfa)).consume(reader, chunk_size=3)
+
+    assert asyncio.run(consume(b"abababb"))
+    assert not asyncio.run(consume(b"abababc"))
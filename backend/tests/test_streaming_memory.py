@@ -0,0 +1,34 @@
+"""Regression tests for the memory use of streaming search."""
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from DFASearcher import DFASearcher
+
+
+def peakMemory(searcher, symbols):
+    """Return the peak traced memory of a streaming search over a generator without matches."""
+    chunks = ("ab" * 512 for _ in range(symbols // 1024))
+    tracemalloc.start()
+    try:
+        assert list(searcher.finditer(chunks)) == []
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_streaming_search_without_match_keeps_memory_bounded():
+    searcher = DFASearcher.fromRegex("abc")
+    small = peakMemory(searcher, 1 << 14)
+    large = peakMemory(searcher, 1 << 18)
+    # Sixteen times more input must not need noticeably more memory
+    assert large < small + (64 << 10)
+
+
+def test_streaming_search_finds_matches_across_chunks():
+    searcher = DFASearcher.fromRegex("(a|b)*abb")
+    chunks = iter(["xxab", "bxa", "bbab", "b"])
+    assert list(searcher.finditer(chunks)) == list(searcher.finditer("xxabbxabbabb"))
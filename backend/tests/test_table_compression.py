@@ -0,0 +1,31 @@
+"""Tests of the compressed transition table layouts."""
+
+import pytest
+
+from CompiledDFA import CompiledDFA
+from Pipeline import Pipeline
+from TableCompression import CombTable, DenseTable, RangeTable, compressTable
+
+PATTERNS = ["(a|b)*abb", "[a-fx-z]+q", "h(é|e)llo", "(ab|cd)*e?"]
+# Characters inside, between and outside the alphabets above
+PROBES = "abcdefqxyzélho\x00\x7fgw€"
+
+
+@pytest.mark.parametrize("regex", PATTERNS)
+@pytest.mark.parametrize("restart_on_unknown", [False, True])
+def test_layouts_step_like_dense_rows(regex, restart_on_unknown):
+    compiled = CompiledDFA(Pipeline(regex).min_dfa, restart_on_unknown=restart_on_unknown)
+    dense = DenseTable(compiled)
+    for table in (CombTable(compiled), RangeTable(compiled)):
+        for state in range(len(compiled.table)):
+            for char in PROBES:
+                assert table.step(state, char) == dense.step(state, char), (type(table).__name__, state, char)
+
+
+@pytest.mark.parametrize("regex", PATTERNS)
+def test_chosen_layout_accepts_like_dense_rows(regex):
+    compiled = CompiledDFA(Pipeline(regex).min_dfa)
+    table, density = compressTable(compiled)
+    assert 0.0 <= density <= 1.0
+    for text in ["abb", "babb", "abbx", "aq", "xyzq", "héllo", "hello", "abcde", "", "€"]:
+        assert table.accepts(text) == compiled.accepts(text)
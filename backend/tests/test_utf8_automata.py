@@ -0,0 +1,60 @@
+"""Tests of byte-level automata over UTF-8."""
+
+import itertools
+import re
+
+import pytest
+
+from conftest import leftmostLongest
+from Utf8Automata import ByteAutomata, bufferChunks, utf8Sequences
+
+PATTERNS = ["h(é|e)llo", "[α-ω]+", "[a-zé€]+x?", "(ü|𝄞)*a", "[à-€]"]
+CHARS = "aexhloéüαβω€𝄞߿ࠀ￿"
+
+
+def encodings(sequence):
+    """Every byte string matched by a UTF-8 byte sequence, when there are few."""
+    return {bytes(chars) for chars in itertools.product(*(range(low, high + 1) for low, high in sequence))}
+
+
+@pytest.mark.parametrize("low, high", [(0, 0x7F), (0x41, 0x2FF), (0x7FF, 0x801), (0xD7F0, 0xE010),
+                                       (0xFFF0, 0x10010), (0x1D11E, 0x1D11E)])
+def test_sequences_encode_exactly_the_range(low, high):
+    sequences = utf8Sequences(low, high)
+    matched = set().union(*(encodings(sequence) for sequence in sequences))
+    expected = {chr(code).encode("utf-8") for code in range(low, high + 1) if not 0xD800 <= code <= 0xDFFF}
+    assert matched == expected
+    assert sum(len(encodings(sequence)) for sequence in sequences) == len(expected)
+
+
+@pytest.mark.parametrize("regex", PATTERNS)
+def test_byte_automata_accept_like_re(regex):
+    automata = ByteAutomata(regex)
+    pattern = re.compile(regex)
+    for length in range(4):
+        for chars in itertools.product(CHARS, repeat=length):
+            text = "".join(chars)
+            assert automata.accepts(text.encode("utf-8")) == bool(pattern.fullmatch(text)), text
+    assert automata.accepts([b"h\xc3", b"\xa9llo"]) == bool(pattern.fullmatch("héllo"))
+
+
+@pytest.mark.parametrize("regex", PATTERNS)
+def test_byte_search_reports_byte_offsets(regex):
+    text = "hello héllo αβγ x€ üü𝄞a ça ω€"
+    data = text.encode("utf-8")
+
+    def offset(index):
+        return len(text[:index].encode("utf-8"))
+
+    expected = [(offset(start), offset(end)) for start, end in leftmostLongest(regex, text)]
+    searcher = ByteAutomata(regex).searcher()
+    assert list(searcher.finditer(data)) == expected
+    assert list(searcher.finditer(bufferChunks(data, 3))) == expected
+
+
+def test_buffer_chunks_are_views():
+    data = bytearray(b"abcdefg")
+    chunks = list(bufferChunks(data, 3))
+    assert [bytes(chunk) for chunk in chunks] == [b"abc", b"def", b"g"]
+    assert all(isinstance(chunk, memoryview) for chunk in chunks)
+    assert list(bufferChunks([b"ab", b"c"])) == [b"ab", b"c"]